@@ -0,0 +1,77 @@
+"""Inventory Live-Status Cache Module."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LiveStatusCache:
+    """Thread-safe cache of collected live-status data with a TTL and LRU eviction.
+
+    Entries are keyed by (device, data kind). A TTL of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, ttl: float, max_entries: int) -> None:
+        """Apply new settings, dropping entries that no longer fit."""
+        with self._lock:
+            self.ttl = ttl
+            self.max_entries = max_entries
+            if not ttl:
+                self._entries.clear()
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh entry and mark it recently used, None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones above max_entries."""
+        with self._lock:
+            if not self.ttl:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, device: Optional[str] = None) -> None:
+        """Drop the entries of a device, or all entries."""
+        with self._lock:
+            if device is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if isinstance(key, tuple) and key[0] == device]:
+                del self._entries[key]
+
+    def get_or_collect(self, key: Hashable, collect: Callable[[], T], force_refresh: bool = False) -> T:
+        """Return a fresh entry or collect, store and return a new one.
+
+        Collection runs outside the lock so slow devices do not block each other.
+        """
+        if not force_refresh:
+            value = self.get(key)
+            if value is not None:
+                return value
+        value = collect()
+        self.put(key, value)
+        return value
+
+
+LIVE_STATUS_CACHE = LiveStatusCache()
@@ -0,0 +1,3 @@
+"""Inventory Constants Module."""
+INDENTATION = " "
+USER = "admin"
@@ -0,0 +1,79 @@
+"""Inventory Platform Driver Registry Module.
+
+A driver module is imported on first use of its platform and exposes a PlatformDriver
+instance as DRIVER. A new platform is added with a driver module and a DRIVER_MODULES
+entry, or with register_driver from outside the package.
+"""
+import importlib
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import ncs
+from inventory.records import ControllerRecord, InterfaceRecord, ModuleRecord
+
+# ncs:platform name to driver module
+DRIVER_MODULES: Dict[str, str] = {
+    "ios-xr": "inventory.drivers.iosxr",
+    "huawei-vrp": "inventory.drivers.huawei_vrp",
+    "alu-sr": "inventory.drivers.alu_sr",
+}
+DRIVERS: Dict[str, "PlatformDriver"] = {}
+DRIVERS_LOCK = threading.Lock()
+
+
+class UnsupportedPlatformError(ValueError):
+    """Raised for a device platform without a driver."""
+
+    def __init__(self, platform: Optional[str]) -> None:
+        super().__init__(f"Unsupported platform {platform!r}, supported: {', '.join(sorted(DRIVER_MODULES))}")
+        self.platform = platform
+
+
+class PlatformDriver(ABC):
+    """Inventory collector of a device platform.
+
+    capabilities declares the inventory data the driver collects, out of inventory,
+    controllers and interfaces; lists of missing capabilities are written empty.
+    A driver has to implement both collect methods to be instantiated.
+    """
+
+    platform = ""
+    capabilities: FrozenSet[str] = frozenset()
+
+    @abstractmethod
+    def collect_live_status(
+        self,
+        trans: ncs.maapi.Transaction,
+        device_hostname: str,
+        cached: Callable[[str, Callable[[], Any]], Any],
+        log: ncs.log.Log,
+    ) -> Tuple[List[ModuleRecord], List[ControllerRecord]]:
+        """Get device modules and controllers, each live-status call wrapped in cached(kind, call)."""
+
+    @abstractmethod
+    def collect_cdb_interfaces(self, trans: ncs.maapi.Transaction, device_hostname: str) -> List[InterfaceRecord]:
+        """Get device interfaces from cdb."""
+
+
+def register_driver(platform: str, module: str) -> None:
+    """Register the driver module of a platform, replacing a loaded driver."""
+    with DRIVERS_LOCK:
+        DRIVER_MODULES[platform] = module
+        DRIVERS.pop(platform, None)
+
+
+def is_supported(platform: Optional[str]) -> bool:
+    """Check if a platform has a driver, without loading it."""
+    return platform in DRIVER_MODULES
+
+
+def get_driver(platform: Optional[str]) -> PlatformDriver:
+    """Get the driver of a platform, importing its module on first use."""
+    with DRIVERS_LOCK:
+        if platform not in DRIVER_MODULES:
+            raise UnsupportedPlatformError(platform)
+        driver = DRIVERS.get(platform)
+        if driver is None:
+            driver = DRIVERS[platform] = importlib.import_module(DRIVER_MODULES[platform]).DRIVER
+        return driver
@@ -0,0 +1,101 @@
+"""Nokia (Alcatel-Lucent) SR Platform Driver Module."""
+from typing import Any, Callable, List, Tuple
+
+import ncs
+from inventory.constants import INDENTATION
+from inventory.drivers import PlatformDriver
+from inventory.query import get_device_xpath, query_records
+from inventory.records import ControllerRecord, InterfaceRecord, ModuleRecord
+from inventory.tracing import TRACER
+
+
+@TRACER.traced
+def alu_sr_get_device_live_status_inventory(trans: ncs.maapi.Transaction, device_hostname: str) -> List[ModuleRecord]:
+    """Get device card and mda data from ned live-status."""
+    live_status_xpath = get_device_xpath(device_hostname) + "/ncs:live-status/"
+    modules = query_records(
+        trans,
+        live_status_xpath + "alu-stats:card",
+        ModuleRecord,
+        {"name": "card-id", "description": "provisioned-type", "pid": "part-number", "serial_number": "serial-number"},
+    )
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s card data is gathered.", device_hostname)
+    modules.extend(
+        query_records(
+            trans,
+            live_status_xpath + "alu-stats:slot/mda",
+            ModuleRecord,
+            {
+                "name": "concat(../slot-id, '/', mda-id)",
+                "description": "provisioned-type",
+                "pid": "part-number",
+                "serial_number": "serial-number",
+            },
+        )
+    )
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s slot data is gathered.", device_hostname)
+    return modules
+
+
+@TRACER.traced
+def alu_sr_get_device_live_status_ports(trans: ncs.maapi.Transaction, device_hostname: str) -> List[ControllerRecord]:
+    """Get device ports data from ned live-status."""
+    controllers = query_records(
+        trans,
+        get_device_xpath(device_hostname) + "/ncs:live-status/alu-stats:ports",
+        ControllerRecord,
+        {
+            "id": "port-id",
+            "controller_state": "port-state",
+            "optics_type": "transceiver-data/transceiver-type",
+            "part_number": "transceiver-data/part-number",
+            "serial_number": "transceiver-data/serial-number",
+            "pid": "transceiver-data/model-number",
+        },
+    )
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s ports data is gathered.", device_hostname)
+    return controllers
+
+
+@TRACER.traced
+def alu_sr_get_device_cdb_interfaces(trans: ncs.maapi.Transaction, device_hostname: str) -> List[InterfaceRecord]:
+    """Get device ports and lags data from cdb."""
+    config_xpath = get_device_xpath(device_hostname) + "/ncs:config/"
+    interfaces = query_records(
+        trans, config_xpath + "alu:port", InterfaceRecord, {"if_size": "'port'", "if_number": "port-id"}
+    )
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s ports data is gathered.", device_hostname)
+    interfaces.extend(
+        query_records(
+            trans, config_xpath + "alu:lag", InterfaceRecord, {"if_size": "'lag'", "if_number": "concat('lag-', id)"}
+        )
+    )
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s lags data is gathered.", device_hostname)
+    return interfaces
+
+
+class AluSrDriver(PlatformDriver):
+    """Nokia (Alcatel-Lucent) SR driver, live-status from the alu-stats NED models."""
+
+    platform = "alu-sr"
+    capabilities = frozenset({"inventory", "controllers", "interfaces"})
+
+    def collect_live_status(
+        self,
+        trans: ncs.maapi.Transaction,
+        device_hostname: str,
+        cached: Callable[[str, Callable[[], Any]], Any],
+        log: ncs.log.Log,
+    ) -> Tuple[List[ModuleRecord], List[ControllerRecord]]:
+        """Get device card, mda and ports data."""
+        return (
+            cached("inventory", lambda: alu_sr_get_device_live_status_inventory(trans, device_hostname)),
+            cached("ports", lambda: alu_sr_get_device_live_status_ports(trans, device_hostname)),
+        )
+
+    def collect_cdb_interfaces(self, trans: ncs.maapi.Transaction, device_hostname: str) -> List[InterfaceRecord]:
+        """Get device ports and lags from cdb."""
+        return alu_sr_get_device_cdb_interfaces(trans, device_hostname)
+
+
+DRIVER = AluSrDriver()
@@ -0,0 +1,173 @@
+"""Huawei VRP Platform Driver Module."""
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import _ncs
+import ncs
+from inventory.constants import INDENTATION
+from inventory.drivers import PlatformDriver
+from inventory.parsers import huawei_vrp_parse_inventory_data, huawei_vrp_parse_transceiver_data, split_command_output
+from inventory.query import get_device_xpath, query_keys
+from inventory.records import ControllerRecord, InterfaceRecord, ModuleRecord
+from inventory.tracing import TRACER
+
+HUAWEI_VRP_IF_SIZES = [
+    "Eth_Trunk",
+    "GigabitEthernet",
+    "Ethernet",
+]
+
+HUAWEI_VRP_EXEC_COMMANDS = ("display elabel brief", "display optical-module brief")
+# Seconds a device whose batched exec failed is collected with display calls before batching is tried again
+BATCH_RETRY_INTERVAL = 86400.0
+# time.monotonic() of the last batched exec failure per device
+BATCH_FAILURES: Dict[str, float] = {}
+
+
+def huawei_vrp_get_module_records(inventory_data: str) -> List[ModuleRecord]:
+    """Map 'display elabel brief' output to module records."""
+    with TRACER.span("parse"):
+        return [
+            ModuleRecord(data.name, data.descr, data.pid, data.sn)
+            for data in huawei_vrp_parse_inventory_data(inventory_data)
+        ]
+
+
+def huawei_vrp_get_controller_records(transceiver_data: str) -> List[ControllerRecord]:
+    """Map 'display optical-module brief' output to controller records."""
+    with TRACER.span("parse"):
+        return [
+            ControllerRecord(data.port, controller_state=data.status, optics_type=data.type, pid=data.pid)
+            for data in huawei_vrp_parse_transceiver_data(transceiver_data)
+        ]
+
+
+@TRACER.traced
+def huawei_vrp_get_device_live_status_exec(
+    trans: ncs.maapi.Transaction, device_hostname: str
+) -> Tuple[List[ModuleRecord], List[ControllerRecord]]:
+    """Get device inventory and transceiver data from a single live-status exec.
+
+    The display commands are sent as one ' ; ' separated exec any call and the output is
+    split on the echoed command lines.
+    """
+    root = ncs.maagic.get_root(trans)
+    live_status = root.ncs__devices.device[device_hostname].live_status.vrp_stats__exec.any
+    action_input = live_status.get_input()
+    action_input.args = [" ; ".join(HUAWEI_VRP_EXEC_COMMANDS)]
+    exec_data = split_command_output(live_status(action_input).result, HUAWEI_VRP_EXEC_COMMANDS)
+    modules = huawei_vrp_get_module_records(exec_data["display elabel brief"])
+    controllers = huawei_vrp_get_controller_records(exec_data["display optical-module brief"])
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s inventory and transceiver data is gathered.", device_hostname)
+    return modules, controllers
+
+
+@TRACER.traced
+def huawei_vrp_get_device_live_status_exec_inventory(
+    trans: ncs.maapi.Transaction, device_hostname: str
+) -> List[ModuleRecord]:
+    """Get device inventory data from live-status exec."""
+    root = ncs.maagic.get_root(trans)
+    live_status = root.ncs__devices.device[device_hostname].live_status.vrp_stats__exec.display
+    action_input = live_status.get_input()
+    action_input.args = ["elabel brief"]
+    modules = huawei_vrp_get_module_records(live_status(action_input).result)
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s inventory data is gathered.", device_hostname)
+    return modules
+
+
+@TRACER.traced
+def huawei_vrp_get_device_live_status_exec_transceiver(
+    trans: ncs.maapi.Transaction, device_hostname: str
+) -> List[ControllerRecord]:
+    """Get device transceiver data from live-status exec."""
+    root = ncs.maagic.get_root(trans)
+    live_status = root.ncs__devices.device[device_hostname].live_status.vrp_stats__exec.display
+    action_input = live_status.get_input()
+    action_input.args = ["optical-module brief"]
+    controllers = huawei_vrp_get_controller_records(live_status(action_input).result)
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s transceiver data is gathered.", device_hostname)
+    return controllers
+
+
+def huawei_vrp_get_device_live_status_display(
+    trans: ncs.maapi.Transaction, device_hostname: str
+) -> Tuple[List[ModuleRecord], List[ControllerRecord]]:
+    """Get device inventory and transceiver data with one live-status display call each."""
+    return (
+        huawei_vrp_get_device_live_status_exec_inventory(trans, device_hostname),
+        huawei_vrp_get_device_live_status_exec_transceiver(trans, device_hostname),
+    )
+
+
+def huawei_vrp_record_batch_failure(device_hostname: str, exc: Exception, log: ncs.log.Log) -> None:
+    """Remember that the batched exec of a device failed, so the next collections skip it."""
+    BATCH_FAILURES[device_hostname] = time.monotonic()
+    log.warning("Device ##" + INDENTATION * 2 + device_hostname + " batched exec failed: " + str(exc))
+
+
+def huawei_vrp_get_device_live_status(
+    trans: ncs.maapi.Transaction, device_hostname: str, log: ncs.log.Log
+) -> Tuple[List[ModuleRecord], List[ControllerRecord]]:
+    """Get device inventory and transceiver data, one display call each if the batched exec fails.
+
+    A device whose batched exec failed goes straight to the display calls for
+    BATCH_RETRY_INTERVAL seconds, instead of paying for the failing call every collection.
+    """
+    failed_at = BATCH_FAILURES.get(device_hostname)
+    if failed_at is not None and time.monotonic() - failed_at < BATCH_RETRY_INTERVAL:
+        return huawei_vrp_get_device_live_status_display(trans, device_hostname)
+    try:
+        modules_and_controllers = huawei_vrp_get_device_live_status_exec(trans, device_hostname)
+    except (AttributeError, ValueError) as exc:
+        # the device answered, but without the echoed command lines its output is split on
+        huawei_vrp_record_batch_failure(device_hostname, exc, log)
+    except _ncs.error.Error as exc:
+        # a rejected batch and an unreachable device fail alike, only the latter fails the display calls too
+        modules_and_controllers = huawei_vrp_get_device_live_status_display(trans, device_hostname)
+        huawei_vrp_record_batch_failure(device_hostname, exc, log)
+        return modules_and_controllers
+    else:
+        BATCH_FAILURES.pop(device_hostname, None)
+        return modules_and_controllers
+    return huawei_vrp_get_device_live_status_display(trans, device_hostname)
+
+
+@TRACER.traced
+def huawei_vrp_get_device_cdb_interfaces(trans: ncs.maapi.Transaction, device_hostname: str) -> List[InterfaceRecord]:
+    """Get device interfaces data from cdb."""
+    config_xpath = get_device_xpath(device_hostname) + "/ncs:config/vrp:interface/"
+    interfaces = [
+        InterfaceRecord(if_size.replace("-", "_"), name.split(".", maxsplit=1)[0])
+        for if_size, name in query_keys(
+            trans,
+            " | ".join(config_xpath + if_size.replace("_", "-") for if_size in HUAWEI_VRP_IF_SIZES),
+            ["local-name()", "name"],
+        )
+    ]
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s interfaces data is gathered.", device_hostname)
+    return interfaces
+
+
+class HuaweiVrpDriver(PlatformDriver):
+    """Huawei VRP driver, live-status from parsed display command output."""
+
+    platform = "huawei-vrp"
+    capabilities = frozenset({"inventory", "controllers", "interfaces"})
+
+    def collect_live_status(
+        self,
+        trans: ncs.maapi.Transaction,
+        device_hostname: str,
+        cached: Callable[[str, Callable[[], Any]], Any],
+        log: ncs.log.Log,
+    ) -> Tuple[List[ModuleRecord], List[ControllerRecord]]:
+        """Get device inventory and transceiver data."""
+        return cached("exec", lambda: huawei_vrp_get_device_live_status(trans, device_hostname, log))
+
+    def collect_cdb_interfaces(self, trans: ncs.maapi.Transaction, device_hostname: str) -> List[InterfaceRecord]:
+        """Get device interfaces from cdb."""
+        return huawei_vrp_get_device_cdb_interfaces(trans, device_hostname)
+
+
+DRIVER = HuaweiVrpDriver()
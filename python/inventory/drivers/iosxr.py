@@ -0,0 +1,100 @@
+"""Cisco IOS-XR Platform Driver Module."""
+from typing import Any, Callable, List, Tuple
+
+import ncs
+from inventory.constants import INDENTATION
+from inventory.drivers import PlatformDriver
+from inventory.query import get_device_xpath, query_records, query_keys
+from inventory.records import ControllerRecord, InterfaceRecord, ModuleRecord
+from inventory.tracing import TRACER
+
+IOSXR_IF_SIZES = [
+    "Bundle_Ether",
+    "FiftyGigE",
+    "FortyGigE",
+    "FourHundredGigE",
+    "GigabitEthernet",
+    "HundredGigE",
+    "TenGigE",
+    "TwentyFiveGigE",
+    "TwoHundredGigE",
+]
+
+
+@TRACER.traced
+def iosxr_get_device_live_status_inventory(trans: ncs.maapi.Transaction, device_hostname: str) -> List[ModuleRecord]:
+    """Get device inventory data from ned live-status."""
+    modules = query_records(
+        trans,
+        get_device_xpath(device_hostname) + "/ncs:live-status/cisco-ios-xr-stats:inventory",
+        ModuleRecord,
+        {"name": "name", "description": "descr", "pid": "pid", "serial_number": "sn"},
+    )
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s inventory data is gathered.", device_hostname)
+    return modules
+
+
+@TRACER.traced
+def iosxr_get_device_live_status_controllers(
+    trans: ncs.maapi.Transaction, device_hostname: str
+) -> List[ControllerRecord]:
+    """Get device controllers data from ned live-status."""
+    controllers = query_records(
+        trans,
+        get_device_xpath(device_hostname) + "/ncs:live-status/cisco-ios-xr-stats:controllers/Optics",
+        ControllerRecord,
+        {
+            "id": "id",
+            "controller_state": "instance/controller-state",
+            "optics_type": "instance/transceiver-vendor-details/optics-type",
+            "name": "instance/transceiver-vendor-details/name",
+            "part_number": "instance/transceiver-vendor-details/part-number",
+            "serial_number": "instance/transceiver-vendor-details/serial-number",
+            "pid": "instance/transceiver-vendor-details/pid",
+        },
+    )
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s controllers data is gathered.", device_hostname)
+    return controllers
+
+
+@TRACER.traced
+def iosxr_get_device_cdb_interfaces(trans: ncs.maapi.Transaction, device_hostname: str) -> List[InterfaceRecord]:
+    """Get device interfaces data from cdb."""
+    config_xpath = get_device_xpath(device_hostname) + "/ncs:config/cisco-ios-xr:interface/"
+    interfaces = [
+        InterfaceRecord(if_size.replace("-", "_"), if_number)
+        for if_size, if_number in query_keys(
+            trans,
+            " | ".join(config_xpath + if_size.replace("_", "-") for if_size in IOSXR_IF_SIZES),
+            ["local-name()", "id"],
+        )
+    ]
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s interfaces data is gathered.", device_hostname)
+    return interfaces
+
+
+class IosXrDriver(PlatformDriver):
+    """Cisco IOS-XR driver, live-status from the cisco-ios-xr-stats NED models."""
+
+    platform = "ios-xr"
+    capabilities = frozenset({"inventory", "controllers", "interfaces"})
+
+    def collect_live_status(
+        self,
+        trans: ncs.maapi.Transaction,
+        device_hostname: str,
+        cached: Callable[[str, Callable[[], Any]], Any],
+        log: ncs.log.Log,
+    ) -> Tuple[List[ModuleRecord], List[ControllerRecord]]:
+        """Get device inventory and controllers data."""
+        return (
+            cached("inventory", lambda: iosxr_get_device_live_status_inventory(trans, device_hostname)),
+            cached("controllers", lambda: iosxr_get_device_live_status_controllers(trans, device_hostname)),
+        )
+
+    def collect_cdb_interfaces(self, trans: ncs.maapi.Transaction, device_hostname: str) -> List[InterfaceRecord]:
+        """Get device interfaces from cdb."""
+        return iosxr_get_device_cdb_interfaces(trans, device_hostname)
+
+
+DRIVER = IosXrDriver()
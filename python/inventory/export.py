@@ -0,0 +1,137 @@
+"""Inventory Export Module."""
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Set, Tuple, Type
+
+import ncs
+from inventory.constants import INDENTATION, USER
+from inventory.query import query_entries, query_values, xpath_any_of
+from inventory.records import ControllerRecord, InterfaceRecord, ModuleRecord, PlatformRecord
+from inventory.resilience import parse_date_and_time
+from inventory.tracing import TRACER
+
+# Exported data per yang node under an inventory device
+EXPORT_RECORDS: Dict[str, Type[Any]] = {
+    "platform": PlatformRecord,
+    "inventory": ModuleRecord,
+    "controller": ControllerRecord,
+    "interface": InterfaceRecord,
+}
+KEY_COLUMNS = ["type", "inventory-manager", "device"]
+CSV_COLUMNS = KEY_COLUMNS + list(
+    dict.fromkeys(field.replace("_", "-") for record in EXPORT_RECORDS.values() for field in record._fields)
+)
+
+
+class ExportOptions(NamedTuple):
+    """Export action input."""
+
+    file: str
+    format: str = "jsonl"
+    data: Tuple[str, ...] = tuple(EXPORT_RECORDS)
+    inventory_names: Tuple[str, ...] = ()
+    platforms: Tuple[str, ...] = ()
+    changed_only: bool = False
+
+    @property
+    def complete(self) -> bool:
+        """Check if all data of all inventory-managers and platforms is exported."""
+        return set(self.data) == set(EXPORT_RECORDS) and not self.inventory_names and not self.platforms
+
+
+def get_export_path(directory: str, file_name: str) -> str:
+    """Get the path of an export file, which must be a plain file name in the export directory."""
+    if not file_name or file_name in (".", "..") or os.path.basename(file_name) != file_name or "\\" in file_name:
+        raise ValueError(f"Export file {file_name!r} must be a file name without directory")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, file_name)
+
+
+def get_export_xpath(data: str, options: ExportOptions) -> str:
+    """Get XPath of the data nodes selected by the export filters."""
+    return (
+        "/inv:inventory-manager"
+        + xpath_any_of("inv:name", options.inventory_names)
+        + "/inv:device"
+        + xpath_any_of("inv:platform/inv:name", options.platforms)
+        + "/inv:"
+        + data
+    )
+
+
+def get_changed_devices(trans: ncs.maapi.Transaction, since: Optional[str]) -> Optional[Set[Tuple[str, str]]]:
+    """Get the (inventory-manager, device) entries changed since a date-and-time, None for all of them."""
+    if not since:
+        return None
+    since_time = parse_date_and_time(since)
+    return {
+        (inventory_name, hostname)
+        for (inventory_name, hostname), (last_changed,) in query_entries(
+            trans, "/inv:inventory-manager/inv:device", ["../name", "name"], ["last-changed"]
+        )
+        if not last_changed or parse_date_and_time(last_changed) > since_time
+    }
+
+
+def iter_export_rows(
+    trans: ncs.maapi.Transaction, options: ExportOptions, changed: Optional[Set[Tuple[str, str]]]
+) -> Iterator[Dict[str, Optional[str]]]:
+    """Read the selected data with chunked queries, one row per platform or list entry."""
+    for data in options.data:
+        columns = [field.replace("_", "-") for field in EXPORT_RECORDS[data]._fields]
+        with TRACER.span("export", data):
+            for values in query_values(trans, get_export_xpath(data, options), ["../../name", "../name"] + columns):
+                if changed is not None and (values[0], values[1]) not in changed:
+                    continue
+                yield dict(zip(KEY_COLUMNS, [data] + values[:2]), **dict(zip(columns, values[2:])))
+
+
+def write_export_rows(rows: Iterator[Dict[str, Optional[str]]], path: str, file_format: str) -> int:
+    """Write rows to a JSONL or CSV file as they are read, replacing the file once complete.
+
+    The rows are written to a temporary file next to it, removed if the export fails.
+    """
+    count = 0
+    temporary_path = path + ".tmp"
+    try:
+        with open(temporary_path, "w", encoding="utf-8", newline="") as export_file:
+            if file_format == "csv":
+                writer = csv.DictWriter(export_file, CSV_COLUMNS, restval="")
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow({column: "" if value is None else value for column, value in row.items()})
+                    count += 1
+            else:
+                for row in rows:
+                    export_file.write(json.dumps(row) + "\n")
+                    count += 1
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return count
+
+
+def export_inventory(options: ExportOptions, started: str, log: ncs.log.Log) -> int:
+    """Export inventory data to a file of the export directory.
+
+    Only a complete export records started as the last export time, a filtered one would
+    hide the changes of the data it leaves out from the next changed_only export.
+    """
+    with ncs.maapi.single_read_trans(USER, "system") as trans:
+        root = ncs.maagic.get_root(trans)
+        path = get_export_path(str(root.inv__inventory_settings.export.directory), options.file)
+        last_export = root.inv__inventory_operations.export.last_export
+        changed = get_changed_devices(trans, last_export if options.changed_only else None)
+        count = write_export_rows(iter_export_rows(trans, options, changed), path, options.format)
+    with ncs.maapi.single_write_trans(USER, "system") as trans:
+        export_state = ncs.maagic.get_root(trans).inv__inventory_operations.export
+        if options.complete:
+            export_state.last_export = started
+        export_state.last_file = path
+        export_state.last_count = count
+        trans.apply()
+    log.info("Export ##" + INDENTATION * 2 + f"{count} record(s) written to {path}")
+    return count
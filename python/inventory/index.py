@@ -0,0 +1,142 @@
+"""Inventory Hardware Index Module."""
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import ncs
+from inventory.constants import INDENTATION
+from inventory.query import query_entries
+from inventory.records import ControllerRecord, ModuleRecord
+
+# Indexed record fields per kind, as (yang leaf, record attribute)
+MODULE_FIELDS = (("serial-number", "serial_number"), ("pid", "pid"))
+CONTROLLER_FIELDS = (("serial-number", "serial_number"), ("pid", "pid"), ("part-number", "part_number"))
+
+
+class HardwareLocation(NamedTuple):
+    """Module or controller carrying an indexed value."""
+
+    inventory_name: str
+    device: str
+    kind: str
+    name: str
+    field: str
+
+
+def normalize(value: str) -> str:
+    """Index key of a serial number, pid or part number, lookups ignore case and padding."""
+    return value.strip().upper()
+
+
+def get_locations(
+    inventory_name: str, device_hostname: str, modules: Iterable[ModuleRecord], controllers: Iterable[ControllerRecord]
+) -> List[Tuple[str, HardwareLocation]]:
+    """Get the (index key, location) pairs of the modules and controllers of a device."""
+    locations = []
+    for kind, records, key_attribute, fields in (
+        ("module", modules, "name", MODULE_FIELDS),
+        ("controller", controllers, "id", CONTROLLER_FIELDS),
+    ):
+        for record in records:
+            for field, attribute in fields:
+                value = getattr(record, attribute)
+                if value and value.strip():
+                    location = HardwareLocation(
+                        inventory_name, device_hostname, kind, getattr(record, key_attribute), field
+                    )
+                    locations.append((normalize(value), location))
+    return locations
+
+
+def get_device_records(
+    trans: ncs.maapi.Transaction,
+) -> Tuple[Dict[Tuple[str, str], List[ModuleRecord]], Dict[Tuple[str, str], List[ControllerRecord]]]:
+    """Get the modules and controllers of all inventory-manager devices with one query each."""
+    modules: Dict[Tuple[str, str], List[ModuleRecord]] = {}
+    controllers: Dict[Tuple[str, str], List[ControllerRecord]] = {}
+    for (inventory_name, hostname, name), (pid, serial_number) in query_entries(
+        trans,
+        "/inv:inventory-manager/inv:device/inv:inventory",
+        ["../../name", "../name", "name"],
+        ["pid", "serial-number"],
+    ):
+        modules.setdefault((inventory_name, hostname), []).append(
+            ModuleRecord(name, pid=pid, serial_number=serial_number)
+        )
+    for (inventory_name, hostname, id_), (part_number, serial_number, pid) in query_entries(
+        trans,
+        "/inv:inventory-manager/inv:device/inv:controller",
+        ["../../name", "../name", "id"],
+        ["part-number", "serial-number", "pid"],
+    ):
+        controllers.setdefault((inventory_name, hostname), []).append(
+            ControllerRecord(id_, part_number=part_number, serial_number=serial_number, pid=pid)
+        )
+    return modules, controllers
+
+
+class HardwareIndex:
+    """In-memory index of module and controller serial numbers, pids and part numbers.
+
+    Built from cdb oper data with build and kept current by set_device after each write,
+    so a lookup does not read cdb.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.built = False
+        self.entries: Dict[str, Set[HardwareLocation]] = {}
+        self.devices: Dict[Tuple[str, str], List[Tuple[str, HardwareLocation]]] = {}
+
+    def build(self, trans: ncs.maapi.Transaction, log: ncs.log.Log) -> None:
+        """Replace the index with the inventory and controller lists of all inventory-managers."""
+        modules, controllers = get_device_records(trans)
+        devices = {
+            key: get_locations(*key, modules.get(key, []), controllers.get(key, []))
+            for key in set(modules) | set(controllers)
+        }
+        entries: Dict[str, Set[HardwareLocation]] = {}
+        for locations in devices.values():
+            for value, location in locations:
+                entries.setdefault(value, set()).add(location)
+        with self.lock:
+            self.devices = devices
+            self.entries = entries
+            self.built = True
+        log.info("Hardware Index ##" + INDENTATION * 2 + f"{len(entries)} value(s) of {len(devices)} device(s) indexed")
+
+    def set_device(
+        self,
+        inventory_name: str,
+        device_hostname: str,
+        modules: Iterable[ModuleRecord],
+        controllers: Iterable[ControllerRecord],
+    ) -> None:
+        """Replace the indexed modules and controllers of a device entry."""
+        locations = get_locations(inventory_name, device_hostname, modules, controllers)
+        with self.lock:
+            self._discard((inventory_name, device_hostname))
+            for value, location in locations:
+                self.entries.setdefault(value, set()).add(location)
+            self.devices[inventory_name, device_hostname] = locations
+
+    def remove_device(self, inventory_name: str, device_hostname: str) -> None:
+        """Remove a device entry from the index."""
+        with self.lock:
+            self._discard((inventory_name, device_hostname))
+
+    def lookup(self, value: str, field: Optional[str] = None) -> List[HardwareLocation]:
+        """Get the locations of a value, in any indexed field unless field is given."""
+        with self.lock:
+            locations = self.entries.get(normalize(value), set())
+            return sorted(location for location in locations if field is None or location.field == field)
+
+    def _discard(self, key: Tuple[str, str]) -> None:
+        for value, location in self.devices.pop(key, []):
+            locations = self.entries.get(value)
+            if locations is not None:
+                locations.discard(location)
+                if not locations:
+                    del self.entries[value]
+
+
+HARDWARE_INDEX = HardwareIndex()
@@ -0,0 +1,160 @@
+"""Inventory Background Job Module."""
+import datetime
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+import ncs
+from inventory.constants import INDENTATION, USER
+
+# Seconds between two progress writes of a running job
+PROGRESS_INTERVAL = 2.0
+# Finished jobs kept as oper data
+MAX_FINISHED_JOBS = 50
+FINISHED = ("done", "failed", "cancelled")
+
+
+def get_date_and_time() -> str:
+    """Get current time as a yang date-and-time string."""
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+class JobContext:
+    """Progress reporting and cancellation handle of a running job."""
+
+    def __init__(self, job_id: int, cancel: threading.Event, log: ncs.log.Log) -> None:
+        self.job_id = job_id
+        self.cancel = cancel
+        self.log = log
+        self.devices_done = 0
+        self._pending: List[Any] = []
+        self._last_flush = time.monotonic()
+
+    def report(self, result: Any) -> None:
+        """Record a finished device, a DeviceResult, and write progress at most every PROGRESS_INTERVAL."""
+        self.devices_done += 1
+        self._pending.append(result)
+        if time.monotonic() - self._last_flush >= PROGRESS_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write devices done and the devices finished since the last write."""
+        pending, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        try:
+            with ncs.maapi.single_write_trans(USER, "system") as trans:
+                job = ncs.maagic.get_root(trans).inv__inventory_operations.job[self.job_id]
+                job.devices_done = self.devices_done
+                for result in pending:
+                    device = job.device.create(result.inventory_name, result.name)
+                    device.status = result.status
+                    device.duration = f"{result.duration:.3f}"
+                    if result.message:
+                        device.error = result.message
+                trans.apply()
+        except Exception as exc:  # pylint: disable=broad-except
+            self.log.error("Job ##" + INDENTATION * 2 + f"{self.job_id} progress write failed: " + str(exc))
+
+
+class JobRunner:
+    """Worker thread running queued jobs one at a time, with their status kept as oper data.
+
+    A job is a callable taking a JobContext and returning a result summary.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Optional[Tuple[int, Callable[[JobContext], str]]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self, log: ncs.log.Log) -> None:
+        """Close jobs left over from a previous run and start the worker thread."""
+        self._cancel.clear()
+        with ncs.maapi.single_write_trans(USER, "system") as trans:
+            jobs = ncs.maagic.get_root(trans).inv__inventory_operations.job
+            last_id = 0
+            for job in jobs:
+                last_id = max(last_id, int(job.id))
+                if job.status not in FINISHED:
+                    job.status = "cancelled"
+                    job.result = "Interrupted by a package restart"
+            trans.apply()
+        self._ids = itertools.count(last_id + 1)
+        self._thread = threading.Thread(target=self._run, args=(log,), name="inventory-jobs", daemon=True)
+        self._thread.start()
+        log.info("Job ##" + INDENTATION + "worker started")
+
+    def stop(self, timeout: float = 60) -> None:
+        """Cancel the running job, drop the queued ones and wait for the worker thread."""
+        if self._thread is None:
+            return
+        self._cancel.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, description: str, devices_total: int, work: Callable[[JobContext], str]) -> int:
+        """Queue a job and return its id."""
+        if self._thread is None or self._cancel.is_set():
+            raise RuntimeError("Inventory job worker is not running")
+        with self._lock:
+            job_id = next(self._ids)
+        with ncs.maapi.single_write_trans(USER, "system") as trans:
+            jobs = ncs.maagic.get_root(trans).inv__inventory_operations.job
+            finished = sorted(int(job.id) for job in jobs if job.status in FINISHED)
+            for finished_id in finished[:-MAX_FINISHED_JOBS]:
+                del jobs[finished_id]
+            job = jobs.create(job_id)
+            job.description = description
+            job.status = "queued"
+            job.created = get_date_and_time()
+            job.devices_total = devices_total
+            job.devices_done = 0
+            trans.apply()
+        self._queue.put((job_id, work))
+        return job_id
+
+    def _set_job(self, log: ncs.log.Log, job_id: int, **leaves: Any) -> None:
+        """Set leaves of a job entry."""
+        try:
+            with ncs.maapi.single_write_trans(USER, "system") as trans:
+                job = ncs.maagic.get_root(trans).inv__inventory_operations.job[job_id]
+                for leaf, value in leaves.items():
+                    setattr(job, leaf, value)
+                trans.apply()
+        except Exception as exc:  # pylint: disable=broad-except
+            log.error("Job ##" + INDENTATION * 2 + f"{job_id} status write failed: " + str(exc))
+
+    def _run(self, log: ncs.log.Log) -> None:
+        """Run queued jobs until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job_id, work = item
+            if self._cancel.is_set():
+                self._set_job(log, job_id, status="cancelled", finished=get_date_and_time())
+                continue
+            log.info("Job ##" + INDENTATION + f"{job_id} running")
+            self._set_job(log, job_id, status="running", started=get_date_and_time())
+            context = JobContext(job_id, self._cancel, log)
+            try:
+                result = work(context)
+                status = "cancelled" if self._cancel.is_set() else "done"
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error("Job ##" + INDENTATION + f"{job_id} failed: " + str(exc))
+                result, status = str(exc), "failed"
+            context.flush()
+            self._set_job(log, job_id, status=status, result=result, finished=get_date_and_time())
+            log.info("Job ##" + INDENTATION + f"{job_id} {status}")
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                self._set_job(log, item[0], status="cancelled", finished=get_date_and_time())
+
+
+JOB_RUNNER = JobRunner()
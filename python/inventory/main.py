@@ -1,31 +1,65 @@
 """Inventory Action Module."""
-import inspect
-import re
-from typing import List, NamedTuple, Tuple
+import contextvars
+import functools
+import hashlib
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Collection, Dict, List, NamedTuple, Optional, Set, Tuple
 
 import _ncs
 import ncs
+from inventory.cache import LIVE_STATUS_CACHE
+from inventory.constants import INDENTATION, USER
+from inventory.drivers import get_driver, is_supported
+from inventory.export import EXPORT_RECORDS, ExportOptions, export_inventory
+from inventory.index import HARDWARE_INDEX
+from inventory.jobs import JOB_RUNNER, JobContext, get_date_and_time
+from inventory.query import (get_device_xpath, get_scope_predicate, iter_records, query_entries, query_keys,
+                             query_records, xpath_literal)
+from inventory.records import ControllerRecord, InterfaceRecord, ModuleRecord, PlatformRecord
+from inventory.resilience import (CollectionSettings, call_with_retries, get_circuit_open_until,
+                                  get_collection_settings, get_device_health, record_device_health)
+from inventory.scheduler import SCHEDULER, STATISTICS_INTERVAL, ScheduleSubscriber
+from inventory.subscriber import InterfaceSubscriber
+from inventory.tracing import TRACER, set_span_stats
+from inventory.writer import DEFAULT_CHUNK_SIZE, ChunkedWriter, ListDiff, keypath_key, reconcile_list, set_object
+
+# Seconds between two checks of the device collection deadlines
+DEADLINE_CHECK_INTERVAL = 1.0
+
+
+class DeviceInventory(NamedTuple):
+    """Collected inventory data of a single device."""
 
-INDENTATION = " "
-USER = "admin"
+    name: str
+    platform: PlatformRecord
+    modules: List[ModuleRecord]
+    controllers: List[ControllerRecord]
+    interfaces: List[InterfaceRecord]
+    fingerprint: str = ""
 
 
-class VrpInventory(NamedTuple):
-    """Inventory class for Huawei VRP platform."""
+class DeviceResult(NamedTuple):
+    """Per device outcome of an inventory update."""
 
+    inventory_name: str
     name: str
-    descr: str
-    pid: str
-    sn: str
+    status: str
+    message: str = ""
+    interfaces: Tuple[InterfaceRecord, ...] = ()
+    removed_interfaces: Tuple[Tuple[str, ...], ...] = ()
+    duration: float = 0.0
 
 
-class VrpTransceiver(NamedTuple):
-    """Transceiver class for Huawei VRP platform."""
+class SyncOptions(NamedTuple):
+    """Options of an inventory update run."""
 
-    port: str
-    status: str
-    type: str
-    pid: str
+    max_parallel: int
+    batch_size: int
+    remove_stale_pools: bool
+    force_refresh: bool
+    chunk_size: int = DEFAULT_CHUNK_SIZE
 
 
 class PoolInfo(NamedTuple):
@@ -36,6 +70,15 @@ class PoolInfo(NamedTuple):
     end: int
 
 
+class PoolSettings(NamedTuple):
+    """Id-pool provisioning mode and templates."""
+
+    provisioning: str
+    global_pools: List[PoolInfo]
+    device_pools: List[PoolInfo]
+    interface_pools: List[PoolInfo]
+
+
 GLOBAL_POOLS = [
     PoolInfo(name="PW_ID_POOL", start=10000, end=20000),
     PoolInfo(name="SERVICE_ID_POOL", start=10000, end=20000),
@@ -46,6 +89,9 @@ INTERFACE_POOLS = [
     PoolInfo(name="SVLAN_ID_POOL", start=2, end=4000),
     PoolInfo(name="SUB_INTF_ID_POOL", start=2, end=4000),
 ]
+# Pools created by ensure_pool, keyed by (template, device, if-size, if-number)
+ENSURED_POOLS: Dict[Tuple[str, Optional[str], Optional[str], Optional[str]], str] = {}
+ENSURED_POOLS_LOCK = threading.Lock()
 
 
 def get_kp_service_id(keypath: ncs.maagic.keypath._KeyPath) -> str:
@@ -55,421 +101,688 @@ def get_kp_service_id(keypath: ncs.maagic.keypath._KeyPath) -> str:
     return service
 
 
-def get_device_platform_name(root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log) -> str:
-    """Get device platform name."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    platform = root.ncs__devices.device[device_hostname].platform.name
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " platform is " + platform)
-    return platform
+def get_inventory_manager_xpath(inventory_name: str) -> str:
+    """Get XPath of an inventory-manager."""
+    return f"/inv:inventory-manager[inv:name={xpath_literal(inventory_name)}]"
+
 
+def get_inventory_device_xpath(inventory_name: str, device_hostname: str) -> str:
+    """Get XPath of a device under an inventory-manager."""
+    return get_inventory_manager_xpath(inventory_name) + f"/inv:device[inv:name={xpath_literal(device_hostname)}]"
+
+
+@TRACER.traced
+def get_device_platform(trans: ncs.maapi.Transaction, device_hostname: str) -> PlatformRecord:
+    """Get device platform details."""
+    platforms = query_records(trans, get_device_xpath(device_hostname) + "/ncs:platform", PlatformRecord)
+    platform_data = platforms[0] if platforms else PlatformRecord()
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s platform is %s", device_hostname, platform_data.name)
+    return platform_data
+
+
+def get_device_platforms(
+    trans: ncs.maapi.Transaction, hostnames: Optional[Collection[str]] = None
+) -> Dict[str, Optional[str]]:
+    """Get the platform names of all devices, or at least of the given ones, in one query."""
+    if hostnames is not None and not hostnames:
+        return {}
+    xpath = "/ncs:devices/ncs:device" + ("" if hostnames is None else get_scope_predicate("ncs:name", hostnames))
+    return {hostname: platform for (hostname,), (platform,) in query_entries(trans, xpath, ["name"], ["platform/name"])}
+
+
+def get_inventory_device_keypath(inventory_name: str, device_hostname: str) -> str:
+    """Get keypath of a device under an inventory-manager."""
+    return f"/inv:inventory-manager{keypath_key(inventory_name)}/device{keypath_key(device_hostname)}"
+
+
+@TRACER.traced
+def populate_platform_grouping(
+    writer: ChunkedWriter, platform_data: PlatformRecord, inventory_name: str, device_hostname: str
+) -> bool:
+    """Populate device information under inventory device, return whether it was written."""
+    device_xpath = get_inventory_device_xpath(inventory_name, device_hostname)
+    platforms = query_records(writer.trans, device_xpath + "/inv:platform", PlatformRecord)
+    if not platforms or platforms[0] != platform_data:
+        set_object(
+            writer.trans, platform_data, get_inventory_device_keypath(inventory_name, device_hostname) + "/platform"
+        )
+        writer.written()
+        TRACER.debug("Device ##" + INDENTATION * 2 + "%s platform details are set.", device_hostname)
+        return True
+    return False
+
+
+@TRACER.traced
+def populate_inventory_grouping(
+    writer: ChunkedWriter, inventory_data: List[ModuleRecord], inventory_name: str, device_hostname: str
+) -> ListDiff:
+    """Reconcile inventory list under inventory device."""
+    device_xpath = get_inventory_device_xpath(inventory_name, device_hostname)
+    stored = iter_records(writer.trans, device_xpath + "/inv:inventory", ModuleRecord)
+    list_keypath = get_inventory_device_keypath(inventory_name, device_hostname) + "/inventory"
+    diff = reconcile_list(writer, list_keypath, stored, inventory_data, 1)
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s inventory list %s", device_hostname, diff)
+    return diff
+
+
+@TRACER.traced
+def populate_controllers_grouping(
+    writer: ChunkedWriter, controllers_data: List[ControllerRecord], inventory_name: str, device_hostname: str
+) -> ListDiff:
+    """Reconcile controllers list under inventory device."""
+    device_xpath = get_inventory_device_xpath(inventory_name, device_hostname)
+    stored = iter_records(writer.trans, device_xpath + "/inv:controller", ControllerRecord)
+    list_keypath = get_inventory_device_keypath(inventory_name, device_hostname) + "/controller"
+    diff = reconcile_list(writer, list_keypath, stored, controllers_data, 1)
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s controller list %s", device_hostname, diff)
+    return diff
+
+
+@TRACER.traced
+def populate_interfaces_grouping(
+    writer: ChunkedWriter, interface_data: List[InterfaceRecord], inventory_name: str, device_hostname: str
+) -> ListDiff:
+    """Reconcile interface list under inventory device."""
+    device_xpath = get_inventory_device_xpath(inventory_name, device_hostname)
+    stored = iter_records(writer.trans, device_xpath + "/inv:interface", InterfaceRecord)
+    list_keypath = get_inventory_device_keypath(inventory_name, device_hostname) + "/interface"
+    diff = reconcile_list(writer, list_keypath, stored, interface_data, 2)
+    TRACER.debug("Device ##" + INDENTATION * 2 + "%s interface list %s", device_hostname, diff)
+    return diff
+
+
+def get_pool_name_prefix(device_name: str) -> str:
+    """Get the name prefix of the device and interface id-pools of a device."""
+    return device_name + "_"
+
+
+def get_device_pool_name(device_name: str, device_pool: PoolInfo) -> str:
+    """Get id-pool name of a device pool."""
+    return get_pool_name_prefix(device_name) + device_pool.name
+
+
+def get_interface_pool_name(device_name: str, if_size: str, if_number: str, interface_pool: PoolInfo) -> str:
+    """Get id-pool name of an interface pool."""
+    return get_pool_name_prefix(device_name) + if_size + "_" + if_number.replace("/", "_") + "_" + interface_pool.name
+
+
+def get_pool_settings(root: ncs.maagic.Root) -> PoolSettings:
+    """Get id-pool provisioning mode and templates, falling back to built-in templates per scope."""
+    pools = root.inv__inventory_settings.pools
+    templates: Dict[str, List[PoolInfo]] = {"global": [], "device": [], "interface": []}
+    for template in pools.template:
+        templates[str(template.scope)].append(PoolInfo(template.name, int(template.start), int(template.end)))
+    return PoolSettings(
+        str(pools.provisioning),
+        templates["global"] or GLOBAL_POOLS,
+        templates["device"] or DEVICE_POOLS,
+        templates["interface"] or INTERFACE_POOLS,
+    )
+
+
+def configure_live_status_cache(root: ncs.maagic.Root) -> None:
+    """Apply the live-status cache ttl and size settings."""
+    settings = root.inv__inventory_settings.live_status_cache
+    LIVE_STATUS_CACHE.configure(int(settings.ttl), int(settings.max_entries))
+
+
+@TRACER.traced
+def create_inventory_resource_pools(
+    results: List[DeviceResult], remove_stale_pools: bool, pool_settings: PoolSettings, log: ncs.log.Log
+) -> None:
+    """Create id-pools for the synced devices and interfaces.
+
+    Existing pool names of the synced devices are read once, by their name prefix; only
+    missing pools are created and, if asked, pools of interfaces removed in this run are
+    deleted, all in one transaction. In on-demand provisioning no pool is created here,
+    see ensure_pool.
+    """
+    pre_create = pool_settings.provisioning == "pre-create"
+    wanted_pools: Dict[str, PoolInfo] = {}
+    if pre_create:
+        wanted_pools.update((global_pool.name, global_pool) for global_pool in pool_settings.global_pools)
+    global_pools = set(wanted_pools)
+    stale_pools: Set[str] = set()
+    pool_devices: Set[str] = set()
+    for result in results:
+        if result.status not in ("updated", "unchanged"):
+            continue
+        if pre_create:
+            for device_pool in pool_settings.device_pools:
+                wanted_pools[get_device_pool_name(result.name, device_pool)] = device_pool
+        for interface_pool in pool_settings.interface_pools:
+            if pre_create:
+                for if_size, if_number in result.interfaces:
+                    pool_name = get_interface_pool_name(result.name, if_size, if_number, interface_pool)
+                    wanted_pools[pool_name] = interface_pool
+            if remove_stale_pools:
+                stale_pools.update(
+                    get_interface_pool_name(result.name, if_size, if_number, interface_pool)
+                    for if_size, if_number in result.removed_interfaces
+                )
+        if pre_create or (remove_stale_pools and result.removed_interfaces):
+            pool_devices.add(result.name)
+    if not wanted_pools and not stale_pools:
+        return
 
-def populate_platform_grouping(inventory_name: str, device_hostname: str, log: ncs.log.Log) -> None:
-    """Populate device information under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        platform = ncs.maagic.get_node(trans, f"/ncs:devices/device{{{device_hostname}}}/platform")
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device_platform = inventory_manager.device[device_hostname].platform
-        device_platform.name = platform.name
-        device_platform.version = platform.version
-        device_platform.model = platform.model
-        device_platform.serial_number = platform.serial_number
-        log.info("Device ##" + INDENTATION * 2 + device_hostname + " platform details are set.")
-        trans.apply()
-
-
-def create_inventory_resource_pools(inventory_name: str, log: ncs.log.Log) -> None:
-    """Create id-pools for inventory."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
     with ncs.maapi.single_write_trans(USER, "system") as trans:
         root = ncs.maagic.get_root(trans)
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
         id_pool = root.ralloc__resource_pools.idalloc__id_pool
-        for global_pool in GLOBAL_POOLS:
-            pool_name = global_pool.name
-            if pool_name not in id_pool:
+        predicate = get_scope_predicate(
+            "idalloc:name", global_pools, {get_pool_name_prefix(device) for device in pool_devices}
+        )
+        existing_pools = {
+            name for (name,) in query_keys(trans, "/ralloc:resource-pools/idalloc:id-pool" + predicate, ["name"])
+        }
+
+        created = 0
+        for pool_name, pool_info in wanted_pools.items():
+            if pool_name not in existing_pools:
+                pool = id_pool.create(pool_name)
+                pool.range.start, pool.range.end = pool_info.start, pool_info.end
+                created += 1
+        removed_pools = (stale_pools & existing_pools) - wanted_pools.keys()
+        for pool_name in removed_pools:
+            del id_pool[pool_name]
+
+        if created or removed_pools:
+            trans.apply()
+            forget_ensured_pools(removed_pools)
+        log.info("Inventory Pool ##" + INDENTATION * 2 + f"created: {created}, removed: {len(removed_pools)}")
+
+
+def forget_ensured_pools(pool_names: Set[str]) -> None:
+    """Drop deleted pools from the ensured pool cache."""
+    with ENSURED_POOLS_LOCK:
+        for request in [request for request, pool_name in ENSURED_POOLS.items() if pool_name in pool_names]:
+            del ENSURED_POOLS[request]
+
+
+def ensure_pool(
+    template_name: str,
+    log: ncs.log.Log,
+    device_name: Optional[str] = None,
+    if_size: Optional[str] = None,
+    if_number: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """Create an id-pool from its template when first needed.
+
+    Returns the pool name and whether it was created by this call. Pools already
+    ensured are answered from memory without any transaction.
+    """
+    request = (template_name, device_name, if_size, if_number)
+    with ENSURED_POOLS_LOCK:
+        if request in ENSURED_POOLS:
+            return ENSURED_POOLS[request], False
+
+        with ncs.maapi.single_write_trans(USER, "system") as trans:
+            root = ncs.maagic.get_root(trans)
+            pool_settings = get_pool_settings(root)
+            templates = {
+                pool.name: (scope, pool)
+                for scope, pools in (
+                    ("global", pool_settings.global_pools),
+                    ("device", pool_settings.device_pools),
+                    ("interface", pool_settings.interface_pools),
+                )
+                for pool in pools
+            }
+            if template_name not in templates:
+                raise ValueError(f"Unknown pool template {template_name}")
+            scope, pool_info = templates[template_name]
+            if scope == "global":
+                pool_name = pool_info.name
+            elif device_name is None:
+                raise ValueError(f"Pool template {template_name} requires a device")
+            elif scope == "device":
+                pool_name = get_device_pool_name(device_name, pool_info)
+            elif if_size is None or if_number is None:
+                raise ValueError(f"Pool template {template_name} requires an if-size and if-number")
+            else:
+                pool_name = get_interface_pool_name(device_name, if_size, if_number, pool_info)
+
+            id_pool = root.ralloc__resource_pools.idalloc__id_pool
+            created = pool_name not in id_pool
+            if created:
                 pool = id_pool.create(pool_name)
-                pool.range.start, pool.range.end = global_pool.start, global_pool.end
+                pool.range.start, pool.range.end = pool_info.start, pool_info.end
+                trans.apply()
                 log.info("Inventory Pool ##" + INDENTATION * 2 + pool_name + " is created.")
+        ENSURED_POOLS[request] = pool_name
+    return pool_name, created
+
+
+def get_device_cdb_interfaces(
+    trans: ncs.maapi.Transaction, device_hostname: str, platform: Optional[str]
+) -> List[InterfaceRecord]:
+    """Get device interfaces from cdb with the driver of its platform."""
+    driver = get_driver(platform)
+    if "interfaces" not in driver.capabilities:
+        return []
+    return driver.collect_cdb_interfaces(trans, device_hostname)
+
+
+@TRACER.traced
+def sync_device_interfaces(device_hostnames: Set[str], log: ncs.log.Log) -> List[DeviceResult]:
+    """Reconcile the interface entries and id-pools of devices whose interface config changed.
+
+    Only cdb is read, the devices are written in every inventory-manager they belong to.
+    """
+    with ncs.maapi.single_read_trans(USER, "system") as trans:
+        root = ncs.maagic.get_root(trans)
+        settings = root.inv__inventory_settings.interface_subscriber
+        if not settings.enabled:
+            return []
+        remove_stale_pools = bool(settings.remove_stale_pools)
+        pool_settings = get_pool_settings(root)
+        chunk_size = int(root.inv__inventory_settings.write.chunk_size)
+        platforms = get_device_platforms(trans, device_hostnames)
+        entries = [
+            (inventory_name, hostname)
+            for inventory_name, hostname in query_keys(
+                trans,
+                "/inv:inventory-manager/inv:device" + get_scope_predicate("inv:name", device_hostnames),
+                ["../name", "name"],
+            )
+            if hostname in device_hostnames and is_supported(platforms.get(hostname))
+        ]
+        interfaces = {
+            hostname: get_device_cdb_interfaces(trans, hostname, platforms[hostname])
+            for hostname in {hostname for _, hostname in entries}
+        }
+    if not entries:
+        return []
+
+    results = []
+    with ChunkedWriter(chunk_size) as writer:
+        for inventory_name, hostname in entries:
+            interface_diff = populate_interfaces_grouping(writer, interfaces[hostname], inventory_name, hostname)
+            if any(interface_diff):
+                writer.trans.set_elem(
+                    get_date_and_time(), get_inventory_device_keypath(inventory_name, hostname) + "/last-changed"
+                )
+                writer.written()
+            results.append(
+                DeviceResult(
+                    inventory_name,
+                    hostname,
+                    "updated",
+                    interfaces=tuple(interfaces[hostname]),
+                    removed_interfaces=tuple(interface_diff.deleted),
+                )
+            )
+    create_inventory_resource_pools(results, remove_stale_pools, pool_settings, log)
+    return results
+
+
+def get_inventory_fingerprint(
+    platform: PlatformRecord,
+    modules: List[ModuleRecord],
+    controllers: List[ControllerRecord],
+    interfaces: List[InterfaceRecord],
+) -> str:
+    """Hash the collected records, independent of the order the device reported them in."""
+    digest = hashlib.sha256()
+    for records in ([platform], modules, controllers, interfaces):
+        for record in sorted(tuple("" if value is None else str(value) for value in record) for record in records):
+            digest.update(repr(record).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_device_fingerprints(
+    trans: ncs.maapi.Transaction, hostnames: Collection[str]
+) -> Dict[Tuple[str, str], Optional[str]]:
+    """Get the inventory-manager entries of devices with their stored fingerprint, None if not written yet."""
+    if not hostnames:
+        return {}
+    return {
+        (inventory_name, name): fingerprint
+        for (inventory_name, name), (fingerprint,) in query_entries(
+            trans,
+            "/inv:inventory-manager/inv:device" + get_scope_predicate("inv:name", hostnames),
+            ["../name", "name"],
+            ["fingerprint"],
+        )
+    }
+
+
+def collect_device_inventory(device_hostname: str, log: ncs.log.Log, force_refresh: bool = False) -> DeviceInventory:
+    """Collect device inventory data in a dedicated maapi session.
+
+    Live-status data is served from LIVE_STATUS_CACHE while fresh unless force_refresh is set,
+    cdb data is always read. An unsupported platform raises before any live-status call.
+    """
+    TRACER.debug("Sync ##" + INDENTATION * 2 + "%s", device_hostname)
+
+    def cached(kind: str, collect: Callable[[], Any]) -> Any:
+        return LIVE_STATUS_CACHE.get_or_collect((device_hostname, kind), collect, force_refresh)
+
+    with ncs.maapi.single_read_trans(USER, "system") as trans:
+        platform_data = get_device_platform(trans, device_hostname)
+        platform = platform_data.name
+        TRACER.platform.set(platform or "-")
+
+        driver = get_driver(platform)
+        with TRACER.span("collect"):
+            inventory_data, controllers_data = driver.collect_live_status(trans, device_hostname, cached, log)
+            interface_data = (
+                driver.collect_cdb_interfaces(trans, device_hostname) if "interfaces" in driver.capabilities else []
+            )
+
+    fingerprint = get_inventory_fingerprint(platform_data, inventory_data, controllers_data, interface_data)
+    return DeviceInventory(
+        device_hostname, platform_data, inventory_data, controllers_data, interface_data, fingerprint
+    )
+
+
+@TRACER.traced
+def write_device_inventories(
+    batch: List[Tuple[str, DeviceInventory]], chunk_size: int, log: ncs.log.Log
+) -> List[DeviceResult]:
+    """Write platform, inventory, controller and interface data of (inventory-manager, device) pairs."""
+    interface_diffs: List[ListDiff] = []
+    changed: List[bool] = []
+    # per device, the commit count its last entries are included in once it exceeds it
+    written_at: List[int] = []
+    now = get_date_and_time()
+    error = None
+    writer = ChunkedWriter(chunk_size)
+    try:
+        with writer:
+            for inventory_name, device_inventory in batch:
+                hostname = device_inventory.name
+                with TRACER.span("write", device_inventory.platform.name or "-"):
+                    platform_written = populate_platform_grouping(
+                        writer, device_inventory.platform, inventory_name, hostname
+                    )
+                    diffs = (
+                        populate_inventory_grouping(writer, device_inventory.modules, inventory_name, hostname),
+                        populate_controllers_grouping(writer, device_inventory.controllers, inventory_name, hostname),
+                        populate_interfaces_grouping(writer, device_inventory.interfaces, inventory_name, hostname),
+                    )
+                    interface_diffs.append(diffs[-1])
+                    changed.append(platform_written or any(any(diff) for diff in diffs))
+                    device_keypath = get_inventory_device_keypath(inventory_name, hostname)
+                    # written after the lists, a device cut off by a failed commit is written by the next update
+                    writer.trans.set_elem(device_inventory.fingerprint, device_keypath + "/fingerprint")
+                    # a new fingerprint of identical data, e.g. after a collector change, is no change
+                    if changed[-1]:
+                        writer.trans.set_elem(now, device_keypath + "/last-changed")
+                    writer.written()
+                written_at.append(writer.commits if writer.pending else writer.commits - 1)
+    except Exception as exc:  # pylint: disable=broad-except
+        log.error("Inventory Manager ##" + INDENTATION * 2 + "batch write failed: " + str(exc))
+        error = str(exc)
+
+    # devices committed before a failure keep their result, the others are retried alone
+    results = []
+    for index, (inventory_name, device_inventory) in enumerate(batch):
+        if error is not None and (index >= len(written_at) or written_at[index] >= writer.commits):
+            if len(batch) > 1:
+                results.extend(write_device_inventories([(inventory_name, device_inventory)], chunk_size, log))
             else:
-                log.info("Inventory Pool ##" + INDENTATION * 2 + pool_name + " is already created, skipping.")
-
-        for device in inventory_manager.device:
-            device_name = device.name
-            for device_pool in DEVICE_POOLS:
-                pool_name = device_name + "_" + device_pool.name
-                if pool_name not in id_pool:
-                    pool = id_pool.create(pool_name)
-                    pool.range.start, pool.range.end = device_pool.start, device_pool.end
-                    log.info("Device Pool ##" + INDENTATION * 4 + pool_name + " is created.")
+                results.append(DeviceResult(inventory_name, device_inventory.name, "failed", error))
+            continue
+        HARDWARE_INDEX.set_device(
+            inventory_name, device_inventory.name, device_inventory.modules, device_inventory.controllers
+        )
+        results.append(
+            DeviceResult(
+                inventory_name,
+                device_inventory.name,
+                "updated" if changed[index] else "unchanged",
+                interfaces=tuple(device_inventory.interfaces),
+                removed_interfaces=tuple(interface_diffs[index].deleted),
+            )
+        )
+    log.info(
+        "Inventory Manager ##" + INDENTATION * 2 + f"{len(batch)} device(s) are written in {writer.commits} commit(s)."
+    )
+    return results
+
+
+@TRACER.traced
+def sync_devices(
+    device_groups: Dict[str, List[str]],
+    options: SyncOptions,
+    log: ncs.log.Log,
+    progress: Optional[Callable[[DeviceResult], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    collection: CollectionSettings = CollectionSettings(),
+) -> List[DeviceResult]:
+    """Collect devices, at most max_parallel at a time, and write them in batches."""
+    # a device of several inventory-managers is collected once and written to each of them
+    hostname_groups: Dict[str, List[str]] = {}
+    for inventory_name, hostnames in device_groups.items():
+        for hostname in hostnames:
+            hostname_groups.setdefault(hostname, []).append(inventory_name)
+    with ncs.maapi.single_read_trans(USER, "system") as trans:
+        fingerprints = get_device_fingerprints(trans, hostname_groups)
+        platforms = get_device_platforms(trans, hostname_groups)
+        health = get_device_health(trans, hostname_groups)
+    log.info("Sync ##" + INDENTATION * 2 + f"{len(hostname_groups)} unique device(s) in {len(device_groups)} group(s)")
+
+    starts: Dict[str, float] = {}
+    durations: Dict[str, float] = {}
+    results: Dict[Tuple[str, str], DeviceResult] = {}
+    succeeded: Set[str] = set()
+    failed: Dict[str, str] = {}
+    batch: List[Tuple[str, DeviceInventory]] = []
+
+    def collect(hostname: str) -> DeviceInventory:
+        starts[hostname] = time.monotonic()
+        try:
+            return call_with_retries(
+                lambda: collect_device_inventory(hostname, log, options.force_refresh),
+                collection.retries,
+                collection.retry_backoff,
+                starts[hostname] + collection.timeout,
+                log,
+                cancel,
+            )
+        finally:
+            durations[hostname] = time.monotonic() - starts[hostname]
+
+    def finish(result: DeviceResult) -> None:
+        result = result._replace(duration=durations.get(result.name, 0.0))
+        results[result.inventory_name, result.name] = result
+        if progress is not None:
+            progress(result)
+
+    def fail(hostname: str, message: str) -> None:
+        log.error("Device ##" + INDENTATION * 2 + hostname + " collection failed: " + message)
+        failed[hostname] = message
+        for inventory_name in hostname_groups[hostname]:
+            finish(DeviceResult(inventory_name, hostname, "failed", message))
+
+    def write(batch: List[Tuple[str, DeviceInventory]]) -> None:
+        for result in write_device_inventories(batch, options.chunk_size, log):
+            finish(result)
+
+    # devices missing from their inventory-manager or without a driver fail without counting as failures
+    for hostname, inventory_names in list(hostname_groups.items()):
+        for inventory_name in [name for name in inventory_names if (name, hostname) not in fingerprints]:
+            message = f"Not a device of inventory-manager {inventory_name}"
+            log.error("Device ##" + INDENTATION * 2 + hostname + " " + message)
+            inventory_names.remove(inventory_name)
+            finish(DeviceResult(inventory_name, hostname, "failed", message))
+        if not inventory_names:
+            del hostname_groups[hostname]
+
+    for hostname in [hostname for hostname in hostname_groups if not is_supported(platforms.get(hostname))]:
+        message = f"Unsupported platform {platforms.get(hostname)!r}"
+        log.error("Device ##" + INDENTATION * 2 + hostname + " " + message)
+        for inventory_name in hostname_groups.pop(hostname):
+            finish(DeviceResult(inventory_name, hostname, "failed", message))
+
+    # devices failing repeatedly are skipped until their cool-down ends
+    for hostname, device_health in health.items():
+        open_until = get_circuit_open_until(device_health)
+        if open_until is None or hostname not in hostname_groups:
+            continue
+        message = f"Skipped after repeated failures until {open_until.isoformat()}"
+        log.info("Device ##" + INDENTATION * 2 + hostname + " " + message)
+        for inventory_name in hostname_groups.pop(hostname):
+            finish(DeviceResult(inventory_name, hostname, "skipped", message))
+
+    def start(hostname: str) -> Future:
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(collect(hostname))
+            except Exception as exc:  # pylint: disable=broad-except
+                future.set_exception(exc)
+
+        threading.Thread(target=contextvars.copy_context().run, args=(run,), name="inventory-sync", daemon=True).start()
+        return future
+
+    # A thread per collection: one given up after the timeout keeps running but frees its
+    # slot, so max_parallel collections within their timeout are running at any time.
+    queued = list(reversed(hostname_groups))
+    futures: Dict[Future, str] = {}
+    pending: Set[Future] = set()
+    while True:
+        while queued and len(pending) < options.max_parallel:
+            hostname = queued.pop()
+            future = start(hostname)
+            futures[future] = hostname
+            pending.add(future)
+        if not pending:
+            break
+        done, pending = wait(pending, timeout=DEADLINE_CHECK_INTERVAL, return_when=FIRST_COMPLETED)
+        if cancel is not None and cancel.is_set():
+            log.info("Sync ##" + INDENTATION * 2 + "cancelled")
+            break
+        for future in done:
+            hostname = futures[future]
+            try:
+                device_inventory = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                fail(hostname, str(exc))
+                continue
+            succeeded.add(hostname)
+            # entries of an unchanged fingerprint are not written, unless force_refresh is set
+            for inventory_name in hostname_groups[hostname]:
+                if (
+                    not options.force_refresh
+                    and fingerprints.get((inventory_name, hostname)) == device_inventory.fingerprint
+                ):
+                    TRACER.debug("Device ##" + INDENTATION * 2 + "%s is unchanged in %s", hostname, inventory_name)
+                    finish(
+                        DeviceResult(
+                            inventory_name, hostname, "unchanged", interfaces=tuple(device_inventory.interfaces)
+                        )
+                    )
                 else:
-                    log.info("Device Pool ##" + INDENTATION * 4 + pool_name + " is already created, skipping.")
-
-            for interface in device.interface:
-                if_size = interface.if_size
-                if_number = str(interface.if_number).replace("/", "_")
-                for interface_pool in INTERFACE_POOLS:
-                    pool_name = device_name + "_" + if_size + "_" + if_number + "_" + interface_pool.name
-                    if pool_name not in id_pool:
-                        pool = id_pool.create(pool_name)
-                        pool.range.start, pool.range.end = interface_pool.start, interface_pool.end
-                        log.info("Interface Pool ##" + INDENTATION * 6 + pool_name + " is created.")
-                    else:
-                        log.info("Interface Pool ##" + INDENTATION * 6 + pool_name + " is already created, skipping.")
-        trans.apply()
-
-def iosxr_get_device_live_status_inventory(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.List:
-    """Get device inventory data from ned live-status."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    inventory_data = root.ncs__devices.device[device_hostname].live_status.cisco_ios_xr_stats__inventory
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " inventory data is gathered.")
-    return inventory_data
-
-
-def iosxr_get_device_live_status_controllers(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.List:
-    """Get device controllers data from ned live-status."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    controllers_data = root.ncs__devices.device[device_hostname].live_status.cisco_ios_xr_stats__controllers
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " controllers data is gathered.")
-    return controllers_data
-
-
-def iosxr_get_device_cdb_interfaces(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.Container:
-    """Get device interfaces data from cdb."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    interfaces_data = root.ncs__devices.device[device_hostname].config.cisco_ios_xr__interface
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " interfaces data is gathered.")
-    return interfaces_data
-
-
-def iosxr_populate_inventory_grouping(
-    inventory_data: ncs.maagic.List, inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate inventory list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        for data in inventory_data:
-            module = device.inventory.create(data.name)
-            module.description = data.descr
-            module.pid = data.pid
-            module.serial_number = data.sn
-            log.info("Module ##" + INDENTATION * 4 + data.name + " is created.")
-        trans.apply()
-
-
-def iosxr_populate_controllers_grouping(
-    controllers_data: ncs.maagic.List, inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate controllers list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        for data in controllers_data.Optics:
-            instance = data.instance
-            transceiver = instance.transceiver_vendor_details
-            controller = device.controller.create(data.id)
-            controller.controller_state = instance.controller_state
-            controller.optics_type = transceiver.optics_type
-            controller.name = transceiver.name
-            controller.part_number = transceiver.part_number
-            controller.serial_number = transceiver.serial_number
-            controller.pid = transceiver.pid
-            log.info("Controller ##" + INDENTATION * 4 + data.id + " is created.")
-        trans.apply()
-
-
-def iosxr_populate_interfaces_grouping(
-    interface_data: ncs.maagic.Container, inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate interface list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    if_sizes: List = [
-        "Bundle_Ether",
-        "FiftyGigE",
-        "FortyGigE",
-        "FourHundredGigE",
-        "GigabitEthernet",
-        "HundredGigE",
-        "TenGigE",
-        "TwentyFiveGigE",
-        "TwoHundredGigE",
+                    batch.append((inventory_name, device_inventory))
+        now = time.monotonic()
+        for future in [future for future in pending if now - starts.get(futures[future], now) > collection.timeout]:
+            pending.discard(future)
+            fail(futures[future], f"Collection timed out after {collection.timeout:g}s")
+        # workers only collect, this thread is the single writer
+        if len(batch) >= options.batch_size:
+            write(batch)
+            batch = []
+    if batch:
+        write(batch)
+    record_device_health(succeeded, failed, health, collection, log)
+    return [
+        results.get((inventory_name, hostname)) or DeviceResult(inventory_name, hostname, "failed", "Cancelled")
+        for inventory_name, hostnames in device_groups.items()
+        for hostname in hostnames
     ]
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        del device.interface  # Delete device interface list first to re-create from scratch
-        log.info("Device ##" + INDENTATION * 2 + " interface list is deleted.")
-        for if_size in if_sizes:
-            for size in getattr(interface_data, if_size):
-                if_number = str(size.id)
-                device.interface.create(size, if_number)
-                log.info("Interface ##" + INDENTATION * 4 + if_size + " " + if_number + " is created.")
-        trans.apply()
-
-
-def huawei_vrp_parse_inventory_data(data: str, device_hostname: str, log: ncs.log.Log) -> List[VrpInventory]:
-    """Parse 'display elabel brief' cli command output."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    inventory = []
-    parent_pattern = r"(\w+)\s+(\d+)\s+(\S+)\s+(\S+)\s+(.*)"
-    power_pattern = r"(\w+)\s+(\d+)"
-    child_pattern = r"\s+(\w+)\s*(\d+)\s+(\S+)\s+(\S+)\s+(.*)"
-
-    for line in data.splitlines():
-        parent_match = re.match(parent_pattern, line)
-        power_match = re.match(power_pattern, line)
-        child_match = re.match(child_pattern, line)
-
-        if parent_match:
-            parent_slot, parent_slot_num, pid, serial_number, description = parent_match.groups()
-        elif power_match:
-            parent_slot, parent_slot_num = power_match.groups()
-            pid = serial_number = description = ""
-        elif child_match:
-            if len(child_match.groups()) == 5:
-                child_slot, child_slot_num, pid, serial_number, description = child_match.groups()
-            elif len(child_match.groups()) == 4:
-                description = ""
-
-        if parent_match or power_match:
-            inventory.append(VrpInventory(f"{parent_slot}{parent_slot_num}", description, pid, serial_number))
-        elif child_match:
-            child_slot_num = f"{parent_slot_num}/{child_slot_num}"
-            inventory.append(VrpInventory(f"{child_slot}{child_slot_num}", description, pid, serial_number))
-
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " inventory data is parsed.")
-    return inventory
-
-
-def huawei_vrp_parse_transceiver_data(data: str, device_hostname: str, log: ncs.log.Log) -> List[VrpTransceiver]:
-    """Parse 'display optical-module brief' cli command output."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    transceiver_list = []
-
-    lines = data.strip().split("\n")
-    # Iterate through the lines starts with Eth
-    for line in lines[4:-2]:
-        values = line.split()
-        transceiver = VrpTransceiver(values[0], values[1], values[3], values[-1])
-        transceiver_list.append(transceiver)
-
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " transceiver data is parsed.")
-    return transceiver_list
-
-
-def huawei_vrp_get_device_live_status_exec_inventory(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.List:
-    """Get device inventory data from live-status exec."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    live_status = root.ncs__devices.device[device_hostname].live_status.vrp_stats__exec.display
-    action_input = live_status.get_input()
-    action_input.args = ["elabel brief"]
-    inventory_data = live_status(action_input).result
-    parsed_inventory_data = huawei_vrp_parse_inventory_data(inventory_data, device_hostname, log)
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " inventory data is gathered.")
-    return parsed_inventory_data
-
-
-def huawei_vrp_get_device_live_status_exec_transceiver(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.List:
-    """Get device transceiver data from live-status exec."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    live_status = root.ncs__devices.device[device_hostname].live_status.vrp_stats__exec.display
-    action_input = live_status.get_input()
-    action_input.args = ["optical-module brief"]
-    transceiver_data = live_status(action_input).result
-    parsed_transceiver_data = huawei_vrp_parse_transceiver_data(transceiver_data, device_hostname, log)
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " transceiver data is gathered.")
-    return parsed_transceiver_data
-
-
-def huawei_vrp_get_device_cdb_interfaces(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.Container:
-    """Get device interfaces data from cdb."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    interfaces_data = root.ncs__devices.device[device_hostname].config.vrp__interface
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " interfaces data is gathered.")
-    return interfaces_data
-
-
-def huawei_vrp_populate_inventory_grouping(
-    inventory_data: List[VrpInventory], inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate inventory list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        for data in inventory_data:
-            module = device.inventory.create(data.name)
-            module.description = data.descr
-            module.pid = data.pid
-            module.serial_number = data.sn
-            log.info("Module ##" + INDENTATION * 4 + data.name + " is created.")
-        trans.apply()
-
-
-def huawei_vrp_populate_controllers_grouping(
-    transceiver_data: List[VrpTransceiver], inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate controllers list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        for data in transceiver_data:
-            controller = device.controller.create(data.port)
-            controller.controller_state = data.status
-            controller.optics_type = data.type
-            controller.pid = data.pid
-            log.info("Controller ##" + INDENTATION * 4 + data.port + " is created.")
-        trans.apply()
-
-
-def huawei_vrp_populate_interfaces_grouping(
-    interface_data: ncs.maagic.Container, inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate interface list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    if_sizes: List = [
-        "Eth_Trunk",
-        "GigabitEthernet",
-        "Ethernet",
-    ]
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        del device.interface  # Delete device interface list first to re-create from scratch
-        log.info("Device ##" + INDENTATION * 2 + " interface list is deleted.")
-        for if_size in if_sizes:
-            for size in getattr(interface_data, if_size):
-                if_number = str(size.name).split(".", maxsplit=1)[0]
-                device.interface.create(size, if_number)
-                log.info("Interface ##" + INDENTATION * 4 + if_size + " " + if_number + " is created.")
-        trans.apply()
-
-
-def alu_sr_get_device_live_status_card(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.List:
-    """Get device card data from ned live-status."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    card_data = root.ncs__devices.device[device_hostname].live_status.alu_stats__card
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " card data is gathered.")
-    return card_data
-
-
-def alu_sr_get_device_live_status_slot(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.List:
-    """Get device slot data from ned live-status."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    slot_data = root.ncs__devices.device[device_hostname].live_status.alu_stats__slot
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " card data is gathered.")
-    return slot_data
-
-
-def alu_sr_get_device_live_status_ports(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> ncs.maagic.List:
-    """Get device pots data from ned live-status."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    ports_data = root.ncs__devices.device[device_hostname].live_status.alu_stats__ports
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " ports data is gathered.")
-    return ports_data
-
-
-def alu_sr_get_device_cdb_interfaces(
-    root: ncs.maagic.Root, device_hostname: str, log: ncs.log.Log
-) -> Tuple[ncs.maagic.List, ncs.maagic.List]:
-    """Get device ports and lags data from cdb."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    ports_data: ncs.maagic.List = root.ncs__devices.device[device_hostname].config.alu__port
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " ports data is gathered.")
-    lags_data: ncs.maagic.List = root.ncs__devices.device[device_hostname].config.alu__lag
-    log.info("Device ##" + INDENTATION * 2 + device_hostname + " lags data is gathered.")
-    return ports_data, lags_data
-
-
-def alu_sr_populate_inventory_grouping(
-    card_data: ncs.maagic.List, slot_data: ncs.maagic.List, inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate inventory list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        for data in card_data:
-            module = device.inventory.create(data.card_id)
-            module.description = data.provisioned_type
-            module.pid = data.part_number
-            module.serial_number = data.serial_number
-            log.info("Module ##" + INDENTATION * 4 + data.card_id + " is created.")
-        for data in slot_data:
-            for mda_data in data.mda:
-                mda_id = str(data.slot_id) + "/" + str(mda_data.mda_id)
-                module = device.inventory.create(mda_id)
-                module.description = mda_data.provisioned_type
-                module.pid = mda_data.part_number
-                module.serial_number = mda_data.serial_number
-                log.info("Module ##" + INDENTATION * 4 + mda_id + " is created.")
-        trans.apply()
-
-
-def alu_sr_populate_controllers_grouping(
-    ports_data: ncs.maagic.List, inventory_name: str, device_hostname: str, log: ncs.log.Log
-) -> None:
-    """Populate controllers list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        for data in ports_data:
-            controller = device.controller.create(data.port_id)
-            controller.controller_state = data.port_state
-            transceiver = data.transceiver_data
-            controller.optics_type = transceiver.transceiver_type
-            controller.part_number = transceiver.part_number
-            controller.serial_number = transceiver.serial_number
-            controller.pid = transceiver.model_number
-            log.info("Controller ##" + INDENTATION * 4 + data.port_id + " is created.")
-        trans.apply()
-
-
-def alu_sr_populate_interfaces_grouping(
-    interface_data: Tuple[ncs.maagic.List, ncs.maagic.List], inventory_name: str, device_hostname: str, log: ncs.log.Log
+
+
+def run_inventory_update(
+    device_groups: Dict[str, List[str]],
+    options: SyncOptions,
+    log: ncs.log.Log,
+    progress: Optional[Callable[[DeviceResult], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    statistics_interval: float = 0.0,
+) -> List[DeviceResult]:
+    """Sync the device groups and provision their id-pools with the current settings.
+
+    The span statistics are written unless written less than statistics_interval seconds ago.
+    """
+    with ncs.maapi.single_read_trans(USER, "system") as trans:
+        root = ncs.maagic.get_root(trans)
+        configure_live_status_cache(root)
+        pool_settings = get_pool_settings(root)
+        collection = get_collection_settings(root)
+        options = options._replace(chunk_size=int(root.inv__inventory_settings.write.chunk_size))
+        TRACER.verbose = bool(root.inv__inventory_settings.logging.verbose)
+    results = sync_devices(device_groups, options, log, progress, cancel, collection)
+    with TRACER.span("pools", "-"):
+        create_inventory_resource_pools(results, options.remove_stale_pools, pool_settings, log)
+    TRACER.publish(statistics_interval)
+    return results
+
+
+def submit_inventory_update(
+    description: str, device_groups: Dict[str, List[str]], options: SyncOptions, log: ncs.log.Log
+) -> int:
+    """Queue an inventory update as a background job and return the job id."""
+
+    def work(job: JobContext) -> str:
+        results = run_inventory_update(device_groups, options, log, job.report, job.cancel)
+        return format_result_counters(count_results(results))
+
+    devices_total = sum(len(hostnames) for hostnames in device_groups.values())
+    return JOB_RUNNER.submit(description, devices_total, work)
+
+
+def run_scheduled_update(
+    device_groups: Dict[str, List[str]],
+    max_parallel: int,
+    batch_size: int,
+    cancel: threading.Event,
+    log: ncs.log.Log,
 ) -> None:
-    """Populate interface list under inventory device."""
-    log.info("Function ##" + INDENTATION * 2 + inspect.stack()[0][3])
-    ports_data, lags_data = interface_data
-    with ncs.maapi.single_write_trans(USER, "system") as trans:
-        inventory_manager = ncs.maagic.get_node(trans, f"/inv:inventory-manager{{{inventory_name}}}")
-        device = inventory_manager.device[device_hostname]
-        del device.interface  # Delete device interface list first to re-create from scratch
-        log.info("Device ##" + INDENTATION * 2 + " interface list is deleted.")
-        for port in ports_data:
-            if_size = "port"
-            if_number = str(port.port_id)
-            device.interface.create(if_size, if_number)
-            log.info("Interface ##" + INDENTATION * 4 + if_size + " " + if_number + " is created.")
-        for lag in lags_data:
-            if_size = "lag"
-            if_number = f"lag-{str(lag.id)}"
-            device.interface.create(if_size, if_number)
-            log.info("Interface ##" + INDENTATION * 4 + if_size + " " + if_number + " is created.")
-        trans.apply()
+    """Update the due devices of scheduled inventory-managers."""
+    results = run_inventory_update(
+        device_groups,
+        SyncOptions(max_parallel, batch_size, False, False),
+        log,
+        cancel=cancel,
+        statistics_interval=STATISTICS_INTERVAL,
+    )
+    log.info("Scheduler ##" + INDENTATION + format_result_counters(count_results(results)))
+
+
+def get_sync_options(action_input: Any) -> SyncOptions:
+    """Get update options from an update action input."""
+    return SyncOptions(
+        int(action_input.max_parallel),
+        int(action_input.batch_size),
+        bool(action_input.remove_stale_pools),
+        bool(action_input.force_refresh),
+    )
+
+
+def count_results(results: List[DeviceResult]) -> Dict[str, int]:
+    """Count device results per status."""
+    counters = {"updated": 0, "unchanged": 0, "failed": 0, "skipped": 0}
+    for result in results:
+        counters[result.status] += 1
+    return counters
+
+
+def format_result_counters(counters: Dict[str, int]) -> str:
+    """Format device result counters."""
+    return ", ".join(f"{status}: {count}" for status, count in counters.items())
+
+
+def set_result_counters(output: Any, results: List[DeviceResult]) -> str:
+    """Set the device status counters of an update action output and summarize them."""
+    counters = count_results(results)
+    output.updated = counters["updated"]
+    output.unchanged = counters["unchanged"]
+    output.failed = counters["failed"]
+    output.skipped = counters["skipped"]
+    return format_result_counters(counters)
 
 
 # ------------------------
@@ -503,48 +816,122 @@ class InventoryUpdate(ncs.dp.Action):
 
         if target == "all":
             self.log.info("Action ##" + INDENTATION + name + " target all")
-            devices = inventory_manager.device
+            devices = [device.name for device in inventory_manager.device]
         elif target == "specify":
             self.log.info("Action ##" + INDENTATION + name + " target specify")
             devices = input.device.as_list()
 
+        options = get_sync_options(input)
+        if input.background:
+            output.job_id = submit_inventory_update(
+                "update-inventory-manager " + inventory_name, {inventory_name: devices}, options, self.log
+            )
+            output.result = f"Job {output.job_id} queued for {len(devices)} device(s)"
+            return
+
         self.log.info("Sync ##" + INDENTATION + "Processing device:")
-        for device in devices:
-            hostname = device.name if isinstance(device, ncs.maagic.ListElement) else device
-            self.log.info("Sync ##" + INDENTATION * 2 + hostname)
-            platform = get_device_platform_name(root, hostname, self.log)
-            populate_platform_grouping(inventory_name, hostname, self.log)
-
-            if platform == "ios-xr":
-                self.log.info("Device ##" + INDENTATION * 2 + hostname + " platform is ios-xr.")
-                inventory_data = iosxr_get_device_live_status_inventory(root, hostname, self.log)
-                controllers_data = iosxr_get_device_live_status_controllers(root, hostname, self.log)
-                interface_data = iosxr_get_device_cdb_interfaces(root, hostname, self.log)
-                iosxr_populate_inventory_grouping(inventory_data, inventory_name, hostname, self.log)
-                iosxr_populate_controllers_grouping(controllers_data, inventory_name, hostname, self.log)
-                iosxr_populate_interfaces_grouping(interface_data, inventory_name, hostname, self.log)
-
-            elif platform == "huawei-vrp":
-                self.log.info("Device ##" + INDENTATION * 2 + hostname + " platform is huawei-vrp.")
-                inventory_data = huawei_vrp_get_device_live_status_exec_inventory(root, hostname, self.log)
-                transceiver_data = huawei_vrp_get_device_live_status_exec_transceiver(root, hostname, self.log)
-                interface_data = huawei_vrp_get_device_cdb_interfaces(root, hostname, self.log)
-                huawei_vrp_populate_inventory_grouping(inventory_data, inventory_name, hostname, self.log)
-                huawei_vrp_populate_controllers_grouping(transceiver_data, inventory_name, hostname, self.log)
-                huawei_vrp_populate_interfaces_grouping(interface_data, inventory_name, hostname, self.log)
+        with TRACER.run() as spans:
+            results = run_inventory_update({inventory_name: devices}, options, self.log)
+        set_span_stats(output.span, spans.snapshot())
+        for result in results:
+            device_result = output.device.create(result.name)
+            device_result.status = result.status
+            if result.message:
+                device_result.message = result.message
+        output.result = f"Devices processed: {len(devices)}, " + set_result_counters(output, results)
 
-            else:
-                self.log.info("Device ##" + INDENTATION * 2 + hostname + " platform is alu-sr.")
-                card_data = alu_sr_get_device_live_status_card(root, hostname, self.log)
-                slot_data = alu_sr_get_device_live_status_slot(root, hostname, self.log)
-                ports_data = alu_sr_get_device_live_status_ports(root, hostname, self.log)
-                interface_data = alu_sr_get_device_cdb_interfaces(root, hostname, self.log)
-                alu_sr_populate_inventory_grouping(card_data, slot_data, inventory_name, hostname, self.log)
-                alu_sr_populate_controllers_grouping(ports_data, inventory_name, hostname, self.log)
-                alu_sr_populate_interfaces_grouping(interface_data, inventory_name, hostname, self.log)
 
-        create_inventory_resource_pools(inventory_name, self.log)
-        output.result = f"Devices processed: {len(devices)}"
+class InventorySync(ncs.dp.Action):
+    """Fleet-wide inventory update action class."""
+
+    @ncs.dp.Action.action
+    def cb_action(self, uinfo, name, kp, input, output, trans):
+        """Update all or the selected inventory-managers in one run."""
+        self.log.info("Action triggered ##" + INDENTATION + name)
+        _ncs.dp.action_set_timeout(uinfo, 1800)
+        root = ncs.maagic.get_root(trans)
+        inventory_names = input.inventory_manager.as_list() or [
+            inventory_manager.name for inventory_manager in root.inv__inventory_manager
+        ]
+        device_groups = {
+            inventory_name: [device.name for device in root.inv__inventory_manager[inventory_name].device]
+            for inventory_name in inventory_names
+        }
+
+        options = get_sync_options(input)
+        if input.background:
+            output.job_id = submit_inventory_update(
+                "sync-inventory-managers " + " ".join(inventory_names), device_groups, options, self.log
+            )
+            output.result = f"Job {output.job_id} queued for {len(inventory_names)} inventory-manager(s)"
+            return
+
+        self.log.info("Sync ##" + INDENTATION + "Processing inventory-managers: " + ", ".join(inventory_names))
+        with TRACER.run() as spans:
+            results = run_inventory_update(device_groups, options, self.log)
+        set_span_stats(output.span, spans.snapshot())
+        for result in results:
+            device_result = output.device.create(result.inventory_name, result.name)
+            device_result.status = result.status
+            if result.message:
+                device_result.message = result.message
+        unique_devices = len({result.name for result in results})
+        output.result = (
+            f"Inventory-managers processed: {len(inventory_names)}, devices collected: {unique_devices}, "
+            + set_result_counters(output, results)
+        )
+
+
+class EnsurePool(ncs.dp.Action):
+    """Ensure id-pool action class."""
+
+    @ncs.dp.Action.action
+    def cb_action(self, uinfo, name, kp, input, output, trans):
+        """Create an id-pool from its template if it does not exist yet."""
+        self.log.info("Action triggered ##" + INDENTATION + name)
+        output.pool_name, output.created = ensure_pool(
+            input.template, self.log, input.device, input.if_size, input.if_number
+        )
+
+
+class HardwareLookup(ncs.dp.Action):
+    """Hardware lookup action class."""
+
+    @ncs.dp.Action.action
+    def cb_action(self, uinfo, name, kp, input, output, trans):
+        """Find the modules and controllers carrying a serial number, pid or part number."""
+        self.log.info("Action triggered ##" + INDENTATION + name + " " + input.value)
+        if input.rebuild or not HARDWARE_INDEX.built:
+            HARDWARE_INDEX.build(trans, self.log)
+        field = None if input.field == "any" else str(input.field)
+        matches = 0
+        for location in HARDWARE_INDEX.lookup(input.value, field):
+            if not trans.exists(get_inventory_device_keypath(location.inventory_name, location.device)):
+                HARDWARE_INDEX.remove_device(location.inventory_name, location.device)
+                continue
+            output.match.create(*location)
+            matches += 1
+        output.result = f"{matches} match(es)"
+
+
+class ExportInventory(ncs.dp.Action):
+    """Inventory export action class."""
+
+    @ncs.dp.Action.action
+    def cb_action(self, uinfo, name, kp, input, output, trans):
+        """Stream inventory data to a local JSONL or CSV file."""
+        self.log.info("Action triggered ##" + INDENTATION + name + " " + input.file)
+        _ncs.dp.action_set_timeout(uinfo, 1800)
+        options = ExportOptions(
+            input.file,
+            str(input.format),
+            tuple(str(data) for data in input.data) or tuple(EXPORT_RECORDS),
+            tuple(input.inventory_manager.as_list()),
+            tuple(input.platform.as_list()),
+            bool(input.changed_since_last_export),
+        )
+        output.records = export_inventory(options, get_date_and_time(), self.log)
+        output.result = f"{output.records} record(s) written to {input.file}"
 
 
 # ---------------------------------------------
@@ -553,9 +940,13 @@ class InventoryUpdate(ncs.dp.Action):
 class Main(ncs.application.Application):
     """Inventory action class."""
 
+    interface_subscriber: Optional[InterfaceSubscriber] = None
+    schedule_subscriber: Optional[ScheduleSubscriber] = None
+
     def setup(self):
         """Register service and actions."""
         self.log.info("Main RUNNING")
+        TRACER.log = self.log
 
         # inventory service registration
         self.register_service("inventory-manager-servicepoint", InventoryCallbacks)
@@ -563,8 +954,44 @@ class Main(ncs.application.Application):
         # inventory update-inventory-manager action
         self.register_action("update-inventory-manager", InventoryUpdate)
 
+        # inventory sync-inventory-managers action
+        self.register_action("inventory-sync", InventorySync)
+
+        # inventory ensure-pool action
+        self.register_action("inventory-ensure-pool", EnsurePool)
+
+        # inventory hardware-lookup action
+        self.register_action("inventory-hardware-lookup", HardwareLookup)
+
+        # inventory export action
+        self.register_action("inventory-export", ExportInventory)
+
+        # inventory hardware index
+        with ncs.maapi.single_read_trans(USER, "system") as trans:
+            HARDWARE_INDEX.build(trans, self.log)
+
+        # inventory background job worker
+        JOB_RUNNER.start(self.log)
+
+        # inventory interface cdb subscriber
+        self.interface_subscriber = InterfaceSubscriber(
+            self, self.log, functools.partial(sync_device_interfaces, log=self.log)
+        )
+        self.interface_subscriber.start()
+
+        # inventory refresh scheduler, re-planned on schedule config changes
+        SCHEDULER.start(self.log, functools.partial(run_scheduled_update, log=self.log))
+        self.schedule_subscriber = ScheduleSubscriber(self, self.log, SCHEDULER.invalidate)
+        self.schedule_subscriber.start()
+
         self.log.info("Main Application Started")
 
     def teardown(self):
         """Teardown."""
+        if self.schedule_subscriber is not None:
+            self.schedule_subscriber.stop()
+        SCHEDULER.stop()
+        if self.interface_subscriber is not None:
+            self.interface_subscriber.stop()
+        JOB_RUNNER.stop()
         self.log.info("Main FINISHED")
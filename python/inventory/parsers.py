@@ -0,0 +1,93 @@
+"""Huawei VRP CLI Output Parser Module."""
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+
+class VrpInventory(NamedTuple):
+    """Inventory class for Huawei VRP platform."""
+
+    name: str
+    descr: str
+    pid: str
+    sn: str
+
+
+class VrpTransceiver(NamedTuple):
+    """Transceiver class for Huawei VRP platform."""
+
+    port: str
+    status: str
+    type: str
+    pid: str
+
+
+# 'display elabel brief' board row, e.g. "LPU 1  CR5DLPUFA070  030QFPW0H7000456  2x100GE LPU".
+# Indented rows are sub-boards (PICs) of the last board, power and fan rows may only carry slot and number.
+ELABEL_ROW = re.compile(
+    r"^(?P<indent>[ \t]*)(?P<slot>[A-Za-z]\w*?)[ \t]*(?P<number>\d+)"
+    r"(?:[ \t]+(?P<pid>\S+))?(?:[ \t]+(?P<sn>\S+))?(?:[ \t]+(?P<descr>\S[^\r\n]*?))?[ \t]*\r?$",
+    re.MULTILINE,
+)
+# 'display optical-module brief' port names, e.g. "GE0/3/0" or "100GE0/1/0"
+PORT_NAME = re.compile(r"\S*\d/\d")
+PID_COLUMNS = ("vendorpn", "vendor-pn", "pn", "partnumber")
+
+
+def huawei_vrp_parse_inventory_data(data: str) -> Iterator[VrpInventory]:
+    """Parse 'display elabel brief' cli command output.
+
+    Sub-boards are named after their board slot number, e.g. PIC 0 of LPU 1 is PIC1/0.
+    """
+    parent_slot_num = None
+    for match in ELABEL_ROW.finditer(data):
+        slot, slot_num, pid, serial_number, description = match.group("slot", "number", "pid", "sn", "descr")
+        if not match.group("indent"):
+            parent_slot_num = slot_num
+            name = f"{slot}{slot_num}"
+        elif parent_slot_num is not None:
+            name = f"{slot}{parent_slot_num}/{slot_num}"
+        else:
+            continue
+        yield VrpInventory(name, description or "", pid or "", serial_number or "")
+
+
+def huawei_vrp_parse_transceiver_data(data: str) -> Iterator[VrpTransceiver]:
+    """Parse 'display optical-module brief' cli command output.
+
+    Columns are located from the header row; port, status and type are counted from the
+    left, the vendor PN from the right so a value with spaces in between does not shift it.
+    """
+    columns = None
+    status_index, type_index, pid_index = 1, 3, -1
+    for line in data.splitlines():
+        values = line.split()
+        if not values:
+            continue
+        if columns is None:
+            if values[0].lower() == "port":
+                columns = [value.lower() for value in values]
+                status_index = columns.index("status") if "status" in columns else status_index
+                type_index = columns.index("type") if "type" in columns else type_index
+                pid_column = next((column for column in PID_COLUMNS if column in columns), columns[-1])
+                pid_index = columns.index(pid_column) - len(columns)
+            continue
+        if len(values) < len(columns) or not PORT_NAME.match(values[0]):
+            continue
+        yield VrpTransceiver(values[0], values[status_index], values[type_index], values[pid_index])
+
+
+def split_command_output(data: str, commands: Sequence[str]) -> Dict[str, str]:
+    """Split the output of several cli commands run in one exec on their echoed command lines."""
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for line in data.splitlines():
+        stripped = line.rstrip()
+        command = next((command for command in commands if stripped.endswith(command)), None)
+        if command is not None:
+            current = sections.setdefault(command, [])
+        elif current is not None:
+            current.append(line)
+    missing = [command for command in commands if command not in sections]
+    if missing:
+        raise ValueError("no output for command(s): " + ", ".join(missing))
+    return {command: "\n".join(lines) for command, lines in sections.items()}
@@ -0,0 +1,92 @@
+"""Inventory CDB Query Module."""
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple, Type, cast
+
+import _ncs
+import ncs
+
+QUERY_CHUNK_SIZE = 500
+# Most names and prefixes a query is narrowed to with a predicate, more are read as the whole list
+SCOPED_QUERY_MAX_TERMS = 100
+
+
+def xpath_literal(value: str) -> str:
+    """Quote a value as an XPath string literal."""
+    return f'"{value}"' if "'" in value else f"'{value}'"
+
+
+def xpath_any_of(step: str, values: Collection[str], prefixes: Collection[str] = ()) -> str:
+    """Get an XPath predicate matching any of the values or starting with any of the prefixes, empty for none."""
+    terms = [f"{step}={xpath_literal(value)}" for value in values]
+    terms.extend(f"starts-with({step}, {xpath_literal(prefix)})" for prefix in prefixes)
+    return "[" + " or ".join(terms) + "]" if terms else ""
+
+
+def get_scope_predicate(step: str, values: Collection[str], prefixes: Collection[str] = ()) -> str:
+    """Get a predicate narrowing a list query to the given entries.
+
+    Up to SCOPED_QUERY_MAX_TERMS values and prefixes are matched by the predicate; for
+    more it is empty, the whole list is read in chunks and the caller filters the rows.
+    An empty predicate is returned for no values either, the caller skips the query then.
+    """
+    if len(values) + len(prefixes) > SCOPED_QUERY_MAX_TERMS:
+        return ""
+    return xpath_any_of(step, sorted(values), sorted(prefixes))
+
+
+def get_device_xpath(device_hostname: str) -> str:
+    """Get XPath of a device under /ncs:devices."""
+    return f"/ncs:devices/ncs:device[ncs:name={xpath_literal(device_hostname)}]"
+
+
+def query_values(trans: ncs.maapi.Transaction, xpath: str, select: List[str]) -> Iterator[List[Optional[str]]]:
+    """Read the selected values of every node matching xpath with a chunked MAAPI query.
+
+    A whole subtree is fetched with one query instead of one maagic round trip per leaf.
+    Non-existing values are returned as None.
+    """
+    query_handle = _ncs.maapi.query_start(
+        trans.maapi.msock, trans.th, xpath, "/", QUERY_CHUNK_SIZE, 1, _ncs.QUERY_STRING, select, []
+    )
+    try:
+        while True:
+            result = _ncs.maapi.query_result(trans.maapi.msock, query_handle)
+            for values in result:
+                yield [value or None for value in values]
+            if result.nresults < QUERY_CHUNK_SIZE:
+                break
+    finally:
+        _ncs.maapi.query_stop(trans.maapi.msock, query_handle)
+
+
+def query_keys(trans: ncs.maapi.Transaction, xpath: str, keys: List[str]) -> Iterator[List[str]]:
+    """Read values every matching node has, list keys or node names, with a chunked MAAPI query."""
+    return cast(Iterator[List[str]], query_values(trans, xpath, keys))
+
+
+def query_entries(
+    trans: ncs.maapi.Transaction, xpath: str, keys: List[str], select: List[str]
+) -> Iterator[Tuple[List[str], List[Optional[str]]]]:
+    """Read the keys and the selected, possibly non-existing, values of every node matching xpath."""
+    for values in query_values(trans, xpath, keys + select):
+        yield cast(List[str], values[: len(keys)]), values[len(keys) :]
+
+
+def iter_records(
+    trans: ncs.maapi.Transaction, xpath: str, record_type: Type[Any], select: Optional[Dict[str, str]] = None
+) -> Iterator[Any]:
+    """Read every node matching xpath into a record, one query chunk at a time.
+
+    select maps record fields to XPath expressions relative to the matched node, by
+    default each field is read from the leaf of the same name.
+    """
+    if select is None:
+        select = {field: field.replace("_", "-") for field in record_type._fields}
+    for values in query_values(trans, xpath, list(select.values())):
+        yield record_type(**dict(zip(select, values)))
+
+
+def query_records(
+    trans: ncs.maapi.Transaction, xpath: str, record_type: Type[Any], select: Optional[Dict[str, str]] = None
+) -> List[Any]:
+    """Read every node matching xpath into a list of records."""
+    return list(iter_records(trans, xpath, record_type, select))
@@ -0,0 +1,40 @@
+"""Inventory Record Module."""
+from typing import NamedTuple, Optional
+
+
+# Record fields follow the leaf order of their YANG grouping, set_object depends on it.
+class PlatformRecord(NamedTuple):
+    """Device platform record."""
+
+    name: Optional[str] = None
+    version: Optional[str] = None
+    model: Optional[str] = None
+    serial_number: Optional[str] = None
+
+
+class ModuleRecord(NamedTuple):
+    """Inventory module record."""
+
+    name: str
+    description: Optional[str] = None
+    pid: Optional[str] = None
+    serial_number: Optional[str] = None
+
+
+class ControllerRecord(NamedTuple):
+    """Interface controller record."""
+
+    id: str
+    controller_state: Optional[str] = None
+    optics_type: Optional[str] = None
+    name: Optional[str] = None
+    part_number: Optional[str] = None
+    serial_number: Optional[str] = None
+    pid: Optional[str] = None
+
+
+class InterfaceRecord(NamedTuple):
+    """Interface reference record."""
+
+    if_size: str
+    if_number: str
@@ -0,0 +1,129 @@
+"""Inventory Device Failure Handling Module."""
+import datetime
+import threading
+import time
+from typing import Callable, Collection, Dict, NamedTuple, Optional, Set, TypeVar
+
+import ncs
+from inventory.constants import INDENTATION, USER
+from inventory.query import get_scope_predicate, query_entries
+
+T = TypeVar("T")
+
+
+class CollectionSettings(NamedTuple):
+    """Per device collection limits, times in seconds."""
+
+    timeout: float = 300
+    retries: int = 1
+    retry_backoff: float = 5
+    failure_threshold: int = 3
+    cool_down: float = 3600
+
+
+class DeviceHealth(NamedTuple):
+    """Failure record of a device."""
+
+    consecutive_failures: int
+    circuit_open_until: Optional[datetime.datetime]
+
+
+def get_collection_settings(root: ncs.maagic.Root) -> CollectionSettings:
+    """Get collection timeout, retry and circuit breaker settings."""
+    settings = root.inv__inventory_settings.collection
+    return CollectionSettings(
+        int(settings.timeout),
+        int(settings.retries),
+        int(settings.retry_backoff),
+        int(settings.circuit_breaker.failure_threshold),
+        int(settings.circuit_breaker.cool_down) * 60,
+    )
+
+
+def call_with_retries(
+    func: Callable[[], T],
+    retries: int,
+    backoff: float,
+    deadline: float,
+    log: ncs.log.Log,
+    cancel: Optional[threading.Event] = None,
+) -> T:
+    """Call func, retrying a failure up to retries times with exponential backoff.
+
+    No retry is started if it would begin after the deadline, a time.monotonic() value,
+    or once cancel is set; the last failure is raised then.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as exc:  # pylint: disable=broad-except
+            delay = backoff * 2**attempt
+            attempt += 1
+            if attempt > retries or time.monotonic() + delay >= deadline:
+                raise
+            log.info("Retry ##" + INDENTATION * 2 + f"attempt {attempt} in {delay:g}s after: {exc}")
+            if cancel is not None and cancel.wait(delay):
+                raise
+            if cancel is None:
+                time.sleep(delay)
+
+
+def parse_date_and_time(value: str) -> datetime.datetime:
+    """Parse a yang date-and-time string."""
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def get_device_health(trans: ncs.maapi.Transaction, hostnames: Collection[str]) -> Dict[str, DeviceHealth]:
+    """Get the failure records of the given devices that failed their last collection."""
+    if not hostnames:
+        return {}
+    return {
+        hostname: DeviceHealth(int(failures), parse_date_and_time(open_until) if open_until else None)
+        for (hostname, failures), (open_until,) in query_entries(
+            trans,
+            "/inv:inventory-operations/inv:device-failure" + get_scope_predicate("inv:name", hostnames),
+            ["name", "consecutive-failures"],
+            ["circuit-open-until"],
+        )
+        if hostname in hostnames
+    }
+
+
+def get_circuit_open_until(health: DeviceHealth) -> Optional[datetime.datetime]:
+    """Get the end of the cool-down period of a device within it, None if it may be collected."""
+    open_until = health.circuit_open_until
+    if open_until is None or open_until <= datetime.datetime.now(datetime.timezone.utc):
+        return None
+    return open_until
+
+
+def record_device_health(
+    succeeded: Set[str],
+    failed: Dict[str, str],
+    health: Dict[str, DeviceHealth],
+    settings: CollectionSettings,
+    log: ncs.log.Log,
+) -> None:
+    """Clear the failure records of succeeded devices and count failures of failed ones.
+
+    A device reaching failure_threshold consecutive failures is skipped for cool_down seconds.
+    """
+    if not failed and not succeeded.intersection(health):
+        return
+    now = datetime.datetime.now(datetime.timezone.utc)
+    with ncs.maapi.single_write_trans(USER, "system") as trans:
+        device_failure = ncs.maagic.get_root(trans).inv__inventory_operations.device_failure
+        for hostname in succeeded.intersection(health):
+            del device_failure[hostname]
+        for hostname, error in failed.items():
+            failures = health[hostname].consecutive_failures + 1 if hostname in health else 1
+            failure = device_failure.create(hostname)
+            failure.consecutive_failures = failures
+            failure.last_failure = now.isoformat(timespec="seconds")
+            failure.last_error = error
+            if settings.failure_threshold and failures >= settings.failure_threshold:
+                open_until = now + datetime.timedelta(seconds=settings.cool_down)
+                failure.circuit_open_until = open_until.isoformat(timespec="seconds")
+                log.warning("Device ##" + INDENTATION * 2 + f"{hostname} is skipped until {failure.circuit_open_until}")
+        trans.apply()
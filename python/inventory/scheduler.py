@@ -0,0 +1,189 @@
+"""Inventory Refresh Scheduler Module."""
+import random
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import ncs
+from inventory.constants import INDENTATION, USER
+from inventory.query import query_entries, query_keys
+
+# Seconds between two scheduler passes
+TICK = 10.0
+# Least seconds between two span statistics writes of scheduled updates
+STATISTICS_INTERVAL = 300.0
+# Config the schedule is planned from
+SCHEDULE_PATHS = ("/inv:inventory-manager", "/inv:inventory-settings/inv:scheduler")
+
+
+class ScheduleSettings(NamedTuple):
+    """Scheduler settings and the refresh interval, in seconds, of each scheduled inventory-manager."""
+
+    max_parallel: int
+    batch_size: int
+    jitter: float
+    intervals: Dict[str, float]
+    devices: Dict[str, List[str]]
+
+
+def get_schedule_settings() -> ScheduleSettings:
+    """Read scheduler settings and the devices of scheduled inventory-managers with two queries."""
+    with ncs.maapi.single_read_trans(USER, "system") as trans:
+        settings = ncs.maagic.get_root(trans).inv__inventory_settings.scheduler
+        intervals = {
+            name: int(refresh_interval) * 60.0
+            for (name,), (refresh_interval,) in query_entries(
+                trans, "/inv:inventory-manager", ["name"], ["refresh-interval"]
+            )
+            if refresh_interval is not None
+        }
+        devices: Dict[str, List[str]] = {name: [] for name in intervals}
+        for inventory_name, hostname in query_keys(trans, "/inv:inventory-manager/inv:device", ["../name", "name"]):
+            if inventory_name in devices:
+                devices[inventory_name].append(hostname)
+        for hostnames in devices.values():
+            hostnames.sort()
+        return ScheduleSettings(
+            int(settings.max_parallel), int(settings.batch_size), int(settings.jitter) / 100, intervals, devices
+        )
+
+
+class ScheduleSubscriber(ncs.cdb.Subscriber):
+    """CDB subscriber calling on_change when the schedule config changes.
+
+    Interface list writes of the inventory updates are changes below device entries and
+    are not looked into, only created and deleted devices count.
+    """
+
+    def __init__(self, app: ncs.application.Application, log: ncs.log.Log, on_change: Callable[[], None]):
+        self.on_change = on_change
+        super().__init__(app=app, log=log)
+
+    def init(self):
+        """Register the inventory-managers and the scheduler settings."""
+        for path in SCHEDULE_PATHS:
+            self.register(path, priority=100)
+
+    def pre_iterate(self):
+        """Start with no schedule change."""
+        return set()
+
+    def iterate(self, kp, op, oldv, newv, state):  # pylint: disable=unused-argument
+        """Record the first schedule change."""
+        if op == ncs.MOP_MODIFIED and len(kp) == 2:
+            return ncs.ITER_RECURSE
+        if op == ncs.MOP_MODIFIED and len(kp) == 4:
+            return ncs.ITER_CONTINUE
+        state.add(str(kp))
+        return ncs.ITER_STOP
+
+    def should_post_iterate(self, state):
+        """Run post_iterate only if the schedule changed."""
+        return bool(state)
+
+    def post_iterate(self, state):
+        """Hand the change over."""
+        self.log.info("Subscriber ##" + INDENTATION + "schedule changed at " + ", ".join(sorted(state)))
+        self.on_change()
+
+
+class Scheduler:
+    """Thread refreshing scheduled inventory-managers device by device.
+
+    The devices of a group are spread evenly over its refresh interval, each slot moved
+    by a random jitter, so collections do not all start at the same moment. Due devices
+    of all groups are updated together by one run at a time, which bounds the live-status
+    load of scheduled runs to the configured max-parallel; update actions and background
+    jobs are bounded by their own max-parallel, not by this one. The schedule is read on
+    start and again after invalidate, called by ScheduleSubscriber, so an idle pass reads
+    nothing.
+    """
+
+    def __init__(self) -> None:
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._due: Dict[Tuple[str, str], float] = {}
+        self._plans: Dict[str, Tuple[float, Tuple[str, ...]]] = {}
+        self._settings: Optional[ScheduleSettings] = None
+        self._stale = threading.Event()
+
+    def start(self, log: ncs.log.Log, run: Callable[[Dict[str, List[str]], int, int, threading.Event], None]) -> None:
+        """Start the scheduler thread.
+
+        run is called with the due devices per group, max-parallel, batch-size and an event
+        set when the scheduler is stopped.
+        """
+        self._stop.clear()
+        self._stale.set()
+        self._thread = threading.Thread(target=self._loop, args=(log, run), name="inventory-scheduler", daemon=True)
+        self._thread.start()
+        log.info("Scheduler ##" + INDENTATION + "started")
+
+    def stop(self, timeout: float = 60) -> None:
+        """Stop the scheduler thread, cancelling the running update."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def invalidate(self) -> None:
+        """Re-read the schedule before the next pass."""
+        self._stale.set()
+
+    def plan(self, settings: ScheduleSettings, now: float) -> None:
+        """Give all devices of a new group, or of a group whose interval or device list changed, a slot."""
+        scheduled = {(name, device) for name, devices in settings.devices.items() for device in devices}
+        for key in [key for key in self._due if key not in scheduled]:
+            del self._due[key]
+        for name, devices in settings.devices.items():
+            group_plan = (settings.intervals[name], tuple(devices))
+            if self._plans.get(name) == group_plan:
+                continue
+            self._plans[name] = group_plan
+            slot = group_plan[0] / max(len(devices), 1)
+            for index, device in enumerate(devices):
+                self._due[name, device] = now + index * slot + random.uniform(0, settings.jitter * slot)
+        for name in [name for name in self._plans if name not in settings.intervals]:
+            del self._plans[name]
+
+    def pop_due(self, settings: ScheduleSettings, now: float) -> Dict[str, List[str]]:
+        """Get the due devices per group and move them to their next slot after now."""
+        due_groups: Dict[str, List[str]] = {}
+        for (name, device), due in self._due.items():
+            if due > now:
+                continue
+            due_groups.setdefault(name, []).append(device)
+            interval = settings.intervals[name]
+            slot = interval / max(len(settings.devices[name]), 1)
+            # a device run late keeps the phase of its slot instead of being due again right away
+            next_due = due + interval * ((now - due) // interval + 1)
+            self._due[name, device] = next_due + random.uniform(-settings.jitter, settings.jitter) * slot
+        return due_groups
+
+    def _loop(self, log: ncs.log.Log, run: Callable[[Dict[str, List[str]], int, int, threading.Event], None]) -> None:
+        """Run due devices every TICK seconds until stopped."""
+        while not self._stop.wait(TICK):
+            try:
+                now = time.monotonic()
+                if self._stale.is_set():
+                    self._stale.clear()
+                    try:
+                        self._settings = get_schedule_settings()
+                    except Exception:
+                        self._stale.set()
+                        raise
+                    self.plan(self._settings, now)
+                if self._settings is None:
+                    continue
+                due_groups = self.pop_due(self._settings, now)
+                if not due_groups:
+                    continue
+                due_devices = sum(len(devices) for devices in due_groups.values())
+                log.info("Scheduler ##" + INDENTATION + f"{due_devices} device(s) due in {len(due_groups)} group(s)")
+                run(due_groups, self._settings.max_parallel, self._settings.batch_size, self._stop)
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error("Scheduler ##" + INDENTATION + "pass failed: " + str(exc))
+
+
+SCHEDULER = Scheduler()
@@ -0,0 +1,54 @@
+"""Inventory Interface Subscriber Module."""
+from typing import Callable, Set
+
+import ncs
+from inventory.constants import INDENTATION
+
+# Device config subtrees the inventory interface lists are built from
+INTERFACE_PATHS = (
+    "/ncs:devices/ncs:device/ncs:config/cisco-ios-xr:interface",
+    "/ncs:devices/ncs:device/ncs:config/vrp:interface",
+    "/ncs:devices/ncs:device/ncs:config/alu:port",
+    "/ncs:devices/ncs:device/ncs:config/alu:lag",
+)
+
+
+class InterfaceSubscriber(ncs.cdb.Subscriber):
+    """CDB subscriber collecting the devices whose interface config changed in a commit.
+
+    on_change is called with the device names once the commit is acknowledged, so it
+    is free to start its own transactions.
+    """
+
+    def __init__(self, app: ncs.application.Application, log: ncs.log.Log, on_change: Callable[[Set[str]], None]):
+        self.on_change = on_change
+        super().__init__(app=app, log=log)
+
+    def init(self):
+        """Register the interface paths of the NEDs loaded in this NSO."""
+        for path in INTERFACE_PATHS:
+            try:
+                self.register(path, priority=100)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.log.info("Subscriber ##" + INDENTATION + path + " is not registered: " + str(exc))
+
+    def pre_iterate(self):
+        """Start with no changed device."""
+        return set()
+
+    def iterate(self, kp, op, oldv, newv, state):  # pylint: disable=unused-argument
+        """Record the device of a changed interface."""
+        state.add(str(kp[-3][0]))
+        return ncs.ITER_CONTINUE
+
+    def should_post_iterate(self, state):
+        """Run post_iterate only if a device changed."""
+        return bool(state)
+
+    def post_iterate(self, state):
+        """Hand the changed devices over."""
+        self.log.info("Subscriber ##" + INDENTATION + "interfaces changed on " + ", ".join(sorted(state)))
+        try:
+            self.on_change(state)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.log.error("Subscriber ##" + INDENTATION + "interface sync failed: " + str(exc))
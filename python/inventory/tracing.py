@@ -0,0 +1,138 @@
+"""Inventory Tracing Module."""
+import contextvars
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+import ncs
+from inventory.constants import INDENTATION, USER
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class SpanStats(NamedTuple):
+    """Aggregated timings, in seconds, of the spans of a phase and platform."""
+
+    spans: int
+    total: float
+    max: float
+
+
+class SpanRecorder:
+    """Thread-safe aggregate of span timings keyed by (phase, platform)."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[str, str], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, platform: str, elapsed: float) -> None:
+        """Add a finished span."""
+        with self._lock:
+            stats = self._stats.setdefault((phase, platform), [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+    def snapshot(self) -> Dict[Tuple[str, str], SpanStats]:
+        """Get a copy of the aggregated timings."""
+        with self._lock:
+            return {key: SpanStats(int(stats[0]), stats[1], stats[2]) for key, stats in self._stats.items()}
+
+
+class Tracer:
+    """Per phase and platform span timings with level-gated log messages.
+
+    Timings are kept since the VM start and, inside run(), for the current update run too.
+    Worker threads take part in the run when started with contextvars.copy_context().run.
+    Messages are only formatted in verbose mode or with debug logging enabled.
+    """
+
+    def __init__(self) -> None:
+        self.log: Optional[ncs.log.Log] = None
+        self.verbose = False
+        self.totals = SpanRecorder()
+        self._published: Optional[float] = None
+        self.platform: contextvars.ContextVar[str] = contextvars.ContextVar("inventory_platform", default="-")
+        self._run: contextvars.ContextVar[Optional[SpanRecorder]] = contextvars.ContextVar(
+            "inventory_run", default=None
+        )
+
+    def enabled(self) -> bool:
+        """Check if debug messages are logged."""
+        return self.log is not None and (self.verbose or self.log.log.isEnabledFor(logging.DEBUG))
+
+    def debug(self, message: str, *args: Any) -> None:
+        """Log a %-style message in verbose mode, at debug level otherwise."""
+        log = self.log
+        if log is None or not self.enabled():
+            return
+        if self.verbose:
+            log.info(message % args)
+        else:
+            log.debug(message % args)
+
+    @contextmanager
+    def span(self, phase: str, platform: Optional[str] = None) -> Iterator[None]:
+        """Time the block as a span of phase, by default for the platform of the current device."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            platform = platform or self.platform.get()
+            self.totals.add(phase, platform, elapsed)
+            run = self._run.get()
+            if run is not None:
+                run.add(phase, platform, elapsed)
+            self.debug("Span ##" + INDENTATION * 2 + "%s %s %.3fs", phase, platform, elapsed)
+
+    def traced(self, func: F) -> F:
+        """Decorate a function to log its calls as debug messages."""
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            self.debug("Function ##" + INDENTATION * 2 + "%s", name)
+            return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    @contextmanager
+    def run(self) -> Iterator[SpanRecorder]:
+        """Collect the spans of an update run, worker threads included."""
+        recorder = SpanRecorder()
+        token = self._run.set(recorder)
+        try:
+            yield recorder
+        finally:
+            self._run.reset(token)
+
+    def publish(self, min_interval: float = 0.0) -> None:
+        """Write the span timings since VM start as oper data, unless written within min_interval seconds."""
+        now = time.monotonic()
+        if self._published is not None and now - self._published < min_interval:
+            return
+        self._published = now
+        try:
+            with ncs.maapi.single_write_trans(USER, "system") as trans:
+                statistics = ncs.maagic.get_root(trans).inv__inventory_operations.statistics
+                set_span_stats(statistics.span, self.totals.snapshot())
+                trans.apply()
+        except Exception as exc:  # pylint: disable=broad-except
+            if self.log is not None:
+                self.log.error("Statistics ##" + INDENTATION + "write failed: " + str(exc))
+
+
+def set_span_stats(span_list: Any, stats: Dict[Tuple[str, str], SpanStats]) -> None:
+    """Fill a span list of an action output or the oper statistics."""
+    for (phase, platform), span_stats in sorted(stats.items()):
+        span = span_list.create(phase, platform)
+        span.count = span_stats.spans
+        span.total = f"{span_stats.total:.3f}"
+        span.max = f"{span_stats.max:.3f}"
+
+
+TRACER = Tracer()
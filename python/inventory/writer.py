@@ -0,0 +1,128 @@
+"""Inventory Write Module."""
+from contextlib import ExitStack
+from typing import Any, Iterable, List, NamedTuple, Tuple
+
+import _ncs
+import ncs
+from inventory.constants import USER
+from inventory.tracing import TRACER
+
+# List entries written per transaction by default, see inventory-settings/write/chunk-size
+DEFAULT_CHUNK_SIZE = 500
+
+
+class ListDiff(NamedTuple):
+    """Keys of the list entries created, updated and deleted by a reconciliation."""
+
+    created: List[Tuple[str, ...]]
+    updated: List[Tuple[str, ...]]
+    deleted: List[Tuple[str, ...]]
+
+    def __str__(self) -> str:
+        return f"created: {len(self.created)}, updated: {len(self.updated)}, deleted: {len(self.deleted)}"
+
+
+def keypath_key(*keys: str) -> str:
+    """Format list keys for a keypath, quoting them so spaces and braces are kept."""
+    quoted = ('"' + key.replace("\\", "\\\\").replace('"', '\\"') + '"' for key in keys)
+    return "{" + " ".join(quoted) + "}"
+
+
+def normalize_record(record: Any, key_size: int) -> Any:
+    """Set empty string non-key fields to None, the value an empty or missing leaf is read back as."""
+    if "" not in record[key_size:]:
+        return record
+    return type(record)(*record[:key_size], *(None if value == "" else value for value in record[key_size:]))
+
+
+def set_object(trans: ncs.maapi.Transaction, record: Any, keypath: str) -> None:
+    """Set all leaves of a list entry or container from a record in one MAAPI call.
+
+    The record fields must follow the leaf order of the YANG node, keys included;
+    fields set to None are left non-existing.
+    """
+    values = [_ncs.Value(0, _ncs.C_NOEXISTS) if value is None else _ncs.Value(value) for value in record]
+    _ncs.maapi.set_object(trans.maapi.msock, trans.th, values, keypath)
+
+
+class ChunkedWriter:
+    """Write transaction committed after every chunk_size list entry writes.
+
+    A large device is written in several short transactions instead of one long one,
+    so the transaction hold time and its pending changes do not grow with the chassis.
+    commits counts the applied transactions, data written before the last commit is kept
+    when a later one fails.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.chunk_size = max(1, chunk_size)
+        self.commits = 0
+        self.pending = 0
+        self.trans: Any = None
+        self._stack = ExitStack()
+
+    def __enter__(self) -> "ChunkedWriter":
+        self._open()
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        try:
+            if exc_type is None and self.pending:
+                self._apply()
+        finally:
+            self._stack.close()
+
+    def _open(self) -> None:
+        self.trans = self._stack.enter_context(ncs.maapi.single_write_trans(USER, "system"))
+        self.pending = 0
+
+    def _apply(self) -> None:
+        with TRACER.span("commit", "-"):
+            self.trans.apply()
+        self.commits += 1
+        self.pending = 0
+
+    def written(self, count: int = 1) -> None:
+        """Count list entry writes, committing and starting a new transaction once a chunk is full."""
+        self.pending += count
+        if self.pending >= self.chunk_size:
+            self._apply()
+            self._stack.close()
+            self._open()
+
+
+def reconcile_list(
+    writer: ChunkedWriter, list_keypath: str, stored: Iterable[Any], records: Iterable[Any], key_size: int
+) -> ListDiff:
+    """Create, update or delete list entries so that the list matches the collected records.
+
+    Stored entries are streamed and compared with the records, whose fields follow the
+    list leaves and whose first key_size fields are the list keys; the stored list is
+    never held in memory. Empty string fields are compared and written as non-existing
+    leaves, so an entry with empty values is not rewritten by every reconciliation. Every
+    created or changed entry is written with a single set_object call, in chunks of the writer.
+    """
+    remaining = {record[:key_size]: normalize_record(record, key_size) for record in records}
+    diff = ListDiff([], [], [])
+    changed = []
+    for current in stored:
+        key = current[:key_size]
+        record = remaining.pop(key, None)
+        if record is None:
+            diff.deleted.append(key)
+        elif record != current:
+            diff.updated.append(key)
+            changed.append(record)
+    diff.created.extend(remaining)
+
+    for key in diff.deleted:
+        writer.trans.delete(list_keypath + keypath_key(*key))
+        writer.written()
+    for record in changed + list(remaining.values()):
+        entry_keypath = list_keypath + keypath_key(*record[:key_size])
+        if record[:key_size] in remaining:
+            writer.trans.create(entry_keypath)
+        if len(record) > key_size:
+            set_object(writer.trans, record, entry_keypath)
+        writer.written()
+    return diff
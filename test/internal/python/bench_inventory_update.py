@@ -0,0 +1,108 @@
+"""Inventory Update Benchmark.
+
+Runs InventoryUpdate.cb_action against a synthetic fleet in a fake NSO and reports
+devices per second, MAAPI round trips per device and peak Python memory.
+
+Usage: python test/internal/python/bench_inventory_update.py [devices per platform] [device ms] [maapi ms]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "python"))
+
+# pylint: disable=wrong-import-position
+import fake_nso  # noqa: E402
+
+fake_nso.install()
+
+from inventory.cache import LIVE_STATUS_CACHE  # noqa: E402
+from inventory.main import InventoryUpdate  # noqa: E402
+from nso_fleet import INVENTORY_NAME, FleetSpec, build_fleet  # noqa: E402
+
+
+class BenchResult(NamedTuple):
+    """Outcome of one inventory update run."""
+
+    devices: int
+    seconds: float
+    maapi_calls: int
+    peak_memory: int
+    statuses: Dict[str, int]
+
+    @property
+    def devices_per_second(self) -> float:
+        """Update throughput."""
+        return self.devices / self.seconds if self.seconds else 0.0
+
+    @property
+    def maapi_calls_per_device(self) -> float:
+        """MAAPI round trips per device."""
+        return self.maapi_calls / self.devices if self.devices else 0.0
+
+
+def run_update(
+    store: fake_nso.Datastore,
+    max_parallel: int = 8,
+    batch_size: int = 10,
+    force_refresh: bool = False,
+    trace_memory: bool = False,
+) -> BenchResult:
+    """Run update-inventory-manager for all devices of the bench inventory-manager.
+
+    Peak memory is only measured with trace_memory, tracemalloc slows the run down.
+    """
+    fake_nso.use(store)
+    LIVE_STATUS_CACHE.invalidate()
+    action_input = fake_nso.new_action_params(
+        target_devices="all",
+        max_parallel=max_parallel,
+        batch_size=batch_size,
+        remove_stale_pools=False,
+        force_refresh=force_refresh,
+        background=False,
+    )
+    output = fake_nso.new_action_params()
+    calls_before = sum(store.calls.values())
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        InventoryUpdate(fake_nso.Log()).cb_action(
+            None, "update-inventory-manager", f"/inv:inventory-manager{{{INVENTORY_NAME}}}", action_input, output, None
+        )
+        seconds = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        tracemalloc.stop()
+    maapi_calls = sum(store.calls.values()) - calls_before
+    statuses: Dict[str, int] = {}
+    for device in output.device:
+        statuses[device.status] = statuses.get(device.status, 0) + 1
+    return BenchResult(sum(statuses.values()), seconds, maapi_calls, peak_memory, statuses)
+
+
+def main(devices_per_platform: int, device_latency: float, maapi_latency: float) -> None:
+    """Print a first run and an unchanged re-run of the same fleet, then their peak memory without latency."""
+    spec = FleetSpec(devices_per_platform, maapi_latency=maapi_latency, device_latency=device_latency)
+    store, _ = build_fleet(spec)
+    for run in ("first", "unchanged"):
+        result = run_update(store)
+        print(
+            f"{run:<10} {result.devices:>6} devices {result.devices_per_second:>8.1f} devices/s "
+            f"{result.maapi_calls_per_device:>7.1f} maapi calls/device {result.statuses}"
+        )
+    store, _ = build_fleet(spec._replace(maapi_latency=0.0, device_latency=0.0))
+    for run in ("first", "unchanged"):
+        result = run_update(store, trace_memory=True)
+        print(f"{run:<10} {result.devices:>6} devices {result.peak_memory / 2**20:>8.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.05,
+        float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.0002,
+    )
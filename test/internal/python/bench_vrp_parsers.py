@@ -0,0 +1,29 @@
+"""Huawei VRP CLI Output Parser Benchmark.
+
+Usage: python test/internal/python/bench_vrp_parsers.py [rounds]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "python"))
+
+# pylint: disable=wrong-import-position
+from inventory.parsers import huawei_vrp_parse_inventory_data, huawei_vrp_parse_transceiver_data  # noqa: E402
+from vrp_corpus import build_corpus  # noqa: E402
+
+
+def main(rounds: int) -> None:
+    """Print the mean parse time per corpus entry."""
+    for corpus in build_corpus():
+        for command, parser, data in (
+            ("elabel brief", huawei_vrp_parse_inventory_data, corpus.elabel),
+            ("optical-module brief", huawei_vrp_parse_transceiver_data, corpus.optical_module),
+        ):
+            seconds = timeit.timeit(lambda parser=parser, data=data: list(parser(data)), number=rounds) / rounds
+            lines = data.count("\n") + 1
+            print(f"{corpus.name:<12} {command:<22} {lines:>6} lines {seconds * 1000:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,849 @@
+"""Fake NSO Stand-in Module.
+
+In-process stand-ins for the ncs and _ncs modules, backed by an in-memory datastore, so
+the inventory update path runs without NSO. Only the API the package calls is provided:
+chunked queries, keypath writes, set_object, maagic containers, lists, leaves and
+live-status actions. Every MAAPI round trip is counted and delayed by maapi_latency,
+every live-status query or action additionally by device_latency.
+
+The writes of a transaction are kept until apply() and dropped if it ends without one.
+Leaves and entries it wrote are read back by its maagic, get_elem and exists calls;
+queries only see applied data.
+"""
+import logging
+import re
+import sys
+import threading
+import time
+import types
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# List keys by "parent/list" or list name, for the lists the package creates or reads through maagic
+LIST_KEYS: Dict[str, Tuple[str, ...]] = {
+    "job/device": ("inventory-manager", "name"),
+    "inventory-manager": ("name",),
+    "device": ("name",),
+    "inventory": ("name",),
+    "controller": ("id",),
+    "interface": ("if-size", "if-number"),
+    "id-pool": ("name",),
+    "template": ("name",),
+    "device-failure": ("name",),
+    "job": ("id",),
+    "span": ("phase", "platform"),
+    "match": ("inventory-manager", "device", "kind", "name", "field"),
+}
+# Containers reached through maagic before they exist
+CONTAINERS = {
+    "inventory-settings",
+    "logging",
+    "collection",
+    "circuit-breaker",
+    "interface-subscriber",
+    "scheduler",
+    "live-status-cache",
+    "write",
+    "pools",
+    "inventory-operations",
+    "statistics",
+    "export",
+    "resource-pools",
+    "range",
+    "devices",
+    "live-status",
+    "exec",
+    "platform",
+}
+# Leaf order of the nodes written with set_object, as in the YANG groupings
+OBJECT_LEAVES: Dict[str, Tuple[str, ...]] = {
+    "platform": ("name", "version", "model", "serial-number"),
+    "inventory": ("name", "description", "pid", "serial-number"),
+    "controller": ("id", "controller-state", "optics-type", "name", "part-number", "serial-number", "pid"),
+    "interface": ("if-size", "if-number"),
+}
+KEYPATH_SEGMENT = re.compile(r'/(?:[\w.-]+:)?([\w.-]+)(\{(?:[^}"]|"(?:[^"\\]|\\.)*")*\})?')
+KEYPATH_KEY = re.compile(r'"((?:[^"\\]|\\.)*)"|([^\s"]+)')
+PREDICATE = re.compile(r"""(starts-with\(\s*)?([\w:./-]+)\s*(?:=|,)\s*('[^']*'|"[^"]*")""")
+
+C_NOEXISTS = object()
+QUERY_STRING = 1
+ITER_STOP, ITER_RECURSE, ITER_CONTINUE = 1, 2, 3
+
+# Node path from the root as (name, keys) steps, the empty key for a container or leaf
+Path = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+class Node:
+    """Container, list entry or the root of the datastore."""
+
+    __slots__ = ("name", "parent", "leaves", "children")
+
+    def __init__(self, name: str, parent: Optional["Node"] = None) -> None:
+        self.name = name
+        self.parent = parent
+        self.leaves: Dict[str, Any] = {}
+        # child name to entries by key tuple, a container is the entry of the empty key
+        self.children: Dict[str, Dict[Tuple[str, ...], "Node"]] = {}
+
+    def child(self, name: str, keys: Tuple[str, ...] = (), create: bool = False) -> Optional["Node"]:
+        """Get a child container or list entry."""
+        entries = self.children.get(name)
+        node = entries.get(keys) if entries is not None else None
+        if node is None and create:
+            node = Node(name, self)
+            self.children.setdefault(name, {})[keys] = node
+        return node
+
+    def entries(self, name: str) -> List["Node"]:
+        """Get the entries of a child list, or the child container as a single entry."""
+        return list(self.children.get(name, {}).values())
+
+
+def local_name(name: str) -> str:
+    """Strip the prefix of a yang or maagic node name."""
+    name = name.split(":")[-1]
+    if "__" in name:
+        name = name.split("__", 1)[1]
+    return name.replace("_", "-")
+
+
+def format_value(value: Any) -> str:
+    """Format a leaf value as a query string."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def split_outside(text: str, separator: str) -> List[str]:
+    """Split on a separator outside of quotes, brackets and parentheses."""
+    parts, depth, quote, start = [], 0, "", 0
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if quote:
+            quote = "" if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif depth == 0 and text.startswith(separator, index):
+            parts.append(text[start:index])
+            index += len(separator)
+            start = index
+            continue
+        index += 1
+    parts.append(text[start:])
+    return parts
+
+
+@lru_cache(maxsize=None)
+def parse_path(xpath: str) -> Tuple[Tuple[Tuple[str, Tuple[Tuple[bool, Tuple[str, ...], str], ...]], ...], ...]:
+    """Parse a union of absolute paths into steps of (name, ((prefix match, predicate path, literal), ...)).
+
+    A predicate matches if any of its comparisons, an equality or a starts-with(), matches.
+    """
+    paths = []
+    for path in split_outside(xpath.strip(), "|"):
+        steps = []
+        for step in split_outside(path.strip(), "/")[1:]:
+            name, _, predicates = step.partition("[")
+            comparisons = tuple(
+                (bool(starts_with), tuple(local_name(part) for part in left.split("/")), literal[1:-1])
+                for starts_with, left, literal in PREDICATE.findall(predicates)
+            )
+            steps.append((local_name(name.strip()), comparisons))
+        paths.append(tuple(steps))
+    return tuple(paths)
+
+
+def keypath_steps(keypath: str) -> Path:
+    """Parse a keypath into a path, a trailing leaf included as a step."""
+    return tuple((name, keys or ()) for name, keys in parse_keypath(keypath))
+
+
+def parse_keypath(keypath: str) -> List[Tuple[str, Optional[Tuple[str, ...]]]]:
+    """Parse a keypath into (name, keys) segments, keys None for a container or leaf."""
+    segments = []
+    for name, keys in KEYPATH_SEGMENT.findall(keypath):
+        if keys:
+            values = tuple(
+                quoted.replace('\\"', '"').replace("\\\\", "\\") if quoted else bare
+                for quoted, bare in KEYPATH_KEY.findall(keys[1:-1])
+            )
+            segments.append((name, values))
+        else:
+            segments.append((name, None))
+    return segments
+
+
+class Datastore:
+    """In-memory datastore with MAAPI round trip counters."""
+
+    def __init__(self, maapi_latency: float = 0.0, device_latency: float = 0.0) -> None:
+        self.root = Node("")
+        self.lock = threading.RLock()
+        self.calls: Counter = Counter()
+        # most keypath and set_object writes committed by a single apply
+        self.max_commit_writes = 0
+        # rows matched by all queries
+        self.query_rows = 0
+        self.maapi_latency = maapi_latency
+        self.device_latency = device_latency
+        # "container/action" to handler(container node, args) returning the action result
+        self.actions: Dict[str, Callable[[Node, Any], str]] = {}
+
+    def call(self, operation: str, live_status: bool = False) -> None:
+        """Count a MAAPI round trip and wait for its latency."""
+        with self.lock:
+            self.calls[operation] += 1
+        delay = self.maapi_latency + (self.device_latency if live_status else 0.0)
+        if delay:
+            time.sleep(delay)
+
+    def list_keys(self, node: Node, name: str) -> Optional[Tuple[str, ...]]:
+        """Get the key leaves of a list, None if name is not a known list."""
+        return LIST_KEYS.get(f"{node.name}/{name}", LIST_KEYS.get(name))
+
+    def entry(self, parent: Node, node_name: str, keys: Tuple[str, ...] = (), /, **leaves: Any) -> Node:
+        """Get or create a container or list entry and set its leaves, key leaves included."""
+        with self.lock:
+            node = parent.child(node_name, keys, create=True)
+            assert node is not None
+            node.leaves.update((leaf.replace("_", "-"), value) for leaf, value in leaves.items())
+            return node
+
+    def merge(self, parent: Node, data: Dict[str, Any]) -> None:
+        """Merge nested dicts into containers, other values into leaves."""
+        for name, value in data.items():
+            if isinstance(value, dict):
+                self.merge(self.entry(parent, name), value)
+            else:
+                parent.leaves[name] = value
+
+    def walk(self, root: Node, path: Path, create: bool = False) -> Optional[Node]:
+        """Get the node of a path, creating missing containers and list entries, key leaves included, if asked."""
+        node = root
+        for name, keys in path:
+            child = node.child(name, keys)
+            if child is None:
+                if not create:
+                    return None
+                child = node.child(name, keys, create=True)
+                assert child is not None
+                child.leaves.update(zip(self.list_keys(node, name) or (), keys))
+            node = child
+        return node
+
+    def select(self, xpath: str) -> List[Node]:
+        """Get the nodes matching a union of absolute paths, in document order per path."""
+        matches: List[Node] = []
+        for steps in parse_path(xpath):
+            nodes = [self.root]
+            for name, comparisons in steps:
+                nodes = [
+                    child
+                    for node in nodes
+                    for child in node.entries(name)
+                    if not comparisons or any(self.compare(child, *comparison) for comparison in comparisons)
+                ]
+            matches.extend(nodes)
+        return matches
+
+    def compare(self, node: Node, starts_with: bool, path: Tuple[str, ...], literal: str) -> bool:
+        """Check a predicate comparison on a node."""
+        values = self.values(node, path)
+        return any(value.startswith(literal) for value in values) if starts_with else literal in values
+
+    def values(self, node: Node, path: Tuple[str, ...]) -> List[str]:
+        """Get the values of a relative path to a leaf."""
+        nodes = [node]
+        for name in path[:-1]:
+            if name == "..":
+                nodes = [current.parent for current in nodes if current.parent is not None]
+            elif name != ".":
+                nodes = [child for current in nodes for child in current.entries(name)]
+        return [format_value(current.leaves[path[-1]]) for current in nodes if path[-1] in current.leaves]
+
+    def evaluate(self, node: Node, expression: str) -> str:
+        """Evaluate a query select expression on a node."""
+        expression = expression.strip()
+        if expression[:1] in "'\"":
+            return expression[1:-1]
+        if expression == "local-name()":
+            return node.name
+        if expression.startswith("concat(") and expression.endswith(")"):
+            return "".join(self.evaluate(node, argument) for argument in split_outside(expression[7:-1], ","))
+        values = self.values(node, tuple(local_name(part) for part in expression.split("/")))
+        return values[0] if values else ""
+
+
+STORE = Datastore()
+
+
+def use(store: Datastore) -> Datastore:
+    """Make a datastore the one the stand-in modules read and write."""
+    global STORE  # pylint: disable=global-statement
+    STORE = store
+    return store
+
+
+# ------------------------
+# _ncs stand-in
+# ------------------------
+class Value:
+    """_ncs.Value stand-in."""
+
+    def __init__(self, value: Any, value_type: Any = None) -> None:
+        self.value = C_NOEXISTS if value_type is C_NOEXISTS else value
+
+
+class NcsError(Exception):
+    """_ncs.error.Error stand-in."""
+
+
+class QueryResult(list):
+    """Chunk of query rows."""
+
+    @property
+    def nresults(self) -> int:
+        """Number of rows in the chunk."""
+        return len(self)
+
+
+class Query:
+    """Open query with its remaining rows."""
+
+    def __init__(self, rows: List[List[str]], chunk_size: int) -> None:
+        self.rows = rows
+        self.chunk_size = chunk_size
+
+
+QUERIES: Dict[int, Query] = {}
+QUERY_IDS = iter(range(1, sys.maxsize))
+TRANSACTIONS: Dict[int, "Transaction"] = {}
+TRANSACTION_IDS = iter(range(1, sys.maxsize))
+
+
+def query_start(  # pylint: disable=unused-argument
+    msock: Any, th: int, xpath: str, context: str, chunk_size: int, initial: int, result_as: int, select: Any, sort: Any
+) -> int:
+    """Evaluate a query and keep its rows for query_result."""
+    STORE.call("query_start", ":live-status/" in xpath)
+    with STORE.lock:
+        rows = [[STORE.evaluate(node, expression) for expression in select] for node in STORE.select(xpath)]
+        STORE.query_rows += len(rows)
+        query_id = next(QUERY_IDS)
+        QUERIES[query_id] = Query(rows, chunk_size)
+    return query_id
+
+
+def query_result(msock: Any, query_id: int) -> QueryResult:  # pylint: disable=unused-argument
+    """Get the next chunk of query rows."""
+    STORE.call("query_result")
+    with STORE.lock:
+        query = QUERIES[query_id]
+        chunk, query.rows = query.rows[: query.chunk_size], query.rows[query.chunk_size :]
+    return QueryResult(chunk)
+
+
+def query_stop(msock: Any, query_id: int) -> None:  # pylint: disable=unused-argument
+    """Drop a query."""
+    STORE.call("query_stop")
+    with STORE.lock:
+        QUERIES.pop(query_id, None)
+
+
+def set_object(msock: Any, th: int, values: List[Value], keypath: str) -> None:  # pylint: disable=unused-argument
+    """Set all leaves of a container or list entry."""
+    trans = TRANSACTIONS[th]
+    trans.writes += 1
+    trans.set_object(keypath_steps(keypath), [value.value for value in values])
+
+
+def action_set_timeout(uinfo: Any, seconds: int) -> None:  # pylint: disable=unused-argument
+    """Action timeouts do not apply in process."""
+
+
+# ------------------------
+# ncs.maapi stand-in
+# ------------------------
+class Maapi:
+    """Maapi socket holder."""
+
+    msock = None
+
+
+class Transaction:
+    """ncs.maapi.Transaction stand-in keeping its writes until apply."""
+
+    def __init__(self) -> None:
+        self.maapi = Maapi()
+        self.th = next(TRANSACTION_IDS)
+        # keypath and set_object writes since the last apply
+        self.writes = 0
+        # changes to replay on apply, and the leaves, created and deleted nodes they leave behind
+        self._changes: List[Callable[[], None]] = []
+        self._leaves: Dict[Path, Any] = {}
+        self._created: Set[Path] = set()
+        self._deleted: Set[Path] = set()
+        TRANSACTIONS[self.th] = self
+
+    def _write(self, operation: str, change: Callable[[], None]) -> None:
+        """Count a write round trip and keep the change for apply."""
+        STORE.call(operation)
+        with STORE.lock:
+            self._changes.append(change)
+
+    def _forget(self, path: Path) -> None:
+        """Drop the leaves and nodes written below a deleted path."""
+        for key in [key for key in self._leaves if key[: len(path)] == path]:
+            del self._leaves[key]
+        self._created = {key for key in self._created if key[: len(path)] != path}
+
+    def written(self, path: Path) -> Tuple[bool, Any]:
+        """Get whether this transaction wrote a leaf or node, and the leaf value, True for a node, None if deleted."""
+        with STORE.lock:
+            if path in self._leaves:
+                return True, self._leaves[path]
+            if path in self._created:
+                return True, True
+            if any(path[:length] in self._deleted for length in range(1, len(path) + 1)):
+                return True, None
+            return False, None
+
+    def set_leaf(self, path: Path, value: Any) -> None:
+        """Set a leaf, the last step of path."""
+        self._write("set_elem", lambda: store_leaf(path, value))
+        with STORE.lock:
+            self._leaves[path] = value
+
+    def set_object(self, path: Path, values: List[Any]) -> None:
+        """Set all leaves of a container or list entry, C_NOEXISTS values delete theirs."""
+        leaves = dict(zip(OBJECT_LEAVES[path[-1][0]], values))
+
+        def change() -> None:
+            node = STORE.walk(STORE.root, path, create=True)
+            assert node is not None
+            for leaf, value in leaves.items():
+                if value is C_NOEXISTS:
+                    node.leaves.pop(leaf, None)
+                else:
+                    node.leaves[leaf] = value
+
+        self._write("set_object", change)
+        with STORE.lock:
+            self._created.add(path)
+            self._leaves.update(
+                (path + ((leaf, ()),), None if value is C_NOEXISTS else value) for leaf, value in leaves.items()
+            )
+
+    def create_node(self, path: Path) -> None:
+        """Create a list entry, or keep the existing one."""
+        self._write("create", lambda: STORE.walk(STORE.root, path, create=True))
+        with STORE.lock:
+            self._deleted.discard(path)
+            self._created.add(path)
+
+    def delete_node(self, path: Path) -> None:
+        """Delete a list entry, container or leaf."""
+
+        def change() -> None:
+            parent = STORE.walk(STORE.root, path[:-1])
+            if parent is None:
+                return
+            name, keys = path[-1]
+            parent.leaves.pop(name, None)
+            parent.children.get(name, {}).pop(keys, None)
+
+        self._write("delete", change)
+        with STORE.lock:
+            self._forget(path)
+            self._deleted.add(path)
+
+    def create(self, keypath: str) -> None:
+        """Create a list entry."""
+        self.writes += 1
+        self.create_node(keypath_steps(keypath))
+
+    def delete(self, keypath: str) -> None:
+        """Delete a list entry, container or leaf."""
+        self.writes += 1
+        self.delete_node(keypath_steps(keypath))
+
+    def set_elem(self, value: Any, keypath: str) -> None:
+        """Set a leaf."""
+        self.writes += 1
+        self.set_leaf(keypath_steps(keypath), value)
+
+    def get_elem(self, keypath: str) -> Any:
+        """Get a leaf."""
+        STORE.call("get_elem")
+        path = keypath_steps(keypath)
+        found, value = self.written(path)
+        if not found:
+            value = read_leaf(STORE.root, path)
+        if value is None:
+            raise KeyError(keypath)
+        return value
+
+    def exists(self, keypath: str) -> bool:
+        """Check if a node exists."""
+        STORE.call("exists")
+        path = keypath_steps(keypath)
+        found, value = self.written(path)
+        if found:
+            return value is not None
+        with STORE.lock:
+            return STORE.walk(STORE.root, path) is not None or read_leaf(STORE.root, path) is not None
+
+    def apply(self) -> None:
+        """Commit the changes made since the last apply."""
+        STORE.call("apply")
+        with STORE.lock:
+            for change in self._changes:
+                change()
+            STORE.max_commit_writes = max(STORE.max_commit_writes, self.writes)
+            self.discard()
+
+    def discard(self) -> None:
+        """Drop the changes made since the last apply."""
+        with STORE.lock:
+            self.writes = 0
+            self._changes.clear()
+            self._leaves.clear()
+            self._created.clear()
+            self._deleted.clear()
+
+
+def read_leaf(root: Node, path: Path) -> Any:
+    """Get the applied value of a leaf, None if it does not exist."""
+    with STORE.lock:
+        node = STORE.walk(root, path[:-1])
+        return None if node is None else node.leaves.get(path[-1][0])
+
+
+def store_leaf(path: Path, value: Any, root: Optional[Node] = None) -> None:
+    """Set a leaf, creating the nodes above it, of the datastore unless another root is given."""
+    node = STORE.walk(STORE.root if root is None else root, path[:-1], create=True)
+    assert node is not None
+    node.leaves[path[-1][0]] = value
+
+
+@contextmanager
+def single_trans(user: str, context: str) -> Iterator[Transaction]:  # pylint: disable=unused-argument
+    """Start a session and a transaction."""
+    STORE.call("start_trans")
+    with STORE.lock:
+        trans = Transaction()
+    try:
+        yield trans
+    finally:
+        STORE.call("finish_trans")
+        with STORE.lock:
+            trans.discard()
+            TRANSACTIONS.pop(trans.th, None)
+
+
+# ------------------------
+# ncs.maagic stand-in
+# ------------------------
+class LeafList(list):
+    """Leaf-list value."""
+
+    def as_list(self) -> List[Any]:
+        """Get the values as a plain list."""
+        return list(self)
+
+
+class MaagicAction:
+    """Live-status action."""
+
+    def __init__(self, node: "MaagicNode", handler: Callable[[Node, Any], str]) -> None:
+        self._node = node
+        self._handler = handler
+
+    def get_input(self) -> types.SimpleNamespace:
+        """Get an empty action input."""
+        return types.SimpleNamespace(args=None)
+
+    def __call__(self, action_input: types.SimpleNamespace) -> types.SimpleNamespace:
+        STORE.call("request_action", live_status=True)
+        # the container of an action exists as soon as its device does
+        node = self._node.resolve(create=True)
+        assert node is not None
+        return types.SimpleNamespace(result=self._handler(node, action_input.args))
+
+
+class MaagicList:
+    """Maagic list, entries are read with one round trip each like a cursor."""
+
+    def __init__(self, parent: "MaagicNode", name: str) -> None:
+        self._parent = parent
+        self._name = name
+
+    @staticmethod
+    def _keys(keys: Any) -> Tuple[str, ...]:
+        return tuple(str(key) for key in keys) if isinstance(keys, tuple) else (str(keys),)
+
+    def _entry(self, keys: Tuple[str, ...]) -> "MaagicNode":
+        return self._parent.child(self._name, tuple(keys))
+
+    def __iter__(self) -> Iterator["MaagicNode"]:
+        with STORE.lock:
+            node = self._parent.resolve()
+            keys_list = list(node.children.get(self._name, {})) if node is not None else []
+        for keys in keys_list:
+            STORE.call("get_next")
+            yield self._entry(keys)
+
+    def __len__(self) -> int:
+        STORE.call("num_instances")
+        node = self._parent.resolve()
+        return len(node.entries(self._name)) if node is not None else 0
+
+    def __contains__(self, keys: Any) -> bool:
+        STORE.call("exists")
+        return self._entry(self._keys(keys)).exists()
+
+    def __getitem__(self, keys: Any) -> "MaagicNode":
+        STORE.call("exists")
+        entry = self._entry(self._keys(keys))
+        if not entry.exists():
+            raise KeyError(keys)
+        return entry
+
+    def __delitem__(self, keys: Any) -> None:
+        self._entry(self._keys(keys)).delete()
+
+    def create(self, *keys: Any) -> "MaagicNode":
+        """Create an entry, or get the existing one."""
+        entry = self._entry(tuple(str(key) for key in keys))
+        entry.create()
+        return entry
+
+
+class MaagicNode:
+    """Maagic container or list entry, every leaf access is a round trip.
+
+    Nodes of a transaction write through it; nodes without one, action parameters,
+    write straight to their detached root.
+    """
+
+    def __init__(self, trans: Optional[Transaction], path: Path = (), root: Optional[Node] = None) -> None:
+        object.__setattr__(self, "_trans", trans)
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_root", root)
+
+    def _base(self) -> Node:
+        """Get the detached root, or the datastore root."""
+        root: Optional[Node] = object.__getattribute__(self, "_root")
+        return STORE.root if root is None else root
+
+    def resolve(self, create: bool = False) -> Optional[Node]:
+        """Get the applied node, None if it does not exist."""
+        with STORE.lock:
+            return STORE.walk(self._base(), object.__getattribute__(self, "_path"), create)
+
+    def child(self, name: str, keys: Tuple[str, ...] = ()) -> "MaagicNode":
+        """Get a child container, list entry or leaf of the same transaction."""
+        return MaagicNode(
+            object.__getattribute__(self, "_trans"),
+            object.__getattribute__(self, "_path") + ((name, keys),),
+            object.__getattribute__(self, "_root"),
+        )
+
+    def exists(self) -> bool:
+        """Check if the node exists in the transaction."""
+        trans: Optional[Transaction] = object.__getattribute__(self, "_trans")
+        if trans is not None:
+            found, value = trans.written(object.__getattribute__(self, "_path"))
+            if found:
+                return value is not None
+        return self.resolve() is not None
+
+    def create(self) -> None:
+        """Create the node."""
+        trans: Optional[Transaction] = object.__getattribute__(self, "_trans")
+        path: Path = object.__getattribute__(self, "_path")
+        if trans is not None:
+            trans.create_node(path)
+            return
+        STORE.call("create")
+        with STORE.lock:
+            STORE.walk(self._base(), path, create=True)
+
+    def delete(self) -> None:
+        """Delete the node."""
+        trans: Optional[Transaction] = object.__getattribute__(self, "_trans")
+        path: Path = object.__getattribute__(self, "_path")
+        if trans is not None:
+            trans.delete_node(path)
+            return
+        STORE.call("delete")
+        with STORE.lock:
+            parent = STORE.walk(self._base(), path[:-1])
+            if parent is not None:
+                parent.children.get(path[-1][0], {}).pop(path[-1][1], None)
+
+    def __getattr__(self, attribute: str) -> Any:
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        path: Path = object.__getattribute__(self, "_path")
+        node = self.resolve()
+        node_name = path[-1][0] if path else ("" if node is None else node.name)
+        name = local_name(attribute)
+        handler = STORE.actions.get(f"{node_name}/{name}")
+        if handler is not None:
+            return MaagicAction(self, handler)
+        if LIST_KEYS.get(f"{node_name}/{name}", LIST_KEYS.get(name)) is not None:
+            return MaagicList(self, name)
+        if name in CONTAINERS or (node is not None and name in node.children):
+            return self.child(name)
+        STORE.call("get_elem")
+        trans: Optional[Transaction] = object.__getattribute__(self, "_trans")
+        found, value = trans.written(path + ((name, ()),)) if trans is not None else (False, None)
+        if not found:
+            value = None if node is None else node.leaves.get(name)
+        return LeafList(value) if isinstance(value, list) else value
+
+    def __setattr__(self, attribute: str, value: Any) -> None:
+        trans: Optional[Transaction] = object.__getattribute__(self, "_trans")
+        path = object.__getattribute__(self, "_path") + ((local_name(attribute), ()),)
+        if trans is not None:
+            trans.set_leaf(path, value)
+            return
+        STORE.call("set_elem")
+        with STORE.lock:
+            store_leaf(path, value, self._base())
+
+
+def get_root(trans: Any) -> MaagicNode:
+    """Get the maagic root of the datastore, writing through the transaction."""
+    return MaagicNode(trans if isinstance(trans, Transaction) else None)
+
+
+def new_action_params(**leaves: Any) -> MaagicNode:
+    """Build a detached maagic node for an action input or output."""
+    node = Node("params")
+    node.leaves.update((leaf.replace("_", "-"), value) for leaf, value in leaves.items())
+    return MaagicNode(None, (), node)
+
+
+# ------------------------
+# ncs.log, ncs.dp, ncs.application and ncs.cdb stand-ins
+# ------------------------
+class Log:
+    """ncs.log.Log stand-in."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+        self.log = logger or logging.getLogger("fake-nso")
+
+    def debug(self, *args: Any) -> None:
+        """Log at debug level."""
+        self.log.debug("".join(str(arg) for arg in args))
+
+    def info(self, *args: Any) -> None:
+        """Log at info level."""
+        self.log.info("".join(str(arg) for arg in args))
+
+    def warning(self, *args: Any) -> None:
+        """Log at warning level."""
+        self.log.warning("".join(str(arg) for arg in args))
+
+    def error(self, *args: Any) -> None:
+        """Log at error level."""
+        self.log.error("".join(str(arg) for arg in args))
+
+
+class Action:
+    """ncs.dp.Action stand-in, callbacks are called directly."""
+
+    def __init__(self, log: Optional[Log] = None) -> None:
+        self.log = log or Log()
+
+    @staticmethod
+    def action(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Callback decorator."""
+        return func
+
+
+class Service(Action):
+    """ncs.application.Service stand-in."""
+
+    @staticmethod
+    def create(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Callback decorator."""
+        return func
+
+
+class Application:
+    """ncs.application.Application stand-in."""
+
+    def __init__(self, log: Optional[Log] = None) -> None:
+        self.log = log or Log()
+
+    def register_service(self, *args: Any) -> None:
+        """Services are not registered in process."""
+
+    def register_action(self, *args: Any) -> None:
+        """Actions are not registered in process."""
+
+
+class Subscriber(threading.Thread):
+    """ncs.cdb.Subscriber stand-in, never started by the harness."""
+
+    def __init__(self, app: Any = None, log: Optional[Log] = None) -> None:  # pylint: disable=unused-argument
+        super().__init__(daemon=True)
+        self.log = log or Log()
+
+
+def module(name: str, **attributes: Any) -> types.ModuleType:
+    """Build a stand-in module."""
+    stand_in = types.ModuleType(name)
+    stand_in.__dict__.update(attributes)
+    return stand_in
+
+
+def install() -> None:
+    """Register the stand-ins as the ncs and _ncs modules."""
+    if getattr(sys.modules.get("ncs"), "FAKE", False):
+        return
+    maapi = module(
+        "_ncs.maapi", query_start=query_start, query_result=query_result, query_stop=query_stop, set_object=set_object
+    )
+    dp = module("_ncs.dp", action_set_timeout=action_set_timeout)
+    error = module("_ncs.error", Error=NcsError)
+    modules = {
+        "_ncs": module(
+            "_ncs", maapi=maapi, dp=dp, error=error, Value=Value, C_NOEXISTS=C_NOEXISTS, QUERY_STRING=QUERY_STRING
+        ),
+        "_ncs.maapi": maapi,
+        "_ncs.dp": dp,
+        "_ncs.error": error,
+        "ncs.maapi": module(
+            "ncs.maapi", Transaction=Transaction, single_read_trans=single_trans, single_write_trans=single_trans
+        ),
+        "ncs.maagic": module(
+            "ncs.maagic", get_root=get_root, Root=MaagicNode, Node=MaagicNode, keypath=module("keypath", _KeyPath=str)
+        ),
+        "ncs.log": module("ncs.log", Log=Log),
+        "ncs.dp": module("ncs.dp", Action=Action),
+        "ncs.application": module("ncs.application", Application=Application, Service=Service),
+        "ncs.cdb": module("ncs.cdb", Subscriber=Subscriber),
+    }
+    modules["ncs"] = module(
+        "ncs",
+        FAKE=True,
+        ITER_STOP=ITER_STOP,
+        ITER_RECURSE=ITER_RECURSE,
+        ITER_CONTINUE=ITER_CONTINUE,
+        **{name[4:]: stand_in for name, stand_in in modules.items() if name.startswith("ncs.")},
+    )
+    sys.modules.update(modules)
@@ -0,0 +1,224 @@
+"""Synthetic Device Fleet Module.
+
+Fills a fake NSO datastore with ios-xr, huawei-vrp and alu-sr devices sized by a
+FleetSpec, their NED live-status data and interface config, an inventory-manager
+holding all of them and inventory-settings at their YANG defaults.
+"""
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from fake_nso import Datastore, Node
+
+PLATFORMS = ("ios-xr", "huawei-vrp", "alu-sr")
+INVENTORY_NAME = "bench"
+
+# inventory-settings YANG defaults
+SETTINGS: Dict[str, Any] = {
+    "logging": {"verbose": False},
+    "collection": {
+        "timeout": 300,
+        "retries": 1,
+        "retry-backoff": 5,
+        "circuit-breaker": {"failure-threshold": 3, "cool-down": 60},
+    },
+    "interface-subscriber": {"enabled": True, "remove-stale-pools": False},
+    "scheduler": {"max-parallel": 4, "batch-size": 10, "jitter": 10},
+    "write": {"chunk-size": 500},
+    "export": {"directory": "inventory-export"},
+    "live-status-cache": {"ttl": 300, "max-entries": 1024},
+    "pools": {"provisioning": "pre-create"},
+}
+
+
+class FleetSpec(NamedTuple):
+    """Fleet size, per device record counts and simulated latencies in seconds."""
+
+    devices_per_platform: int = 10
+    modules: int = 20
+    optics: int = 48
+    interfaces: int = 48
+    platforms: Tuple[str, ...] = PLATFORMS
+    maapi_latency: float = 0.0
+    device_latency: float = 0.0
+
+    @property
+    def devices(self) -> int:
+        """Number of devices in the fleet."""
+        return self.devices_per_platform * len(self.platforms)
+
+
+def serial_number(device: int, number: int) -> str:
+    """Build a barcode-like serial number unique in the fleet."""
+    return f"SN{device:05d}{number:05d}"
+
+
+def port_name(number: int) -> str:
+    """Build a slot/port name spreading ports over 24-port line cards."""
+    return f"0/{number // 24}/0/{number % 24}"
+
+
+def add_iosxr_device(store: Datastore, device: Node, index: int, spec: FleetSpec) -> None:
+    """Add cisco-ios-xr-stats live-status and cisco-ios-xr interface config."""
+    live_status = store.entry(device, "live-status")
+    for number in range(spec.modules):
+        name = f"0/{number}/CPU0"
+        store.entry(
+            live_status,
+            "inventory",
+            (name,),
+            name=name,
+            descr="Line card",
+            pid="A9K-24X10GE-1G-SE",
+            sn=serial_number(index, number),
+        )
+    controllers = store.entry(live_status, "controllers")
+    for number in range(spec.optics):
+        optics = store.entry(controllers, "Optics", (port_name(number),), id=port_name(number))
+        store.entry(optics, "instance", **{"controller-state": "up" if number % 3 else "down"})
+        store.entry(
+            optics.child("instance"),  # type: ignore
+            "transceiver-vendor-details",
+            **{
+                "optics-type": "SFP+ 10G LR",
+                "name": "CISCO-FINISAR",
+                "part-number": "FTLX1474D3BCL-CS",
+                "serial-number": serial_number(index, 1000 + number),
+                "pid": "SFP-10G-LR",
+            },
+        )
+    interface = store.entry(store.entry(device, "config"), "interface")
+    for number in range(spec.interfaces):
+        store.entry(interface, "TenGigE", (port_name(number),), id=port_name(number))
+
+
+def elabel_brief(hostname: str, index: int, modules: int) -> List[str]:
+    """Build 'display elabel brief' output lines."""
+    lines = [
+        f"<{hostname}>display elabel brief",
+        "Slot #        BoardType         BarCode                   Description",
+    ]
+    lines.extend(
+        f"LPU {number + 1:<9} CR5DLPUFA070      {serial_number(index, number):<25} Line Processing Unit"
+        for number in range(modules)
+    )
+    return lines
+
+
+def optical_module_brief(hostname: str, optics: int) -> List[str]:
+    """Build 'display optical-module brief' output lines."""
+    lines = [
+        f"<{hostname}>display optical-module brief",
+        "Port          Status  Duplex  Type          WaveLength  RxPower  TxPower  Mode        VendorPN",
+    ]
+    lines.extend(
+        f"GE{number // 24 + 1}/0/{number % 24:<6} {'up' if number % 3 else 'down':<7} full    1000BASE-LX   "
+        "1310nm      -7.31dBm -5.40dBm SingleMode  SFP-GE-LX-SM1310"
+        for number in range(optics)
+    )
+    return lines
+
+
+def add_huawei_vrp_device(store: Datastore, device: Node, index: int, spec: FleetSpec) -> None:
+    """Add huawei vrp live-status exec outputs and interface config."""
+    hostname = device.leaves["name"]
+    store.entry(
+        device,
+        "live-status",
+        elabel="\n".join(elabel_brief(hostname, index, spec.modules)),
+        optical="\n".join(optical_module_brief(hostname, spec.optics)),
+    )
+    interface = store.entry(store.entry(device, "config"), "interface")
+    for number in range(spec.interfaces):
+        name = f"{number // 24 + 1}/0/{number % 24}"
+        store.entry(interface, "GigabitEthernet", (name,), name=name)
+
+
+def huawei_vrp_exec(exec_node: Node, args: List[str]) -> str:
+    """Answer live-status exec any and display calls from the stored outputs."""
+    live_status = exec_node.parent
+    assert live_status is not None
+    outputs = {"elabel brief": live_status.leaves["elabel"], "optical-module brief": live_status.leaves["optical"]}
+    return "\n".join(
+        output for command in " ".join(args).split(" ; ") for name, output in outputs.items() if command.endswith(name)
+    )
+
+
+def add_alu_sr_device(store: Datastore, device: Node, index: int, spec: FleetSpec) -> None:
+    """Add alu-stats live-status and alu port and lag config."""
+    live_status = store.entry(device, "live-status")
+    cards = max(1, spec.modules // 2)
+    for number in range(cards):
+        card_id = str(number + 1)
+        store.entry(
+            live_status,
+            "card",
+            (card_id,),
+            **{
+                "card-id": card_id,
+                "provisioned-type": "iom4-e",
+                "part-number": "3HE10024AA",
+                "serial-number": serial_number(index, number),
+            },
+        )
+    for number in range(spec.modules - cards):
+        slot_id = str(number % cards + 1)
+        slot = store.entry(live_status, "slot", (slot_id,), **{"slot-id": slot_id})
+        mda_id = str(number // cards + 1)
+        store.entry(
+            slot,
+            "mda",
+            (mda_id,),
+            **{
+                "mda-id": mda_id,
+                "provisioned-type": "me10-10gb-sfp+",
+                "part-number": "3HE10021AA",
+                "serial-number": serial_number(index, cards + number),
+            },
+        )
+    for number in range(spec.optics):
+        port_id = f"{number // 10 + 1}/1/{number % 10 + 1}"
+        port = store.entry(live_status, "ports", (port_id,), **{"port-id": port_id, "port-state": "up"})
+        store.entry(
+            port,
+            "transceiver-data",
+            **{
+                "transceiver-type": "sfp",
+                "part-number": "3HE04823AA",
+                "serial-number": serial_number(index, 1000 + number),
+                "model-number": "3HE04823AAAA01",
+            },
+        )
+    config = store.entry(device, "config")
+    for number in range(spec.interfaces):
+        port_id = f"{number // 10 + 1}/1/{number % 10 + 1}"
+        store.entry(config, "port", (port_id,), **{"port-id": port_id})
+    store.entry(config, "lag", ("1",), id="1")
+
+
+DEVICE_BUILDERS = {"ios-xr": add_iosxr_device, "huawei-vrp": add_huawei_vrp_device, "alu-sr": add_alu_sr_device}
+
+
+def build_fleet(spec: FleetSpec) -> Tuple[Datastore, List[str]]:
+    """Build a datastore with the fleet and return it with the device hostnames."""
+    store = Datastore(spec.maapi_latency, spec.device_latency)
+    store.actions["exec/any"] = store.actions["exec/display"] = huawei_vrp_exec
+    store.merge(store.entry(store.root, "inventory-settings"), SETTINGS)
+    devices = store.entry(store.root, "devices")
+    inventory_manager = store.entry(store.root, "inventory-manager", (INVENTORY_NAME,), name=INVENTORY_NAME)
+    hostnames = []
+    for index in range(spec.devices):
+        platform = spec.platforms[index % len(spec.platforms)]
+        hostname = f"{platform}-{index:05d}"
+        device = store.entry(devices, "device", (hostname,), name=hostname)
+        store.entry(
+            device,
+            "platform",
+            name=platform,
+            version="7.5.2",
+            model="bench",
+            **{"serial-number": serial_number(index, 99999)},
+        )
+        if platform in DEVICE_BUILDERS:
+            DEVICE_BUILDERS[platform](store, device, index, spec)
+        store.entry(inventory_manager, "device", (hostname,), name=hostname)
+        hostnames.append(hostname)
+    return store, hostnames
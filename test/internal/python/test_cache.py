@@ -0,0 +1,90 @@
+"""Inventory Live-Status Cache Tests."""
+import itertools
+import time
+
+import pytest
+from inventory.cache import LiveStatusCache
+
+
+class Clock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch):
+    """Replace time.monotonic with a hand-advanced clock."""
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def collector():
+    """Build a collect callable returning a numbered value per call."""
+    calls = itertools.count(1)
+    return lambda: f"collected {next(calls)}"
+
+
+def test_entry_expires_after_ttl(clock):
+    """An entry is returned until its TTL has passed, then collected again."""
+    cache = LiveStatusCache(ttl=60)
+    collect = collector()
+    assert cache.get_or_collect(("r1", "inventory"), collect) == "collected 1"
+    clock.now += 59
+    assert cache.get_or_collect(("r1", "inventory"), collect) == "collected 1"
+    clock.now += 1
+    assert cache.get(("r1", "inventory")) is None
+    assert cache.get_or_collect(("r1", "inventory"), collect) == "collected 2"
+
+
+@pytest.mark.usefixtures("clock")
+def test_least_recently_used_entry_is_evicted():
+    """Above max_entries the entry used longest ago is dropped, a get counts as use."""
+    cache = LiveStatusCache(max_entries=2)
+    cache.put(("r1", "inventory"), "r1")
+    cache.put(("r2", "inventory"), "r2")
+    assert cache.get(("r1", "inventory")) == "r1"
+    cache.put(("r3", "inventory"), "r3")
+    assert cache.get(("r2", "inventory")) is None
+    assert (cache.get(("r1", "inventory")), cache.get(("r3", "inventory"))) == ("r1", "r3")
+    cache.configure(ttl=300, max_entries=1)
+    assert cache.get(("r1", "inventory")) is None
+    assert cache.get(("r3", "inventory")) == "r3"
+
+
+@pytest.mark.usefixtures("clock")
+def test_zero_ttl_disables_cache():
+    """With a TTL of 0 nothing is stored and every call collects, configuring it drops the stored entries."""
+    cache = LiveStatusCache()
+    cache.put(("r1", "inventory"), "r1")
+    cache.configure(ttl=0, max_entries=1024)
+    assert cache.get(("r1", "inventory")) is None
+    collect = collector()
+    cache.get_or_collect(("r1", "inventory"), collect)
+    assert cache.get_or_collect(("r1", "inventory"), collect) == "collected 2"
+
+
+@pytest.mark.usefixtures("clock")
+def test_force_refresh_collects_and_stores():
+    """force_refresh collects despite a fresh entry and stores the new value."""
+    cache = LiveStatusCache()
+    collect = collector()
+    cache.get_or_collect(("r1", "inventory"), collect)
+    assert cache.get_or_collect(("r1", "inventory"), collect, force_refresh=True) == "collected 2"
+    assert cache.get_or_collect(("r1", "inventory"), collect) == "collected 2"
+
+
+@pytest.mark.usefixtures("clock")
+def test_invalidate_drops_entries_of_a_device():
+    """Invalidating a device keeps the entries of other devices."""
+    cache = LiveStatusCache()
+    for key in (("r1", "inventory"), ("r1", "controllers"), ("r2", "inventory")):
+        cache.put(key, key[0])
+    cache.invalidate("r1")
+    assert [cache.get(("r1", "inventory")), cache.get(("r1", "controllers"))] == [None, None]
+    assert cache.get(("r2", "inventory")) == "r2"
@@ -0,0 +1,67 @@
+"""Inventory Export Tests."""
+import json
+
+import pytest
+from bench_inventory_update import run_update
+from fake_nso import Log
+from inventory.export import ExportOptions, export_inventory, write_export_rows
+from nso_fleet import FleetSpec, build_fleet
+
+SPEC = FleetSpec(devices_per_platform=1, modules=2, optics=2, interfaces=2)
+STARTED = "2030-01-01T00:00:00+00:00"
+
+
+@pytest.fixture(name="store")
+def fixture_store(tmp_path):
+    """Updated fleet exporting to a temporary directory."""
+    store, _ = build_fleet(SPEC)
+    run_update(store)
+    store.root.child("inventory-settings").child("export").leaves["directory"] = str(tmp_path)
+    return store
+
+
+def last_export(store):
+    """Get the recorded last export time."""
+    return store.root.child("inventory-operations").child("export").leaves.get("last-export")
+
+
+def test_export_writes_file_in_export_directory(store, tmp_path):
+    """Every record is written as a JSON line to the named file of the export directory."""
+    count = export_inventory(ExportOptions("all.jsonl"), STARTED, Log())
+    lines = (tmp_path / "all.jsonl").read_text(encoding="utf-8").splitlines()
+    assert count == len(lines) > 0
+    assert {json.loads(line)["type"] for line in lines} == {"platform", "inventory", "controller", "interface"}
+    assert not list(tmp_path.glob("*.tmp"))
+    assert last_export(store) == STARTED
+
+
+@pytest.mark.parametrize("file_name", ["../escape.jsonl", "sub/file.jsonl", "..", ""])
+def test_export_rejects_paths(store, tmp_path, file_name):  # pylint: disable=unused-argument
+    """A file name with a directory part is refused before anything is written."""
+    with pytest.raises(ValueError):
+        export_inventory(ExportOptions(file_name), STARTED, Log())
+    assert not list(tmp_path.parent.glob("escape.jsonl*"))
+    assert not list(tmp_path.iterdir())
+
+
+def test_filtered_export_keeps_last_export(store):
+    """Exports filtered by platform, inventory-manager or data do not move last-export."""
+    export_inventory(ExportOptions("xr.jsonl", platforms=("ios-xr",)), STARTED, Log())
+    export_inventory(ExportOptions("modules.jsonl", data=("inventory",)), STARTED, Log())
+    assert last_export(store) is None
+    assert export_inventory(ExportOptions("vrp.jsonl", platforms=("huawei-vrp",), changed_only=True), STARTED, Log())
+    export_inventory(ExportOptions("all.jsonl"), STARTED, Log())
+    assert export_inventory(ExportOptions("changed.jsonl", changed_only=True), STARTED, Log()) == 0
+
+
+def test_failed_export_removes_temporary_file(tmp_path):
+    """A failing row source leaves neither the temporary nor the target file behind."""
+
+    def rows():
+        yield {"type": "platform", "inventory-manager": "bench", "device": "r1"}
+        raise RuntimeError("query failed")
+
+    path = tmp_path / "broken.csv"
+    with pytest.raises(RuntimeError):
+        write_export_rows(rows(), str(path), "csv")
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,91 @@
+"""Inventory Hardware Index Tests."""
+import fake_nso
+import pytest
+from bench_inventory_update import run_update
+from inventory import main
+from inventory.index import HardwareIndex, HardwareLocation
+from inventory.main import HardwareLookup
+from inventory.records import ControllerRecord, ModuleRecord
+from nso_fleet import INVENTORY_NAME, FleetSpec, build_fleet
+
+SPEC = FleetSpec(devices_per_platform=1, modules=2, optics=2, interfaces=1, platforms=("ios-xr",))
+
+
+@pytest.fixture(name="fleet")
+def fixture_fleet():
+    """Updated fleet of a single ios-xr device."""
+    store, (hostname,) = build_fleet(SPEC)
+    run_update(store)
+    return store, hostname
+
+
+def inventory_device(store, hostname):
+    """Get the inventory-manager entry of a device."""
+    return store.root.child("inventory-manager", (INVENTORY_NAME,)).child("device", (hostname,))
+
+
+def built_index():
+    """Build a new index from the datastore in use."""
+    index = HardwareIndex()
+    with fake_nso.single_trans("admin", "system") as trans:
+        index.build(trans, fake_nso.Log())
+    return index
+
+
+def test_build_indexes_modules_and_controllers(fleet):
+    """Every serial number of the written modules and controllers is found at its entry."""
+    store, hostname = fleet
+    index = built_index()
+    assert index.built
+    device = inventory_device(store, hostname)
+    for kind, list_name, key in (("module", "inventory", "name"), ("controller", "controller", "id")):
+        for entry in device.entries(list_name):
+            location = HardwareLocation(INVENTORY_NAME, hostname, kind, entry.leaves[key], "serial-number")
+            assert index.lookup(entry.leaves["serial-number"]) == [location]
+
+
+def test_lookup_normalizes_value_and_filters_field():
+    """Lookups ignore case and padding, a field restricts the matches to that field."""
+    index = HardwareIndex()
+    index.set_device(
+        INVENTORY_NAME, "r1", [ModuleRecord("0/0/CPU0", pid="x-1")], [ControllerRecord("0/0/0/0", part_number="X-1")]
+    )
+    module = HardwareLocation(INVENTORY_NAME, "r1", "module", "0/0/CPU0", "pid")
+    controller = HardwareLocation(INVENTORY_NAME, "r1", "controller", "0/0/0/0", "part-number")
+    assert index.lookup("  x-1 ") == sorted([module, controller])
+    assert index.lookup("X-1", "pid") == [module]
+    assert index.lookup("X-1", "serial-number") == []
+
+
+def test_set_device_replaces_previous_records():
+    """Values no longer carried by a device are dropped, other devices keep theirs."""
+    index = HardwareIndex()
+    index.set_device(INVENTORY_NAME, "r1", [ModuleRecord("0/0/CPU0", serial_number="SN1")], [])
+    index.set_device(INVENTORY_NAME, "r2", [ModuleRecord("0/0/CPU0", serial_number="SN1")], [])
+    index.set_device(INVENTORY_NAME, "r1", [ModuleRecord("0/0/CPU0", serial_number="SN2")], [])
+    assert [location.device for location in index.lookup("SN1")] == ["r2"]
+    assert [location.device for location in index.lookup("SN2")] == ["r1"]
+    index.set_device(INVENTORY_NAME, "r2", [], [ControllerRecord("0/0/0/0", serial_number=" ")])
+    assert "SN1" not in index.entries
+    assert index.devices[INVENTORY_NAME, "r2"] == []
+
+
+def test_lookup_action_prunes_removed_devices(fleet, monkeypatch):
+    """Matches of device entries removed since the index was built are dropped from the output and the index."""
+    store, hostname = fleet
+    index = built_index()
+    monkeypatch.setattr(main, "HARDWARE_INDEX", index)
+    serial_number = inventory_device(store, hostname).entries("inventory")[0].leaves["serial-number"]
+
+    def lookup():
+        action_input = fake_nso.new_action_params(value=serial_number, field="any", rebuild=False)
+        output = fake_nso.new_action_params()
+        with fake_nso.single_trans("admin", "system") as trans:
+            HardwareLookup(fake_nso.Log()).cb_action(None, "inventory-hardware-lookup", "", action_input, output, trans)
+        return output.result
+
+    assert lookup() == "1 match(es)"
+    del store.root.child("inventory-manager", (INVENTORY_NAME,)).children["device"][hostname,]
+    assert lookup() == "0 match(es)"
+    assert (INVENTORY_NAME, hostname) not in index.devices
+    assert not index.lookup(serial_number)
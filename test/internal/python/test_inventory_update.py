@@ -0,0 +1,204 @@
+"""Inventory Update Benchmark Tests."""
+import sys
+
+import fake_nso
+from bench_inventory_update import run_update
+from fake_nso import Datastore
+from inventory.drivers import huawei_vrp
+from inventory.main import SyncOptions, run_inventory_update
+from nso_fleet import INVENTORY_NAME, FleetSpec, build_fleet
+
+SPEC = FleetSpec(devices_per_platform=2, modules=6, optics=12, interfaces=12)
+# MAAPI round trips per device budgets, raise them only for a deliberate cost increase
+FIRST_RUN_CALLS_PER_DEVICE = 255
+UNCHANGED_RUN_CALLS_PER_DEVICE = 45
+
+
+def inventory_device(store: Datastore, hostname: str):
+    """Get the inventory-manager device entry of a hostname."""
+    return store.root.child("inventory-manager", (INVENTORY_NAME,)).child("device", (hostname,))
+
+
+def test_first_run_writes_every_device():
+    """Platform, modules, controllers and interfaces of every platform are written."""
+    store, hostnames = build_fleet(SPEC)
+    result = run_update(store)
+    assert result.statuses == {"updated": SPEC.devices}
+    for hostname in hostnames:
+        device = inventory_device(store, hostname)
+        assert device.child("platform").leaves["name"] == hostname.rsplit("-", 1)[0]
+        assert len(device.entries("inventory")) == SPEC.modules
+        assert len(device.entries("controller")) == SPEC.optics
+        assert len(device.entries("interface")) >= SPEC.interfaces
+        assert device.leaves["fingerprint"]
+    assert result.maapi_calls_per_device <= FIRST_RUN_CALLS_PER_DEVICE
+
+
+def test_unchanged_run_skips_writes():
+    """A re-run of an unchanged fleet writes nothing and costs a fraction of the first run."""
+    store, _ = build_fleet(SPEC)
+    first = run_update(store)
+    store.calls.clear()
+    second = run_update(store)
+    assert second.statuses == {"unchanged": SPEC.devices}
+    assert not store.calls["set_object"]
+    assert second.maapi_calls_per_device <= UNCHANGED_RUN_CALLS_PER_DEVICE
+    assert second.maapi_calls < first.maapi_calls
+
+
+def test_unsupported_platform_fails_before_live_status():
+    """Devices of a platform without a driver fail without any live-status call."""
+    store, hostnames = build_fleet(FleetSpec(devices_per_platform=1, platforms=("junos",)))
+    result = run_update(store)
+    assert result.statuses == {"failed": len(hostnames)}
+    assert not store.calls["request_action"]
+
+
+def test_large_device_is_committed_in_chunks():
+    """A device with more list entries than chunk-size is written in several bounded transactions."""
+    spec = FleetSpec(devices_per_platform=1, modules=40, optics=120, interfaces=120)
+    store, hostnames = build_fleet(spec)
+    store.root.child("inventory-settings").child("write").leaves["chunk-size"] = 25
+    result = run_update(store, batch_size=spec.devices)
+    assert result.statuses == {"updated": spec.devices}
+    # a chunk closes with at most one fingerprint and last-changed write past chunk-size
+    assert store.max_commit_writes <= 2 * 25 + 2
+    assert store.calls["apply"] > spec.devices * (spec.modules + spec.optics) // 25
+    for hostname in hostnames:
+        assert len(inventory_device(store, hostname).entries("controller")) == spec.optics
+
+
+def test_parallel_collection_hides_device_latency():
+    """Devices are collected concurrently up to max-parallel."""
+    spec = FleetSpec(devices_per_platform=2, modules=2, optics=2, interfaces=2, device_latency=0.05)
+    serial = run_update(build_fleet(spec)[0], max_parallel=1)
+    parallel = run_update(build_fleet(spec)[0], max_parallel=spec.devices)
+    assert serial.statuses == parallel.statuses == {"updated": spec.devices}
+    assert serial.seconds >= spec.devices * spec.device_latency
+    assert parallel.seconds < serial.seconds / 2
+
+
+def test_due_devices_read_only_their_entries():
+    """Updating a few devices reads as many rows in a large fleet as in a small one."""
+    rows = []
+    for devices_per_platform in (1, 10):
+        store, hostnames = build_fleet(SPEC._replace(devices_per_platform=devices_per_platform))
+        run_update(store)
+        store.query_rows = 0
+        results = run_inventory_update(
+            {INVENTORY_NAME: hostnames[:3]}, SyncOptions(4, 10, False, True), fake_nso.Log()
+        )
+        assert {result.status for result in results} == {"unchanged"}
+        rows.append(store.query_rows)
+    assert rows[0] == rows[1]
+
+
+def test_empty_fields_converge():
+    """Modules reported without pid or serial number are not rewritten by every refresh."""
+    store, hostnames = build_fleet(SPEC)
+    live_status = store.root.child("devices").child("device", (hostnames[1],)).child("live-status")
+    live_status.leaves["elabel"] += "\nPSU 1\nPSU 2"
+    run_update(store, force_refresh=True)
+    assert len(inventory_device(store, hostnames[1]).entries("inventory")) == SPEC.modules + 2
+    store.calls.clear()
+    result = run_update(store, force_refresh=True)
+    assert result.statuses == {"unchanged": SPEC.devices}
+    assert not store.calls["set_object"]
+
+
+def test_rewritten_fingerprint_keeps_last_changed():
+    """A device whose data is already stored gets its fingerprint back without a new last-changed."""
+    store, hostnames = build_fleet(SPEC)
+    run_update(store)
+    device = inventory_device(store, hostnames[0])
+    last_changed = device.leaves["last-changed"] = "2030-01-01T00:00:00+00:00"
+    fingerprint = device.leaves.pop("fingerprint")
+    result = run_update(store)
+    assert result.statuses == {"unchanged": SPEC.devices}
+    assert device.leaves["fingerprint"] == fingerprint
+    assert device.leaves["last-changed"] == last_changed
+
+
+def test_device_outside_group_fails_alone():
+    """A device that is not an entry of the inventory-manager fails without an entry being written."""
+    store, hostnames = build_fleet(SPEC)
+    fake_nso.use(store)
+    stranger = store.entry(store.root.child("devices"), "device", ("stranger",), name="stranger")
+    store.entry(stranger, "platform", name="ios-xr")
+    results = run_inventory_update(
+        {INVENTORY_NAME: hostnames + ["stranger"]}, SyncOptions(4, 10, False, False), fake_nso.Log()
+    )
+    statuses = {result.name: result.status for result in results}
+    assert statuses.pop("stranger") == "failed"
+    assert set(statuses.values()) == {"updated"}
+    assert inventory_device(store, "stranger") is None
+
+
+def test_failing_device_does_not_fail_its_batch(monkeypatch):
+    """A batch failing on one device is written again one device at a time, none of the failed writes is kept."""
+    store, hostnames = build_fleet(SPEC)
+    broken = hostnames[2]
+    set_object = sys.modules["_ncs.maapi"].set_object
+
+    def failing_set_object(msock, th, values, keypath):
+        if broken in keypath and "/controller{" in keypath:
+            raise fake_nso.NcsError("write rejected")
+        set_object(msock, th, values, keypath)
+
+    monkeypatch.setattr(sys.modules["_ncs.maapi"], "set_object", failing_set_object)
+    result = run_update(store, batch_size=SPEC.devices)
+    assert result.statuses == {"updated": SPEC.devices - 1, "failed": 1}
+    device = inventory_device(store, broken)
+    assert not device.leaves.get("fingerprint")
+    assert device.child("platform") is None and not device.entries("inventory")
+    for hostname in hostnames:
+        if hostname != broken:
+            assert len(inventory_device(store, hostname).entries("inventory")) == SPEC.modules
+
+
+def test_vrp_without_batched_exec_falls_back_once(monkeypatch):
+    """A VRP device rejecting the batched exec is collected with display calls, without retrying the batch."""
+    monkeypatch.setattr(huawei_vrp, "BATCH_FAILURES", {})
+    store, hostnames = build_fleet(SPEC)
+    store.actions["exec/any"] = lambda exec_node, args: "% Unrecognized command found at '^' position."
+    vrp_devices = SPEC.devices_per_platform
+    first = run_update(store)
+    assert first.statuses == {"updated": SPEC.devices}
+    assert store.calls["request_action"] == 3 * vrp_devices
+    for hostname in hostnames:
+        if hostname.startswith("huawei-vrp"):
+            device = inventory_device(store, hostname)
+            assert len(device.entries("inventory")) == SPEC.modules
+            assert len(device.entries("controller")) == SPEC.optics
+    store.calls.clear()
+    second = run_update(store)
+    assert second.statuses == {"unchanged": SPEC.devices}
+    assert store.calls["request_action"] == 2 * vrp_devices
+
+
+def test_vrp_rejected_exec_is_remembered_after_display_calls(monkeypatch):
+    """A VRP device rejecting the batched exec with an error is remembered once its display calls succeed."""
+    monkeypatch.setattr(huawei_vrp, "BATCH_FAILURES", {})
+    store, hostnames = build_fleet(SPEC)
+
+    def rejected(exec_node, args):
+        raise fake_nso.NcsError("command rejected")
+
+    store.actions["exec/any"] = rejected
+    assert run_update(store).statuses == {"updated": SPEC.devices}
+    assert set(huawei_vrp.BATCH_FAILURES) == {hostname for hostname in hostnames if hostname.startswith("huawei-vrp")}
+
+
+def test_unreachable_vrp_device_is_not_remembered(monkeypatch):
+    """A VRP device failing the display calls as well fails its collection without disabling the batched exec."""
+    monkeypatch.setattr(huawei_vrp, "BATCH_FAILURES", {})
+    store, _ = build_fleet(SPEC)
+    store.root.child("inventory-settings").child("collection").leaves["retries"] = 0
+
+    def unreachable(exec_node, args):
+        raise fake_nso.NcsError("device is not reachable")
+
+    store.actions["exec/any"] = store.actions["exec/display"] = unreachable
+    result = run_update(store)
+    assert result.statuses == {"updated": SPEC.devices - SPEC.devices_per_platform, "failed": SPEC.devices_per_platform}
+    assert not huawei_vrp.BATCH_FAILURES
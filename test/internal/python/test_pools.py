@@ -0,0 +1,187 @@
+"""Inventory Id-Pool Provisioning Tests."""
+# pylint: disable=wrong-import-position
+import fake_nso
+
+fake_nso.install()
+
+import pytest  # noqa: E402
+from inventory import main  # noqa: E402
+from inventory.main import (DEVICE_POOLS, GLOBAL_POOLS, INTERFACE_POOLS, DeviceResult, PoolSettings,  # noqa: E402
+                            create_inventory_resource_pools, ensure_pool)
+from inventory.records import InterfaceRecord  # noqa: E402
+
+PRE_CREATE = PoolSettings("pre-create", GLOBAL_POOLS, DEVICE_POOLS, INTERFACE_POOLS)
+ON_DEMAND = PRE_CREATE._replace(provisioning="on-demand")
+INTERFACES = (InterfaceRecord("GigabitEthernet", "0/0/0/0"), InterfaceRecord("GigabitEthernet", "0/0/0/1"))
+
+
+@pytest.fixture(name="store")
+def fixture_store():
+    """Empty datastore."""
+    return fake_nso.use(fake_nso.Datastore())
+
+
+def pool_names(store):
+    """Get the names of all id-pools."""
+    return {pool.leaves["name"] for pool in store.entry(store.root, "resource-pools").entries("id-pool")}
+
+
+def add_pool(store, name):
+    """Add an existing id-pool."""
+    store.entry(store.entry(store.root, "resource-pools"), "id-pool", (name,), name=name)
+
+
+def interface_pools(device, if_number):
+    """Get the interface pool names of a GigabitEthernet interface."""
+    return {f"{device}_GigabitEthernet_{if_number.replace('/', '_')}_{pool.name}" for pool in INTERFACE_POOLS}
+
+
+def test_pre_create_creates_missing_pools_once(store):
+    """Global, device and interface pools are created by the first run only."""
+    create_inventory_resource_pools(
+        [DeviceResult("bench", "r1", "updated", interfaces=INTERFACES)], False, PRE_CREATE, fake_nso.Log()
+    )
+    assert pool_names(store) == (
+        {pool.name for pool in GLOBAL_POOLS}
+        | {"r1_SDP_ID_POOL"}
+        | interface_pools("r1", "0/0/0/0")
+        | interface_pools("r1", "0/0/0/1")
+    )
+    store.calls.clear()
+    create_inventory_resource_pools(
+        [DeviceResult("bench", "r1", "unchanged", interfaces=INTERFACES)], False, PRE_CREATE, fake_nso.Log()
+    )
+    assert store.calls["create"] == store.calls["apply"] == 0
+
+
+def test_existing_pools_are_queried_by_device_prefix(store):
+    """Only the global pools and the pools of the synced devices are read, not those of similarly named devices."""
+    for device in ("r1", "r10", "r2"):
+        add_pool(store, f"{device}_SDP_ID_POOL")
+    add_pool(store, "OTHER_POOL")
+    create_inventory_resource_pools([DeviceResult("bench", "r1", "updated")], False, PRE_CREATE, fake_nso.Log())
+    assert store.query_rows == 1
+    assert store.calls["create"] == len(GLOBAL_POOLS)
+
+
+def test_failed_devices_get_no_pools(store):
+    """Devices that were not written get no pools and start no transaction."""
+    create_inventory_resource_pools(
+        [DeviceResult("bench", "r1", "failed", interfaces=INTERFACES)], False, ON_DEMAND, fake_nso.Log()
+    )
+    assert store.calls["start_trans"] == 0
+    assert not pool_names(store)
+
+
+def test_remove_stale_pools_deletes_pools_of_removed_interfaces(store):
+    """Pools of removed interfaces are deleted only if asked, pools of current interfaces are kept."""
+    for pool_name in interface_pools("r1", "0/0/0/0") | interface_pools("r1", "0/0/0/2"):
+        add_pool(store, pool_name)
+    result = DeviceResult(
+        "bench", "r1", "updated", interfaces=INTERFACES[:1], removed_interfaces=(("GigabitEthernet", "0/0/0/2"),)
+    )
+    create_inventory_resource_pools([result], False, ON_DEMAND, fake_nso.Log())
+    assert store.calls["start_trans"] == 0
+    create_inventory_resource_pools([result], True, ON_DEMAND, fake_nso.Log())
+    assert pool_names(store) == interface_pools("r1", "0/0/0/0")
+    assert store.calls["apply"] == 1
+
+
+def test_remove_stale_pools_without_existing_pools_commits_nothing(store):
+    """Removed interfaces without pools leave the pools untouched and commit nothing."""
+    result = DeviceResult("bench", "r1", "updated", removed_interfaces=(("GigabitEthernet", "0/0/0/2"),))
+    create_inventory_resource_pools([result], True, ON_DEMAND, fake_nso.Log())
+    assert store.calls["apply"] == 0
+    assert not pool_names(store)
+
+
+@pytest.fixture(name="ensured")
+def fixture_ensured(monkeypatch, store):  # pylint: disable=unused-argument
+    """Empty ensured pool cache."""
+    monkeypatch.setattr(main, "ENSURED_POOLS", {})
+    return main.ENSURED_POOLS
+
+
+def pool_range(store, name):
+    """Get the (start, end) range of an id-pool."""
+    pool_range_node = store.root.child("resource-pools").child("id-pool", (name,)).child("range")
+    return pool_range_node.leaves["start"], pool_range_node.leaves["end"]
+
+
+@pytest.mark.parametrize(
+    "template, args, pool_name",
+    [
+        ("PW_ID_POOL", {}, "PW_ID_POOL"),
+        ("SDP_ID_POOL", {"device_name": "r1"}, "r1_SDP_ID_POOL"),
+        (
+            "CVLAN_ID_POOL",
+            {"device_name": "r1", "if_size": "GigabitEthernet", "if_number": "0/0/0/0"},
+            "r1_GigabitEthernet_0_0_0_0_CVLAN_ID_POOL",
+        ),
+    ],
+)
+def test_ensure_pool_names_pool_by_template_scope(store, ensured, template, args, pool_name):
+    """Global, device and interface templates create the pool named for their scope with the template range."""
+    assert ensure_pool(template, fake_nso.Log(), **args) == (pool_name, True)
+    assert pool_names(store) == {pool_name}
+    pool_info = next(pool for pool in GLOBAL_POOLS + DEVICE_POOLS + INTERFACE_POOLS if pool.name == template)
+    assert pool_range(store, pool_name) == (pool_info.start, pool_info.end)
+    assert ensured[template, args.get("device_name"), args.get("if_size"), args.get("if_number")] == pool_name
+
+
+@pytest.mark.usefixtures("ensured")
+def test_configured_template_replaces_built_ins_of_its_scope(store):
+    """A configured device template is used instead of the built-in device templates."""
+    pools = store.entry(store.entry(store.root, "inventory-settings"), "pools")
+    store.entry(pools, "template", ("VPN_ID_POOL",), name="VPN_ID_POOL", scope="device", start=1, end=10)
+    assert ensure_pool("VPN_ID_POOL", fake_nso.Log(), device_name="r1") == ("r1_VPN_ID_POOL", True)
+    assert pool_range(store, "r1_VPN_ID_POOL") == (1, 10)
+    with pytest.raises(ValueError, match="Unknown pool template"):
+        ensure_pool("SDP_ID_POOL", fake_nso.Log(), device_name="r1")
+
+
+@pytest.mark.parametrize(
+    "template, args, message",
+    [
+        ("NO_SUCH_POOL", {"device_name": "r1"}, "Unknown pool template"),
+        ("SDP_ID_POOL", {}, "requires a device"),
+        ("CVLAN_ID_POOL", {"if_size": "GigabitEthernet", "if_number": "0/0/0/0"}, "requires a device"),
+        ("CVLAN_ID_POOL", {"device_name": "r1", "if_number": "0/0/0/0"}, "requires an if-size and if-number"),
+        ("CVLAN_ID_POOL", {"device_name": "r1", "if_size": "GigabitEthernet"}, "requires an if-size and if-number"),
+    ],
+)
+def test_ensure_pool_rejects_incomplete_requests(store, ensured, template, args, message):
+    """A request for an unknown template or without the keys of its scope creates nothing and is not cached."""
+    with pytest.raises(ValueError, match=message):
+        ensure_pool(template, fake_nso.Log(), **args)
+    assert not pool_names(store)
+    assert not ensured
+
+
+@pytest.mark.usefixtures("ensured")
+def test_ensured_pool_is_answered_from_memory(store):
+    """A pool ensured before is returned as not created without a transaction."""
+    ensure_pool("SDP_ID_POOL", fake_nso.Log(), device_name="r1")
+    store.calls.clear()
+    assert ensure_pool("SDP_ID_POOL", fake_nso.Log(), device_name="r1") == ("r1_SDP_ID_POOL", False)
+    assert not store.calls["start_trans"]
+
+
+@pytest.mark.usefixtures("ensured")
+def test_existing_pool_is_not_created_again(store):
+    """A pool created outside ensure_pool is reported as not created."""
+    add_pool(store, "r1_SDP_ID_POOL")
+    assert ensure_pool("SDP_ID_POOL", fake_nso.Log(), device_name="r1") == ("r1_SDP_ID_POOL", False)
+    assert not store.calls["apply"]
+
+
+def test_removed_stale_pool_is_ensured_again(store, ensured):
+    """Deleting a stale interface pool drops it from the cache, so the next request creates it again."""
+    args = {"device_name": "r1", "if_size": "GigabitEthernet", "if_number": "0/0/0/2"}
+    pool_name, _ = ensure_pool("CVLAN_ID_POOL", fake_nso.Log(), **args)
+    ensure_pool("SDP_ID_POOL", fake_nso.Log(), device_name="r1")
+    result = DeviceResult("bench", "r1", "updated", removed_interfaces=(("GigabitEthernet", "0/0/0/2"),))
+    create_inventory_resource_pools([result], True, ON_DEMAND, fake_nso.Log())
+    assert pool_names(store) == {"r1_SDP_ID_POOL"}
+    assert list(ensured.values()) == ["r1_SDP_ID_POOL"]
+    assert ensure_pool("CVLAN_ID_POOL", fake_nso.Log(), **args) == (pool_name, True)
@@ -0,0 +1,162 @@
+"""Inventory Device Failure Handling Tests."""
+import sys
+import threading
+import time
+
+import fake_nso
+import pytest
+from bench_inventory_update import run_update
+from inventory.resilience import call_with_retries
+from nso_fleet import FleetSpec, build_fleet
+
+SPEC = FleetSpec(devices_per_platform=1, modules=2, optics=2, interfaces=2, platforms=("ios-xr", "alu-sr"))
+
+
+class Flaky:
+    """Callable failing a number of times before it returns."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError(f"failure {self.calls}")
+        return "collected"
+
+
+def test_retry_succeeds_within_retries():
+    """A failure is retried and the later result returned."""
+    func = Flaky(2)
+    assert call_with_retries(func, 2, 0, time.monotonic() + 60, fake_nso.Log()) == "collected"
+    assert func.calls == 3
+
+
+def test_retry_gives_up_after_retries():
+    """The last failure is raised once the retries are used up."""
+    func = Flaky(5)
+    with pytest.raises(RuntimeError, match="failure 3"):
+        call_with_retries(func, 2, 0, time.monotonic() + 60, fake_nso.Log())
+    assert func.calls == 3
+
+
+def test_retry_backoff_doubles(monkeypatch):
+    """Retries wait backoff seconds, doubled for each further attempt."""
+    delays = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    call_with_retries(Flaky(3), 3, 2, time.monotonic() + 60, fake_nso.Log())
+    assert delays == [2, 4, 8]
+
+
+def test_retry_not_started_past_deadline():
+    """No retry is started if its backoff would end after the deadline."""
+    func = Flaky(1)
+    start = time.monotonic()
+    with pytest.raises(RuntimeError):
+        call_with_retries(func, 3, 10, start + 5, fake_nso.Log())
+    assert func.calls == 1
+    assert time.monotonic() - start < 1
+
+
+def test_retry_stops_when_cancelled():
+    """A cancelled run does not wait for the backoff."""
+    func = Flaky(1)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(RuntimeError):
+        call_with_retries(func, 3, 10, time.monotonic() + 60, fake_nso.Log(), cancel)
+    assert func.calls == 1
+
+
+def collection_settings(store, **leaves):
+    """Set inventory-settings collection leaves, circuit-breaker ones included."""
+    collection = store.root.child("inventory-settings").child("collection")
+    for leaf, value in leaves.items():
+        leaf = leaf.replace("_", "-")
+        if leaf in ("failure-threshold", "cool-down"):
+            collection.child("circuit-breaker").leaves[leaf] = value
+        else:
+            collection.leaves[leaf] = value
+
+
+def device_failure(store, hostname):
+    """Get the device-failure entry of a device, None if it has none."""
+    return store.root.child("inventory-operations").child("device-failure", (hostname,))
+
+
+@pytest.fixture(name="live_status")
+def fixture_live_status(monkeypatch):
+    """Make the live-status queries of chosen devices fail or hang, counting the attempts per device."""
+    query_start = sys.modules["_ncs.maapi"].query_start
+    behaviour = {"failing": set(), "hanging": set(), "attempts": {}, "release": threading.Event()}
+
+    def faulty_query_start(msock, th, xpath, *args):
+        for hostname in behaviour["failing"] | behaviour["hanging"]:
+            if f"'{hostname}'" in xpath and ":live-status/" in xpath:
+                behaviour["attempts"][hostname] = behaviour["attempts"].get(hostname, 0) + 1
+                if hostname in behaviour["hanging"]:
+                    behaviour["release"].wait(10)
+                raise fake_nso.NcsError(f"{hostname} is not reachable")
+        return query_start(msock, th, xpath, *args)
+
+    monkeypatch.setattr(sys.modules["_ncs.maapi"], "query_start", faulty_query_start)
+    yield behaviour
+    behaviour["release"].set()
+
+
+def test_failing_device_is_retried_and_recorded(live_status):
+    """A failing device is retried, reported failed and its failure recorded; other devices are updated."""
+    store, (broken, healthy) = build_fleet(SPEC)
+    collection_settings(store, retries=2, retry_backoff=0)
+    live_status["failing"].add(broken)
+    result = run_update(store)
+    assert result.statuses == {"updated": 1, "failed": 1}
+    assert live_status["attempts"][broken] == 3
+    assert device_failure(store, broken).leaves["consecutive-failures"] == 1
+    assert "not reachable" in device_failure(store, broken).leaves["last-error"]
+    assert device_failure(store, healthy) is None
+
+    live_status["failing"].clear()
+    assert run_update(store).statuses == {"updated": 1, "unchanged": 1}
+    assert device_failure(store, broken) is None
+
+
+def test_hanging_device_times_out(live_status):
+    """A device collection running past the timeout is given up without waiting for it."""
+    store, (hanging, _) = build_fleet(SPEC)
+    collection_settings(store, timeout=1, retries=0)
+    live_status["hanging"].add(hanging)
+    start = time.monotonic()
+    result = run_update(store)
+    assert time.monotonic() - start < 5
+    assert result.statuses == {"updated": 1, "failed": 1}
+    assert "timed out" in device_failure(store, hanging).leaves["last-error"]
+
+
+def test_hanging_devices_do_not_hold_back_queued_ones(live_status):
+    """Collections given up after the timeout free their slot, the queued devices are collected meanwhile."""
+    store, hostnames = build_fleet(SPEC._replace(devices_per_platform=2))
+    collection_settings(store, timeout=1, retries=0)
+    live_status["hanging"].update(hostnames[:2])
+    start = time.monotonic()
+    result = run_update(store, max_parallel=1)
+    assert time.monotonic() - start < 8
+    assert result.statuses == {"updated": 2, "failed": 2}
+    assert live_status["attempts"] == {hostname: 1 for hostname in hostnames[:2]}
+
+
+def test_device_reaching_failure_threshold_is_skipped(live_status):
+    """After failure-threshold consecutive failures a device is skipped without collection until cool-down ends."""
+    store, (broken, _) = build_fleet(SPEC)
+    collection_settings(store, retries=0, failure_threshold=2, cool_down=60)
+    live_status["failing"].add(broken)
+    assert run_update(store).statuses == {"updated": 1, "failed": 1}
+    assert "circuit-open-until" not in device_failure(store, broken).leaves
+    assert run_update(store).statuses == {"unchanged": 1, "failed": 1}
+    assert device_failure(store, broken).leaves["circuit-open-until"]
+    assert live_status["attempts"][broken] == 2
+
+    assert run_update(store).statuses == {"unchanged": 1, "skipped": 1}
+    assert live_status["attempts"][broken] == 2
+    assert device_failure(store, broken).leaves["consecutive-failures"] == 2
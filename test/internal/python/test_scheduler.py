@@ -0,0 +1,102 @@
+"""Inventory Refresh Scheduler Tests."""
+# pylint: disable=wrong-import-position
+import fake_nso
+
+fake_nso.install()
+
+from inventory.scheduler import Scheduler, ScheduleSettings, get_schedule_settings  # noqa: E402
+from nso_fleet import INVENTORY_NAME, FleetSpec, build_fleet  # noqa: E402
+
+INTERVAL = 600.0
+
+
+def schedule(devices, interval=INTERVAL, jitter=0.0):
+    """Build settings of a single scheduled group."""
+    return ScheduleSettings(4, 10, jitter, {"group": interval}, {"group": list(devices)})
+
+
+def slots(scheduler):
+    """Get the planned due times per device of the group."""
+    return {device: due for (_, device), due in scheduler._due.items()}  # pylint: disable=protected-access
+
+
+def test_plan_spaces_devices_evenly():
+    """Without jitter the devices of a group are due one interval share apart."""
+    scheduler = Scheduler()
+    scheduler.plan(schedule(["a", "b", "c", "d"]), 0.0)
+    assert slots(scheduler) == {"a": 0.0, "b": 150.0, "c": 300.0, "d": 450.0}
+
+
+def test_plan_jitter_stays_within_a_share():
+    """Jitter moves a slot by at most its share of the interval."""
+    scheduler = Scheduler()
+    scheduler.plan(schedule(["a", "b", "c", "d"], jitter=1.0), 0.0)
+    for index, device in enumerate("abcd"):
+        assert index * 150.0 <= slots(scheduler)[device] <= (index + 1) * 150.0
+
+
+def test_plan_keeps_slots_of_an_unchanged_group():
+    """Re-planning the same settings later does not move any slot."""
+    scheduler = Scheduler()
+    scheduler.plan(schedule(["a", "b"]), 0.0)
+    scheduler.plan(schedule(["a", "b"]), 100.0)
+    assert slots(scheduler) == {"a": 0.0, "b": 300.0}
+
+
+def test_plan_replans_on_interval_change():
+    """A new interval spreads the group again from now."""
+    scheduler = Scheduler()
+    scheduler.plan(schedule(["a", "b"]), 0.0)
+    scheduler.plan(schedule(["a", "b"], interval=1200.0), 50.0)
+    assert slots(scheduler) == {"a": 50.0, "b": 650.0}
+
+
+def test_plan_replans_on_device_add_and_remove():
+    """Added and removed devices spread the group again, removed devices are no longer due."""
+    scheduler = Scheduler()
+    scheduler.plan(schedule(["a", "b"]), 0.0)
+    scheduler.plan(schedule(["a", "b", "c"]), 10.0)
+    assert slots(scheduler) == {"a": 10.0, "b": 210.0, "c": 410.0}
+    scheduler.plan(schedule(["a", "c"]), 20.0)
+    assert slots(scheduler) == {"a": 20.0, "c": 320.0}
+
+
+def test_plan_drops_unscheduled_group():
+    """Devices of a group without refresh-interval are no longer due."""
+    scheduler = Scheduler()
+    scheduler.plan(schedule(["a"]), 0.0)
+    scheduler.plan(ScheduleSettings(4, 10, 0.0, {}, {}), 10.0)
+    assert not slots(scheduler)
+    assert not scheduler.pop_due(ScheduleSettings(4, 10, 0.0, {}, {}), 1000.0)
+
+
+def test_pop_due_moves_devices_to_their_next_slot():
+    """Due devices are returned once and are due again one interval later."""
+    scheduler = Scheduler()
+    settings = schedule(["a", "b", "c"])
+    scheduler.plan(settings, 0.0)
+    assert scheduler.pop_due(settings, 250.0) == {"group": ["a", "b"]}
+    assert scheduler.pop_due(settings, 250.0) == {}
+    assert slots(scheduler) == {"a": INTERVAL, "b": 200.0 + INTERVAL, "c": 400.0}
+
+
+def test_pop_due_late_device_is_not_due_twice():
+    """A device missing several slots is run once and keeps the phase of its slot."""
+    scheduler = Scheduler()
+    settings = schedule(["a"])
+    scheduler.plan(settings, 0.0)
+    assert scheduler.pop_due(settings, 3 * INTERVAL) == {"group": ["a"]}
+    assert slots(scheduler) == {"a": 4 * INTERVAL}
+    assert scheduler.pop_due(settings, 3 * INTERVAL + 1) == {}
+
+
+def test_get_schedule_settings_reads_scheduled_groups():
+    """Groups with a refresh-interval are scheduled with their sorted devices."""
+    store, hostnames = build_fleet(FleetSpec(devices_per_platform=2, modules=1, optics=1, interfaces=1))
+    fake_nso.use(store)
+    store.entry(store.root, "inventory-manager", ("idle",), name="idle")
+    store.root.child("inventory-manager", (INVENTORY_NAME,)).leaves["refresh-interval"] = 60
+    settings = get_schedule_settings()
+    assert settings.intervals == {INVENTORY_NAME: 3600.0}
+    assert settings.devices == {INVENTORY_NAME: sorted(hostnames)}
+    assert (settings.max_parallel, settings.batch_size, settings.jitter) == (4, 10, 0.1)
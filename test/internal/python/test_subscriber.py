@@ -0,0 +1,119 @@
+"""Inventory Interface Subscriber Tests."""
+# pylint: disable=wrong-import-position
+import fake_nso
+
+fake_nso.install()
+
+import ncs  # noqa: E402
+import pytest  # noqa: E402
+from bench_inventory_update import run_update  # noqa: E402
+from inventory.main import INTERFACE_POOLS, sync_device_interfaces  # noqa: E402
+from inventory.subscriber import InterfaceSubscriber  # noqa: E402
+from nso_fleet import INVENTORY_NAME, FleetSpec, build_fleet  # noqa: E402
+
+SPEC = FleetSpec(devices_per_platform=1, modules=1, optics=1, interfaces=2, platforms=("ios-xr",))
+LAST_CHANGED = "2000-01-01T00:00:00+00:00"
+
+
+def device_keypath(hostname, if_number):
+    """Build the keypath of a device interface as handed to iterate, innermost step first."""
+    return ((if_number,), "TenGigE", "interface", "config", (hostname,), "device", "devices")
+
+
+def test_iterate_collects_changed_devices():
+    """Every changed interface adds its device once, iteration continues for all of them."""
+    subscriber = InterfaceSubscriber(None, fake_nso.Log(), lambda devices: None)
+    state = subscriber.pre_iterate()
+    assert not subscriber.should_post_iterate(state)
+    for hostname, if_number in (("r1", "0/0/0/0"), ("r1", "0/0/0/1"), ("r2", "0/0/0/0")):
+        assert subscriber.iterate(device_keypath(hostname, if_number), None, None, None, state) == ncs.ITER_CONTINUE
+    assert state == {"r1", "r2"}
+    assert subscriber.should_post_iterate(state)
+
+
+def test_post_iterate_hands_devices_over_and_logs_failures(caplog):
+    """The changed devices are handed to on_change, a failing on_change is logged instead of raised."""
+    changed = []
+    InterfaceSubscriber(None, fake_nso.Log(), changed.append).post_iterate({"r1"})
+    assert changed == [{"r1"}]
+
+    def failing(devices):
+        raise RuntimeError("sync failed for " + ", ".join(devices))
+
+    InterfaceSubscriber(None, fake_nso.Log(), failing).post_iterate({"r1"})
+    assert "interface sync failed: sync failed for r1" in caplog.text
+
+
+@pytest.fixture(name="fleet")
+def fixture_fleet():
+    """Updated fleet of a single ios-xr device."""
+    store, (hostname,) = build_fleet(SPEC)
+    run_update(store)
+    return store, hostname
+
+
+def inventory_device(store, hostname, inventory_name=INVENTORY_NAME):
+    """Get the inventory-manager entry of a device."""
+    return store.root.child("inventory-manager", (inventory_name,)).child("device", (hostname,))
+
+
+def inventory_interfaces(store, hostname, inventory_name=INVENTORY_NAME):
+    """Get the (if-size, if-number) keys of the interface entries of a device."""
+    return {
+        (entry.leaves["if-size"], entry.leaves["if-number"])
+        for entry in inventory_device(store, hostname, inventory_name).entries("interface")
+    }
+
+
+def add_interface(store, hostname, if_number):
+    """Add a TenGigE interface to the device config."""
+    interface = store.root.child("devices").child("device", (hostname,)).child("config").child("interface")
+    store.entry(interface, "TenGigE", (if_number,), id=if_number)
+
+
+def pool_names(store):
+    """Get the names of all id-pools."""
+    return {pool.leaves["name"] for pool in store.root.child("resource-pools").entries("id-pool")}
+
+
+def test_disabled_subscriber_writes_nothing(fleet):
+    """With interface-subscriber disabled no device is synced."""
+    store, hostname = fleet
+    store.root.child("inventory-settings").child("interface-subscriber").leaves["enabled"] = False
+    add_interface(store, hostname, "0/1/0/0")
+    store.calls.clear()
+    assert sync_device_interfaces({hostname}, fake_nso.Log()) == []
+    assert not store.calls["apply"]
+    assert ("TenGigE", "0/1/0/0") not in inventory_interfaces(store, hostname)
+
+
+def test_unchanged_interfaces_keep_last_changed(fleet):
+    """A device whose interfaces did not change keeps its last-changed."""
+    store, hostname = fleet
+    inventory_device(store, hostname).leaves["last-changed"] = LAST_CHANGED
+    (result,) = sync_device_interfaces({hostname}, fake_nso.Log())
+    assert (result.inventory_name, result.status, result.removed_interfaces) == (INVENTORY_NAME, "updated", ())
+    assert inventory_device(store, hostname).leaves["last-changed"] == LAST_CHANGED
+
+
+def test_added_interface_is_written_with_its_pools(fleet):
+    """An added interface gets its entry, its pools and a new last-changed."""
+    store, hostname = fleet
+    inventory_device(store, hostname).leaves["last-changed"] = LAST_CHANGED
+    add_interface(store, hostname, "0/1/0/0")
+    sync_device_interfaces({hostname}, fake_nso.Log())
+    assert ("TenGigE", "0/1/0/0") in inventory_interfaces(store, hostname)
+    assert inventory_device(store, hostname).leaves["last-changed"] != LAST_CHANGED
+    assert {f"{hostname}_TenGigE_0_1_0_0_{pool.name}" for pool in INTERFACE_POOLS} <= pool_names(store)
+
+
+def test_device_is_written_in_every_inventory_manager(fleet):
+    """A device of several inventory-managers gets the interface in each of them."""
+    store, hostname = fleet
+    lab = store.entry(store.root, "inventory-manager", ("lab",), name="lab")
+    store.entry(lab, "device", (hostname,), name=hostname)
+    add_interface(store, hostname, "0/1/0/0")
+    results = sync_device_interfaces({hostname}, fake_nso.Log())
+    assert sorted(result.inventory_name for result in results) == sorted([INVENTORY_NAME, "lab"])
+    assert inventory_interfaces(store, hostname, "lab") == inventory_interfaces(store, hostname)
+    assert ("TenGigE", "0/1/0/0") in inventory_interfaces(store, hostname, "lab")
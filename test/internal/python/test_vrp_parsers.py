@@ -0,0 +1,92 @@
+"""Huawei VRP CLI Output Parser Tests."""
+import pytest
+from inventory.parsers import (
+    VrpInventory,
+    VrpTransceiver,
+    huawei_vrp_parse_inventory_data,
+    huawei_vrp_parse_transceiver_data,
+    split_command_output,
+)
+from vrp_corpus import build_corpus
+
+ELABEL_BRIEF = """\
+<PE1>display elabel brief
+Info: It is executing, please wait...
+Slot #        BoardType         BarCode                   Description
+----------------------------------------------------------------------------------------
+PSU 1
+LPU 1         CR5DLPUFA070      030QFPW0H7000456          2x100GE LPU
+  PIC 0       CR5D0E2HFA70      030QFPW0H7000457          2-Port 100GE-CFP2
+  PIC 1       CR5D0E2HFA70      030QFPW0H7000458
+LPU 10        CR5DLPUFA070      030QFPW0H7000459          2x100GE LPU
+  PIC 0       CR5D0E2HFA70      030QFPW0H7000460          2-Port 100GE-CFP2
+FAN 2         CR5M0FANA370      030QFPW0H7000461
+PSU 3
+<PE1>"""
+
+OPTICAL_MODULE_BRIEF = """\
+<PE1>display optical-module brief
+Port          Status  Duplex  Type          WaveLength  RxPower  TxPower  Mode        VendorPN
+------------------------------------------------------------------------------------------------
+GE0/3/0       up      full    1000BASE-LX   1310nm      -7.31dBm -5.40dBm SingleMode  SFP-GE-LX-SM1310
+100GE0/1/0    down    full    100GBASE-LR4  1310nm      -        -        SingleMode  02311KNR
+Total: 2
+------------------------------------------------------------------------------------------------
+<PE1>"""
+
+
+def test_parse_inventory_data():
+    """Boards, sub-boards and short power and fan rows are parsed into records."""
+    assert list(huawei_vrp_parse_inventory_data(ELABEL_BRIEF)) == [
+        VrpInventory("PSU1", "", "", ""),
+        VrpInventory("LPU1", "2x100GE LPU", "CR5DLPUFA070", "030QFPW0H7000456"),
+        VrpInventory("PIC1/0", "2-Port 100GE-CFP2", "CR5D0E2HFA70", "030QFPW0H7000457"),
+        VrpInventory("PIC1/1", "", "CR5D0E2HFA70", "030QFPW0H7000458"),
+        VrpInventory("LPU10", "2x100GE LPU", "CR5DLPUFA070", "030QFPW0H7000459"),
+        VrpInventory("PIC10/0", "2-Port 100GE-CFP2", "CR5D0E2HFA70", "030QFPW0H7000460"),
+        VrpInventory("FAN2", "", "CR5M0FANA370", "030QFPW0H7000461"),
+        VrpInventory("PSU3", "", "", ""),
+    ]
+
+
+def test_parse_inventory_data_orphan_sub_board():
+    """A sub-board without a preceding board is skipped."""
+    assert not list(huawei_vrp_parse_inventory_data("  PIC 0  CR5D0E2HFA70  030QFPW0H7000457"))
+
+
+def test_parse_transceiver_data():
+    """Rows are read from the header columns, footer lines are skipped."""
+    assert list(huawei_vrp_parse_transceiver_data(OPTICAL_MODULE_BRIEF)) == [
+        VrpTransceiver("GE0/3/0", "up", "1000BASE-LX", "SFP-GE-LX-SM1310"),
+        VrpTransceiver("100GE0/1/0", "down", "100GBASE-LR4", "02311KNR"),
+    ]
+
+
+def test_parse_transceiver_data_without_header():
+    """Output without a header row yields no records."""
+    assert not list(huawei_vrp_parse_transceiver_data("Info: No optical module is present."))
+
+
+@pytest.mark.parametrize("corpus", build_corpus(), ids=lambda corpus: corpus.name)
+def test_parse_corpus(corpus):
+    """Full chassis outputs yield one record per board and port."""
+    inventory = list(huawei_vrp_parse_inventory_data(corpus.elabel))
+    transceivers = list(huawei_vrp_parse_transceiver_data(corpus.optical_module))
+    assert len(inventory) == corpus.elabel_records
+    assert len({record.name for record in inventory}) == corpus.elabel_records
+    assert len(transceivers) == corpus.optical_module_records
+    assert all(record.pid == "02311KNR" for record in transceivers)
+
+
+def test_split_command_output():
+    """Batched exec output is split on the echoed command lines."""
+    commands = ("display elabel brief", "display optical-module brief")
+    sections = split_command_output(ELABEL_BRIEF + "\n" + OPTICAL_MODULE_BRIEF, commands)
+    assert len(list(huawei_vrp_parse_inventory_data(sections["display elabel brief"]))) == 8
+    assert len(list(huawei_vrp_parse_transceiver_data(sections["display optical-module brief"]))) == 2
+
+
+def test_split_command_output_missing_command():
+    """A command without echoed output is reported."""
+    with pytest.raises(ValueError):
+        split_command_output(ELABEL_BRIEF, ("display elabel brief", "display optical-module brief"))
@@ -0,0 +1,97 @@
+"""Huawei VRP CLI Output Corpus Module.
+
+Deterministic 'display elabel brief' and 'display optical-module brief' outputs sized like
+fully populated NE40E-X16A and NE8000-X16 chassis, used by the parser tests and benchmark.
+"""
+from typing import NamedTuple, Tuple
+
+
+class VrpCorpus(NamedTuple):
+    """Generated outputs with the number of records a parser must yield for them."""
+
+    name: str
+    elabel: str
+    elabel_records: int
+    optical_module: str
+    optical_module_records: int
+
+
+# chassis name, LPU slot count, PIC per LPU, ports per PIC, board type, port type
+CHASSIS: Tuple[Tuple[str, int, int, int, str, str], ...] = (
+    ("NE40E-X16A", 16, 2, 24, "CR5D00EEGF80", "GE"),
+    ("NE8000-X16", 16, 4, 36, "CR8D00L4XF90", "100GE"),
+)
+
+
+def serial_number(slot: int, number: int) -> str:
+    """Build a barcode-like serial number."""
+    return f"2102310{slot:03d}{number:03d}P0"
+
+
+def elabel_brief(chassis: str, lpus: int, pics: int, board_type: str) -> Tuple[str, int]:
+    """Build 'display elabel brief' output and its record count."""
+    lines = [
+        f"<{chassis}>display elabel brief",
+        "Info: It is executing, please wait...",
+        "Slot #        BoardType         BarCode                   Description",
+        "-" * 100,
+    ]
+    records = 0
+    for number in range(1, lpus + 1):
+        lines.append(f"LPU {number:<9} {board_type:<17} {serial_number(number, 0):<25} {chassis} Line Processing Unit")
+        records += 1
+        for pic in range(pics):
+            lines.append(
+                f"  PIC {pic:<7} {board_type}P{pic:<4} {serial_number(number, pic + 1):<25} 10-Port 100GE-QSFP28"
+            )
+            records += 1
+    for number in range(lpus + 1, lpus + 3):
+        lines.append(f"MPU {number:<9} CR5D0MPUB370      {serial_number(number, 0):<25} Main Processing Unit")
+        lines.append(f"  CFCARD {0:<4} CR5D0CFCB370      {serial_number(number, 1):<25} CF Card")
+        records += 2
+    for number in range(lpus + 3, lpus + 11):
+        lines.append(f"SFU {number:<9} CR5D0SFUF370      {serial_number(number, 0):<25} Switch Fabric Unit")
+        records += 1
+    for number in range(1, 11):
+        lines.append(f"PSU {number}")
+        records += 1
+    for number in range(1, 7):
+        lines.append(f"FAN {number:<9} CR5M0FANA370      {serial_number(90, number)}")
+        records += 1
+    for number in range(1, 3):
+        lines.append(f"PMU {number:<9} CR5D0PMUA070      {serial_number(95, number):<25} Power Monitoring Unit")
+        records += 1
+    lines.append(f"<{chassis}>")
+    return "\r\n".join(lines), records
+
+
+def optical_module_brief(chassis: str, lpus: int, pics: int, ports: int, port_type: str) -> Tuple[str, int]:
+    """Build 'display optical-module brief' output and its record count."""
+    lines = [
+        f"<{chassis}>display optical-module brief",
+        "Port          Status  Duplex  Type          WaveLength  RxPower  TxPower  Mode        VendorPN",
+        "-" * 100,
+    ]
+    records = 0
+    for number in range(1, lpus + 1):
+        for pic in range(pics):
+            for port in range(ports):
+                status = "up" if port % 3 else "down"
+                lines.append(
+                    f"{port_type}{number}/{pic}/{port:<6} {status:<7} full    100GBASE-LR4  1310nm      "
+                    "-2.10dBm -1.05dBm SingleMode  02311KNR"
+                )
+                records += 1
+    lines.append("-" * 100)
+    lines.append(f"<{chassis}>")
+    return "\r\n".join(lines), records
+
+
+def build_corpus() -> Tuple[VrpCorpus, ...]:
+    """Build one corpus entry per chassis."""
+    corpus = []
+    for chassis, lpus, pics, ports, board_type, port_type in CHASSIS:
+        elabel, elabel_records = elabel_brief(chassis, lpus, pics, board_type)
+        optical_module, optical_module_records = optical_module_brief(chassis, lpus, pics, ports, port_type)
+        corpus.append(VrpCorpus(chassis, elabel, elabel_records, optical_module, optical_module_records))
+    return tuple(corpus)